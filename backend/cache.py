@@ -0,0 +1,171 @@
+"""
+Content-addressed cache over pipeline artifacts in data/pdf, data/markdown and data/chunks.
+
+Each stage key hashes the previous stage key together with that stage's options,
+so an unchanged document with unchanged options is served straight from disk and
+a change in (say) chunking config only invalidates the chunking stage.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+from backend.config import CACHE_DIR
+
+MANIFEST_PATH = CACHE_DIR / "manifest.json"
+
+# Bump when a stage's output format changes so old artifacts are not reused
+STAGE_VERSIONS = {
+    "pdf": 1,
+    "markdown": 1,
+    "chunks": 3,
+}
+
+
+def hash_file(file_path: str | Path, block_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 of a file's contents.
+    
+    Args:
+        file_path: File to hash
+        block_size: Read size in bytes
+        
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def stage_key(stage: str, parent_key: str, options: Dict[str, Any] | None = None) -> str:
+    """
+    Derive the cache key for a stage from its input key and options.
+    
+    Args:
+        stage: Stage name ('pdf', 'markdown' or 'chunks')
+        parent_key: Content hash or key of the previous stage
+        options: Options that affect this stage's output
+        
+    Returns:
+        Hex digest identifying the stage output
+    """
+    payload = json.dumps(
+        {
+            "stage": stage,
+            "version": STAGE_VERSIONS[stage],
+            "parent": parent_key,
+            "options": options or {},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ArtifactCache:
+    """
+    Maps stage keys to artifact files, persisted as a JSON manifest.
+    
+    An entry is only trusted while the artifact still has the size and
+    modification time recorded when it was stored, so files overwritten
+    by another document with the same stem are treated as misses.
+    """
+
+    def __init__(self, manifest_path: Path = MANIFEST_PATH):
+        self.manifest_path = manifest_path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        if manifest_path.exists():
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._entries = {}
+
+    def lookup(self, key: str, target_path: Path) -> Path | None:
+        """
+        Return the artifact for a key, materialized at target_path.
+        
+        Args:
+            key: Stage key
+            target_path: Where the caller expects the artifact
+            
+        Returns:
+            target_path on a hit, None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        cached_path = Path(entry["path"])
+        try:
+            stat = cached_path.stat()
+        except FileNotFoundError:
+            self._forget(key)
+            return None
+        if stat.st_size != entry["size"] or stat.st_mtime_ns != entry["mtime_ns"]:
+            self._forget(key)
+            return None
+
+        # Same content submitted under another name: copy the artifact over
+        if cached_path != target_path:
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(cached_path, target_path)
+        return target_path
+
+    def store(self, key: str, path: Path, meta: Dict[str, Any] | None = None):
+        """
+        Record an artifact for a key.
+        
+        Args:
+            key: Stage key
+            path: Artifact that was just written
+            meta: How the artifact was produced, returned by meta() on later hits
+        """
+        stat = path.stat()
+        with self._lock:
+            self._entries[key] = {
+                "path": str(path),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+            if meta:
+                self._entries[key]["meta"] = meta
+            self._save()
+
+    def meta(self, key: str) -> Dict[str, Any]:
+        """Return the metadata stored with a key's artifact (empty if none)."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return dict(entry.get("meta", {})) if entry else {}
+
+    def _forget(self, key: str):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._save()
+
+    def _save(self):
+        """Atomically rewrite the manifest (caller holds the lock)."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.manifest_path)
+
+
+_cache: ArtifactCache | None = None
+
+
+def get_artifact_cache() -> ArtifactCache:
+    """Return the process-wide artifact cache."""
+    global _cache
+    if _cache is None:
+        _cache = ArtifactCache()
+    return _cache
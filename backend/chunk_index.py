@@ -0,0 +1,213 @@
+"""
+In-memory index for serving chunks from data/chunks through the API.
+
+Parsed documents are kept in a bounded LRU cache; a global chunk ID →
+document map (covering chunk IDs and the header IDs in `parents` links) is
+built once from the chunk files and updated whenever a document is
+re-processed, so lookups never scan files and cache hits never touch disk.
+"""
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.config import CHUNKS_DIR, CHUNK_INDEX_MAX_DOCUMENTS
+from backend.converters import ChunkStore, chunk_store_paths, iter_chunk_file
+
+Chunk = Dict[str, Any]
+
+
+class _Document:
+    """A parsed chunks file with ID and subtree lookups."""
+    
+    def __init__(self, chunks: List[Chunk]):
+        self.chunks = chunks
+        self.positions: Dict[str, int] = {}
+        self.descendants: Dict[str, List[int]] = {}
+        for position, chunk in enumerate(chunks):
+            self.positions[chunk["chunk_id"]] = position
+            for parent in chunk["parents"]:
+                self.descendants.setdefault(parent["id"], []).append(position)
+    
+    def subtree(self, chunk_id: str) -> List[Chunk]:
+        positions = list(self.descendants.get(chunk_id, []))
+        if chunk_id in self.positions:
+            positions.append(self.positions[chunk_id])
+        return [self.chunks[position] for position in sorted(positions)]
+
+
+def _read_ids(chunks_path: Path) -> List[str]:
+    """Chunk and parent IDs of a document, from the store index when available."""
+    _, index_path = chunk_store_paths(chunks_path)
+    ids = []
+    if index_path.exists():
+        with open(index_path, 'r', encoding='utf-8') as f:
+            for chunk_id, _, _, parent_ids in json.load(f)["records"]:
+                ids.append(chunk_id)
+                ids.extend(parent_ids)
+    else:
+        for chunk in iter_chunk_file(chunks_path):
+            ids.append(chunk["chunk_id"])
+            ids.extend(parent["id"] for parent in chunk["parents"])
+    return ids
+
+
+def _read_chunks(chunks_path: Path) -> List[Chunk]:
+    """All chunks of a document, from the compact store when available."""
+    try:
+        with ChunkStore(chunks_path) as store:
+            return list(store)
+    except (FileNotFoundError, ValueError):
+        return list(iter_chunk_file(chunks_path))
+
+
+class ChunkIndex:
+    """
+    Bounded LRU cache of parsed chunk documents plus a global ID index.
+    
+    Documents are named by their chunks file stem (data/chunks/<doc>.json).
+    """
+    
+    def __init__(self, chunks_dir: Path = CHUNKS_DIR, max_documents: int = CHUNK_INDEX_MAX_DOCUMENTS):
+        self.chunks_dir = chunks_dir
+        self.max_documents = max(1, max_documents)
+        self._lock = threading.Lock()
+        self._documents: "OrderedDict[str, _Document]" = OrderedDict()
+        self._doc_by_id: Optional[Dict[str, str]] = None
+        self._ids_by_doc: Dict[str, List[str]] = {}
+    
+    def chunks_path(self, doc: str) -> Optional[Path]:
+        """Path of a document's chunks file, or None for names outside CHUNKS_DIR."""
+        if not doc or Path(doc).name != doc or doc.startswith("."):
+            return None
+        return self.chunks_dir / f"{doc}.json"
+    
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+    
+    def _ensure_id_index(self):
+        """Build the chunk ID → document map on first use (caller holds the lock)."""
+        if self._doc_by_id is not None:
+            return
+        self._doc_by_id = {}
+        for chunks_path in sorted(self.chunks_dir.glob("*.json")):
+            stem = chunks_path.stem
+            # Skip chunk store indexes and compare-mode candidate outputs
+            if stem.endswith(".idx") or stem.endswith(".fast"):
+                continue
+            try:
+                self._add_ids(chunks_path.stem, _read_ids(chunks_path))
+            except (OSError, ValueError, KeyError):
+                continue  # Unreadable or foreign file: not a chunks document
+    
+    def _add_ids(self, doc: str, ids: List[str]):
+        self._ids_by_doc[doc] = ids
+        for chunk_id in ids:
+            self._doc_by_id[chunk_id] = doc
+    
+    def _remove_ids(self, doc: str):
+        for chunk_id in self._ids_by_doc.pop(doc, []):
+            if self._doc_by_id.get(chunk_id) == doc:
+                del self._doc_by_id[chunk_id]
+    
+    def invalidate(self, doc: str):
+        """
+        Drop a document from the cache and re-index its IDs from disk.
+        
+        Called after a document is (re-)processed.
+        
+        Args:
+            doc: Document name (chunks file stem)
+        """
+        chunks_path = self.chunks_path(doc)
+        with self._lock:
+            self._documents.pop(doc, None)
+            if self._doc_by_id is None:
+                return  # Not built yet: the first lookup scans every file
+            self._remove_ids(doc)
+            if chunks_path is not None and chunks_path.exists() and not doc.endswith(".fast"):
+                self._add_ids(doc, _read_ids(chunks_path))
+    
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    
+    def _document(self, doc: str) -> Optional[_Document]:
+        """Cached document, loading it on a miss (caller holds the lock)."""
+        document = self._documents.get(doc)
+        if document is not None:
+            self._documents.move_to_end(doc)
+            return document
+        
+        chunks_path = self.chunks_path(doc)
+        if chunks_path is None or not chunks_path.exists():
+            return None
+        document = _Document(_read_chunks(chunks_path))
+        self._documents[doc] = document
+        while len(self._documents) > self.max_documents:
+            self._documents.popitem(last=False)
+        return document
+    
+    def get_document(self, doc: str) -> Optional[List[Chunk]]:
+        """
+        Get every chunk of a document.
+        
+        Args:
+            doc: Document name (chunks file stem)
+        
+        Returns:
+            Chunks in document order, or None if the document does not exist
+        """
+        with self._lock:
+            document = self._document(doc)
+            return document.chunks if document is not None else None
+    
+    def get_chunk(self, chunk_id: str) -> Optional[Tuple[str, Chunk]]:
+        """
+        Find a chunk by ID across all documents.
+        
+        Args:
+            chunk_id: Chunk ID
+        
+        Returns:
+            Tuple of (document name, chunk), or None if no document has it
+        """
+        with self._lock:
+            self._ensure_id_index()
+            doc = self._doc_by_id.get(chunk_id)
+            document = self._document(doc) if doc else None
+            if document is None or chunk_id not in document.positions:
+                return None
+            return doc, document.chunks[document.positions[chunk_id]]
+    
+    def get_subtree(self, chunk_id: str) -> Optional[Tuple[str, List[Chunk]]]:
+        """
+        Find a header's chunk and every chunk nested under it.
+        
+        Args:
+            chunk_id: Chunk ID or header ID from a `parents` link
+        
+        Returns:
+            Tuple of (document name, chunks in document order), or None if unknown
+        """
+        with self._lock:
+            self._ensure_id_index()
+            doc = self._doc_by_id.get(chunk_id)
+            document = self._document(doc) if doc else None
+            if document is None:
+                return None
+            subtree = document.subtree(chunk_id)
+            return (doc, subtree) if subtree else None
+
+
+_index: ChunkIndex | None = None
+
+
+def get_chunk_index() -> ChunkIndex:
+    """Return the process-wide chunk index."""
+    global _index
+    if _index is None:
+        _index = ChunkIndex()
+    return _index
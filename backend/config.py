@@ -15,12 +15,14 @@ INPUT_DIR = DATA_DIR / "input"          # All raw input files (PDF, DOCX, HTML)
 PDF_DIR = DATA_DIR / "pdf"              # All converted PDFs
 MARKDOWN_DIR = DATA_DIR / "markdown"    # All converted Markdown files
 CHUNKS_DIR = DATA_DIR / "chunks"        # All final JSON chunks
+CACHE_DIR = DATA_DIR / "cache"          # Artifact cache manifest
 
 # Create directories if they don't exist
 INPUT_DIR.mkdir(parents=True, exist_ok=True)
 PDF_DIR.mkdir(parents=True, exist_ok=True)
 MARKDOWN_DIR.mkdir(parents=True, exist_ok=True)
 CHUNKS_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 # Supported file types
 SUPPORTED_FORMATS = {
@@ -34,4 +36,106 @@ CHUNK_HEADERS = [
     ("#", "header1"),
     ("##", "header2"),
     ("###", "header3"),
-]
\ No newline at end of file
+]
+
+# Compact chunk store (JSON Lines + offset index) written next to each chunks JSON
+CHUNK_STORE_ENABLED = os.getenv("CHUNK_STORE_ENABLED", "true").lower() == "true"
+CHUNK_STORE_COMPRESS = os.getenv("CHUNK_STORE_COMPRESS", "false").lower() == "true"  # zlib per record
+
+# Chunk retrieval API
+CHUNK_INDEX_MAX_DOCUMENTS = int(os.getenv("CHUNK_INDEX_MAX_DOCUMENTS", "32"))  # Parsed documents kept in memory
+
+# Full-text search index (SQLite inverted index, BM25 ranking)
+SEARCH_DB_PATH = Path(os.getenv("SEARCH_DB_PATH", DATA_DIR / "search.db"))
+
+# Near-duplicate chunk detection (MinHash + LSH)
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+DEDUP_DB_PATH = Path(os.getenv("DEDUP_DB_PATH", DATA_DIR / "dedup.db"))
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))  # Estimated Jaccard similarity of word shingles
+# Store a duplicate_of reference instead of the text of near-duplicate chunks
+DEDUP_REPLACE_TEXT = os.getenv("DEDUP_REPLACE_TEXT", "false").lower() == "true"
+
+# Converter start-up: "blocking" warms the resources enabled below before serving,
+# "background" serves immediately and warms concurrently, "off" loads on first use
+CONVERTER_WARMUP = os.getenv("CONVERTER_WARMUP", "blocking").lower()
+# Converters imported at start-up (comma-separated, e.g. "pdf_to_markdown,html_to_pdf")
+CONVERTER_PRELOAD = [name.strip() for name in os.getenv("CONVERTER_PRELOAD", "").split(",") if name.strip()]
+
+# Docling converter pool
+DOCLING_POOL_SIZE = int(os.getenv("DOCLING_POOL_SIZE", "2"))     # Converters kept per options key
+DOCLING_WARMUP = os.getenv("DOCLING_WARMUP", "true").lower() == "true"
+DOCLING_WARMUP_OCR = os.getenv("DOCLING_WARMUP_OCR", "false").lower() == "true"
+
+# Executors (0 Docling workers runs Docling in the thread pool instead of processes)
+DOCLING_WORKERS = int(os.getenv("DOCLING_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Split PDFs longer than this into page shards converted in parallel (0 = off)
+DOCLING_SHARD_PAGES = int(os.getenv("DOCLING_SHARD_PAGES", "0"))
+SUBPROCESS_WORKERS = int(os.getenv("SUBPROCESS_WORKERS", "4"))
+
+# Background job queue
+JOBS_DB_PATH = Path(os.getenv("JOBS_DB_PATH", DATA_DIR / "jobs.db"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))  # Documents processed concurrently
+# Seconds a claimed job stays reserved without a heartbeat before another worker may retry it
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+# HTML→PDF browser pool
+HTML_BROWSER_WARMUP = os.getenv("HTML_BROWSER_WARMUP", "true").lower() == "true"
+HTML_BROWSER_PAGES = int(os.getenv("HTML_BROWSER_PAGES", "4"))           # Concurrent renders
+HTML_BROWSER_MAX_CONVERSIONS = int(os.getenv("HTML_BROWSER_MAX_CONVERSIONS", "200"))  # 0 = never recycle
+HTML_CONVERSION_TIMEOUT = float(os.getenv("HTML_CONVERSION_TIMEOUT", "60"))  # Seconds per page load
+
+# Chat streaming (/result)
+STREAM_GRANULARITY = os.getenv("STREAM_GRANULARITY", "char")             # Token size: char or word
+STREAM_TOKEN_DELAY = float(os.getenv("STREAM_TOKEN_DELAY", "0.01"))      # Seconds per generated token
+STREAM_FRAME_INTERVAL = float(os.getenv("STREAM_FRAME_INTERVAL", "0.05"))  # Max seconds tokens wait to be coalesced
+STREAM_FRAME_CHARS = int(os.getenv("STREAM_FRAME_CHARS", "4096"))        # Send a frame once it holds this many characters
+
+# Resumable SSE mode of /result (Accept: text/event-stream, resume with Last-Event-ID)
+SSE_RESUME_TTL = float(os.getenv("SSE_RESUME_TTL", "60"))                # Seconds a finished generation stays resumable
+SSE_RESUME_GRACE = float(os.getenv("SSE_RESUME_GRACE", "30"))            # Seconds a generation runs with no client attached
+SSE_RESUME_MAX_GENERATIONS = int(os.getenv("SSE_RESUME_MAX_GENERATIONS", "1024"))  # Finished generations kept at most
+
+# Chat model providers: comma-separated model=provider[:upstream model name], provider
+# being "mock" (canned responses) or "openai" (OpenAI-compatible server); unlisted models use mock.
+# Append ";max=<streams>" and/or ";timeout=<seconds>" to override CHAT_MAX_CONCURRENCY and
+# CHAT_READ_TIMEOUT for one model, e.g. model_b=openai:llama3;max=8;timeout=30
+CHAT_PROVIDERS = {
+    model.strip(): target.strip()
+    for model, _, target in (
+        entry.partition("=") for entry in os.getenv("CHAT_PROVIDERS", "").split(",") if "=" in entry
+    )
+}
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "http://127.0.0.1:8001/v1")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+CHAT_MAX_CONCURRENCY = int(os.getenv("CHAT_MAX_CONCURRENCY", "256"))       # Concurrent streams per model
+CHAT_QUEUE_TIMEOUT = float(os.getenv("CHAT_QUEUE_TIMEOUT", "5"))           # Seconds to wait for a free slot
+CHAT_CONNECT_TIMEOUT = float(os.getenv("CHAT_CONNECT_TIMEOUT", "5"))       # Seconds to connect upstream
+CHAT_READ_TIMEOUT = float(os.getenv("CHAT_READ_TIMEOUT", "60"))            # Max seconds between upstream reads
+CHAT_HTTP_MAX_CONNECTIONS = int(os.getenv("CHAT_HTTP_MAX_CONNECTIONS", "512"))  # Shared upstream pool size
+
+# Chat response cache: complete /result responses keyed by model and normalized prompt,
+# replayed with the same framing (requests can opt out with bypassCache)
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))        # Seconds (0 = until evicted)
+RESPONSE_CACHE_PERSIST = os.getenv("RESPONSE_CACHE_PERSIST", "false").lower() == "true"  # Mirror to SQLite
+RESPONSE_CACHE_DB_PATH = Path(os.getenv("RESPONSE_CACHE_DB_PATH", DATA_DIR / "response_cache.db"))
+
+# Conversation history per threadId (SQLite); prompts carry a bounded window of it
+THREADS_DB_PATH = Path(os.getenv("THREADS_DB_PATH", DATA_DIR / "threads.db"))
+THREAD_CACHE_MAX_THREADS = int(os.getenv("THREAD_CACHE_MAX_THREADS", "256"))  # Context windows kept in memory
+THREAD_CONTEXT_MESSAGES = int(os.getenv("THREAD_CONTEXT_MESSAGES", "20"))     # Recent messages sent verbatim
+THREAD_CONTEXT_CHARS = int(os.getenv("THREAD_CONTEXT_CHARS", "16000"))        # Max characters of those messages
+THREAD_SUMMARY_CHARS = int(os.getenv("THREAD_SUMMARY_CHARS", "2000"))         # Summary of older messages
+
+# Fast pipeline mode: minimum headings for a direct conversion to be trusted
+# (documents with fewer rely on layout only and go through the PDF path)
+FAST_PATH_MIN_HEADINGS = int(os.getenv("FAST_PATH_MIN_HEADINGS", "1"))
+
+# LibreOffice instance pool (DOCX→PDF)
+LIBREOFFICE_INSTANCES = int(os.getenv("LIBREOFFICE_INSTANCES", "2"))     # Parallel conversions
+LIBREOFFICE_BASE_PORT = int(os.getenv("LIBREOFFICE_BASE_PORT", "2002"))  # Instance i listens on base + i
+LIBREOFFICE_PROFILE_DIR = Path(os.getenv("LIBREOFFICE_PROFILE_DIR", DATA_DIR / "libreoffice"))
+LIBREOFFICE_TIMEOUT = float(os.getenv("LIBREOFFICE_TIMEOUT", "120"))     # Seconds per conversion
+LIBREOFFICE_WARMUP = os.getenv("LIBREOFFICE_WARMUP", "true").lower() == "true"
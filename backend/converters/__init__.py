@@ -1,14 +1,98 @@
 """
 Document conversion utilities.
+
+Submodules are imported lazily, on first access to one of their names, so
+importing this package does not load Docling, Playwright or LibreOffice
+support. See registry.py for availability checks and loading.
 """
-from .docx_to_pdf import convert_docx_to_pdf
-from .html_to_pdf import convert_html_to_pdf
-from .pdf_to_markdown import convert_pdf_to_markdown
-from .markdown_to_chunks import convert_markdown_to_chunks
+import importlib
+
+from .registry import (
+    CONVERTERS,
+    ConverterUnavailableError,
+    converter_status,
+    ensure_available,
+    get_converter,
+    load_converter,
+    preload_converters,
+    stop_converter_pools,
+    unavailable_reason,
+)
+
+# Public name → submodule defining it
+_LAZY_EXPORTS = {
+    "convert_docx_to_pdf": "docx_to_pdf",
+    "get_libreoffice_pool": "docx_to_pdf",
+    "start_libreoffice_pool": "docx_to_pdf",
+    "stop_libreoffice_pool": "docx_to_pdf",
+    "convert_html_to_pdf": "html_to_pdf",
+    "convert_pdf_to_markdown": "pdf_to_markdown",
+    "convert_markdown_to_chunks": "markdown_to_chunks",
+    "iter_chunk_file": "markdown_to_chunks",
+    "iter_markdown_sections": "markdown_splitter",
+    "split_markdown_file": "markdown_splitter",
+    "convert_html_to_markdown": "html_to_markdown",
+    "convert_docx_to_markdown": "docx_to_markdown",
+    "compare_chunk_files": "chunk_compare",
+    "chunk_fingerprints": "chunk_delta",
+    "diff_chunk_fingerprints": "chunk_delta",
+    "ChunkStore": "chunk_store",
+    "ChunkStoreWriter": "chunk_store",
+    "chunk_store_paths": "chunk_store",
+    "export_chunk_store": "chunk_store",
+    "get_converter_pool": "converter_pool",
+    "warmup_converter_pool": "converter_pool",
+    "get_browser_pool": "browser_pool",
+    "start_browser_pool": "browser_pool",
+    "stop_browser_pool": "browser_pool",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     "convert_docx_to_pdf",
     "convert_html_to_pdf",
     "convert_pdf_to_markdown",
     "convert_markdown_to_chunks",
+    "iter_chunk_file",
+    "iter_markdown_sections",
+    "split_markdown_file",
+    "convert_html_to_markdown",
+    "convert_docx_to_markdown",
+    "compare_chunk_files",
+    "chunk_fingerprints",
+    "diff_chunk_fingerprints",
+    "ChunkStore",
+    "ChunkStoreWriter",
+    "chunk_store_paths",
+    "export_chunk_store",
+    "get_converter_pool",
+    "warmup_converter_pool",
+    "get_browser_pool",
+    "start_browser_pool",
+    "stop_browser_pool",
+    "get_libreoffice_pool",
+    "start_libreoffice_pool",
+    "stop_libreoffice_pool",
+    "CONVERTERS",
+    "ConverterUnavailableError",
+    "converter_status",
+    "ensure_available",
+    "get_converter",
+    "load_converter",
+    "preload_converters",
+    "stop_converter_pools",
+    "unavailable_reason",
 ]
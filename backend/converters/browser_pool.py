@@ -0,0 +1,259 @@
+"""
+Long-lived Chromium instance with a bounded pool of reusable pages.
+
+The browser runs on a dedicated event loop thread so that both the sync and
+async HTML converters share it, regardless of which loop (if any) the caller
+is running on.
+"""
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+from playwright.async_api import async_playwright, Browser, Page, Error as PlaywrightError
+
+from backend.config import (
+    HTML_BROWSER_PAGES,
+    HTML_BROWSER_MAX_CONVERSIONS,
+    HTML_CONVERSION_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPool:
+    """
+    Shared Chromium browser with at most `max_pages` concurrent conversions.
+    
+    Pages are reused between conversions. After `max_conversions` renders the
+    browser is replaced by a fresh one (the old one closes once its in-flight
+    pages are returned), and a crashed browser is relaunched and the
+    conversion retried once.
+    """
+
+    def __init__(
+        self,
+        max_pages: int = HTML_BROWSER_PAGES,
+        max_conversions: int = HTML_BROWSER_MAX_CONVERSIONS,
+        timeout: float = HTML_CONVERSION_TIMEOUT
+    ):
+        self.max_pages = max(1, max_pages)
+        self.max_conversions = max_conversions
+        self.timeout = timeout
+        self.conversions = 0
+        self.restarts = 0
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+        # Only touched from the pool's own event loop
+        self._playwright = None
+        self._browser: Browser | None = None
+        self._browser_conversions = 0
+        self._idle_pages: List[Page] = []
+        self._pages_out: Dict[Browser, int] = {}
+        self._semaphore: asyncio.Semaphore | None = None
+        self._launch_lock: asyncio.Lock | None = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle (called from any thread)
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the loop thread and launch the browser (idempotent)."""
+        with self._start_lock:
+            if self.running:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever, name="browser-pool", daemon=True
+            )
+            self._thread.start()
+            self._submit(self._launch()).result()
+
+    def stop(self):
+        """Close the browser and stop the loop thread."""
+        with self._start_lock:
+            if not self.running:
+                return
+            try:
+                self._submit(self._shutdown()).result(timeout=30)
+            finally:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=5)
+                self._loop.close()
+                self._loop = None
+                self._thread = None
+
+    def _submit(self, coro) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    # ------------------------------------------------------------------
+    # Conversion API
+    # ------------------------------------------------------------------
+
+    def convert(self, input_path: Path, output_path: Path) -> Path:
+        """Render an HTML file to PDF, blocking the calling thread."""
+        self.start()
+        return self._submit(self._render(input_path, output_path)).result()
+
+    async def convert_async(self, input_path: Path, output_path: Path) -> Path:
+        """Render an HTML file to PDF without blocking the caller's event loop."""
+        if not self.running:
+            await asyncio.to_thread(self.start)
+        return await asyncio.wrap_future(self._submit(self._render(input_path, output_path)))
+
+    def stats(self) -> dict:
+        """Return pool counters for monitoring."""
+        return {
+            "running": self.running,
+            "max_pages": self.max_pages,
+            "idle_pages": len(self._idle_pages),
+            "conversions": self.conversions,
+            "restarts": self.restarts,
+        }
+
+    # ------------------------------------------------------------------
+    # Loop-side implementation
+    # ------------------------------------------------------------------
+
+    async def _launch(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pages)
+            self._launch_lock = asyncio.Lock()
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch()
+        self._browser_conversions = 0
+        self._idle_pages = []
+
+    async def _relaunch(self, observed: Browser | None, reason: str):
+        """Replace the browser the caller observed, retiring it."""
+        async with self._launch_lock:
+            old = self._browser
+            if old is not observed:
+                return  # Another conversion already relaunched it
+            logger.info("Restarting HTML→PDF browser (%s)", reason)
+            idle, self._idle_pages = self._idle_pages, []
+            for page in idle:
+                await self._close_quietly(page.context)
+            await self._launch()
+            self.restarts += 1
+            if not self._pages_out.get(old):
+                self._pages_out.pop(old, None)
+                await self._close_quietly(old)
+
+    async def _ensure_browser(self):
+        browser = self._browser
+        if browser is None or not browser.is_connected():
+            await self._relaunch(browser, "browser disconnected")
+        elif self.max_conversions and self._browser_conversions >= self.max_conversions:
+            await self._relaunch(browser, f"{self._browser_conversions} conversions")
+
+    async def _acquire_page(self) -> Page:
+        await self._ensure_browser()
+        while self._idle_pages:
+            page = self._idle_pages.pop()
+            if not page.is_closed():
+                break
+        else:
+            context = await self._browser.new_context()
+            page = await context.new_page()
+        browser = page.context.browser
+        self._pages_out[browser] = self._pages_out.get(browser, 0) + 1
+        return page
+
+    async def _release_page(self, page: Page, reusable: bool):
+        browser = page.context.browser
+        self._pages_out[browser] -= 1
+        if reusable and browser is self._browser and browser.is_connected():
+            self._idle_pages.append(page)
+            return
+        await self._close_quietly(page.context)
+        # Close a retired browser once its last page comes back
+        if browser is not self._browser and not self._pages_out[browser]:
+            del self._pages_out[browser]
+            await self._close_quietly(browser)
+
+    async def _render(self, input_path: Path, output_path: Path) -> Path:
+        async with self._semaphore:
+            for attempt in range(2):
+                page = await self._acquire_page()
+                browser = page.context.browser
+                ok = False
+                try:
+                    # Load HTML file
+                    await page.goto(
+                        f"file://{input_path.absolute()}",
+                        wait_until="networkidle",
+                        timeout=self.timeout * 1000
+                    )
+                    
+                    # Generate PDF
+                    await page.pdf(
+                        path=str(output_path),
+                        format="A4",
+                        print_background=True
+                    )
+                    ok = True
+                except PlaywrightError:
+                    # Retry once on a fresh browser if Chromium crashed underneath us
+                    if attempt == 0 and not browser.is_connected():
+                        continue
+                    raise
+                finally:
+                    await self._release_page(page, reusable=ok)
+                self._browser_conversions += 1
+                self.conversions += 1
+                return output_path
+
+    async def _shutdown(self):
+        for page in self._idle_pages:
+            await self._close_quietly(page.context)
+        self._idle_pages = []
+        await self._close_quietly(self._browser)
+        self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    @staticmethod
+    async def _close_quietly(closable):
+        if closable is None:
+            return
+        try:
+            await closable.close()
+        except PlaywrightError:
+            pass
+
+
+_pool: BrowserPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide browser pool (not started until first use)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool()
+    return _pool
+
+
+def start_browser_pool():
+    """Launch the shared browser ahead of the first conversion."""
+    get_browser_pool().start()
+
+
+def stop_browser_pool():
+    """Close the shared browser if it was started."""
+    if _pool is not None:
+        _pool.stop()
@@ -0,0 +1,87 @@
+"""
+Compare two chunk files produced from the same document by different pipelines.
+"""
+import json
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+HeaderPath = Tuple[str, ...]
+
+
+def _header_path(chunk: Dict[str, Any]) -> HeaderPath:
+    """Titles from the outermost parent down to the chunk itself."""
+    titles = [parent["title"] for parent in chunk["parents"]]
+    if chunk["self"]["title"]:
+        titles.append(chunk["self"]["title"])
+    return tuple(" ".join(title.split()).lower() for title in titles)
+
+
+def _group_by_path(chunks: List[Dict[str, Any]]) -> Dict[HeaderPath, str]:
+    grouped: Dict[HeaderPath, List[str]] = {}
+    for chunk in chunks:
+        grouped.setdefault(_header_path(chunk), []).append(chunk["text"])
+    return {path: "\n".join(texts) for path, texts in grouped.items()}
+
+
+def compare_chunk_files(
+    reference_path: str | Path,
+    candidate_path: str | Path,
+    max_examples: int = 20
+) -> Dict[str, Any]:
+    """
+    Report chunk-level differences between a reference and a candidate chunk file.
+    
+    Chunks are matched by their header path (parent titles + own title, case and
+    whitespace insensitive) since chunk IDs differ between runs.
+    
+    Args:
+        reference_path: Chunks from the reference pipeline (e.g. the PDF path)
+        candidate_path: Chunks from the pipeline under evaluation
+        max_examples: Maximum header paths listed per difference category
+        
+    Returns:
+        Dict with chunk counts, matched/missing/extra header paths and the mean
+        text similarity (0-1) of matched sections
+    """
+    with open(reference_path, 'r', encoding='utf-8') as f:
+        reference = json.load(f)
+    with open(candidate_path, 'r', encoding='utf-8') as f:
+        candidate = json.load(f)
+    
+    ref_sections = _group_by_path(reference)
+    cand_sections = _group_by_path(candidate)
+    
+    matched = ref_sections.keys() & cand_sections.keys()
+    missing = sorted(ref_sections.keys() - cand_sections.keys())
+    extra = sorted(cand_sections.keys() - ref_sections.keys())
+    
+    similarities = []
+    differing = []
+    for path in matched:
+        ratio = SequenceMatcher(None, ref_sections[path], cand_sections[path]).ratio()
+        similarities.append(ratio)
+        if ratio < 0.9:
+            differing.append((ratio, path))
+    differing.sort()
+    
+    def fmt(path: HeaderPath) -> str:
+        return " > ".join(path) or "(no header)"
+    
+    return {
+        "reference_chunks": len(reference),
+        "candidate_chunks": len(candidate),
+        "matched_sections": len(matched),
+        "missing_sections": len(missing),
+        "extra_sections": len(extra),
+        "mean_text_similarity": round(sum(similarities) / len(similarities), 4)
+        if similarities else 0.0,
+        "examples": {
+            "missing": [fmt(p) for p in missing[:max_examples]],
+            "extra": [fmt(p) for p in extra[:max_examples]],
+            "differing_text": [
+                {"section": fmt(p), "similarity": round(r, 4)}
+                for r, p in differing[:max_examples]
+            ],
+        },
+    }
@@ -0,0 +1,63 @@
+"""
+Diff two versions of a document's chunks by chunk ID.
+
+Chunk IDs are deterministic (document, header path, occurrence), so a chunk
+with the same ID in both versions is the same section: only added, changed
+and removed IDs need re-embedding and re-indexing downstream.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+from backend.converters.markdown_to_chunks import iter_chunk_file
+
+
+def chunk_fingerprints(chunks_path: str | Path) -> Dict[str, str]:
+    """
+    Map each chunk ID in a chunks file to a digest of its content.
+    
+    Args:
+        chunks_path: Chunks JSON file; a missing file has no chunks
+    
+    Returns:
+        Dict of chunk_id → hex digest of the chunk's header, parents and text,
+        in file order
+    """
+    chunks_path = Path(chunks_path)
+    if not chunks_path.exists():
+        return {}
+    fingerprints = {}
+    for chunk in iter_chunk_file(chunks_path):
+        payload = json.dumps(chunk, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        fingerprints[chunk["chunk_id"]] = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    return fingerprints
+
+
+def diff_chunk_fingerprints(
+    previous: Dict[str, str],
+    current: Dict[str, str]
+) -> Dict[str, Any]:
+    """
+    Report which chunks were added, changed or removed between two versions.
+    
+    Args:
+        previous: Fingerprints of the earlier chunks file
+        current: Fingerprints of the new chunks file
+    
+    Returns:
+        Dict with 'added', 'changed' and 'removed' chunk ID lists (in file
+        order) and the 'unchanged' count
+    """
+    added = [chunk_id for chunk_id in current if chunk_id not in previous]
+    changed = [
+        chunk_id for chunk_id, digest in current.items()
+        if chunk_id in previous and previous[chunk_id] != digest
+    ]
+    removed = [chunk_id for chunk_id in previous if chunk_id not in current]
+    return {
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+        "unchanged": len(current) - len(added) - len(changed),
+    }
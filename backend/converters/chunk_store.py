@@ -0,0 +1,226 @@
+"""
+Compact chunk storage with an offset index for random access.
+
+Next to each data/chunks/<doc>.json (kept for compatibility) the pipeline writes:
+- <doc>.jsonl: one compact JSON chunk per line, or <doc>.jsonlz with one
+  zlib-compressed record per chunk when CHUNK_STORE_COMPRESS is set
+- <doc>.idx.json: byte offset, length and parent IDs of every record
+
+ChunkStore memory-maps the data file, so fetching one chunk or one header
+subtree decodes only those records instead of the whole document.
+"""
+import json
+import mmap
+import os
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from backend.config import CHUNK_STORE_COMPRESS
+
+INDEX_VERSION = 1
+
+# Index record: [chunk_id, offset, length, parent chunk IDs]
+IndexRecord = List[Any]
+
+
+def chunk_store_paths(chunks_path: str | Path, compress: bool = CHUNK_STORE_COMPRESS) -> Tuple[Path, Path]:
+    """
+    Locate the store files belonging to a chunks JSON file.
+    
+    Args:
+        chunks_path: Path to <doc>.json
+        compress: Whether the data file holds compressed records
+    
+    Returns:
+        Tuple of (data file path, index file path)
+    """
+    chunks_path = Path(chunks_path)
+    stem = chunks_path.stem
+    suffix = ".jsonlz" if compress else ".jsonl"
+    return chunks_path.with_name(stem + suffix), chunks_path.with_name(stem + ".idx.json")
+
+
+class ChunkStoreWriter:
+    """
+    Writes chunks to a record file and its offset index one at a time.
+    
+    Both files are written under temporary names and moved into place on
+    close, so readers never see a data file that does not match its index.
+    """
+    
+    def __init__(self, chunks_path: str | Path, compress: bool = CHUNK_STORE_COMPRESS):
+        self.compress = compress
+        self.data_path, self.index_path = chunk_store_paths(chunks_path, compress)
+        self._tmp_data_path = self.data_path.with_name(self.data_path.name + ".tmp")
+        self._file = open(self._tmp_data_path, 'wb')
+        self._records: List[IndexRecord] = []
+        self._offset = 0
+    
+    def write(self, chunk: Dict[str, Any]):
+        payload = json.dumps(chunk, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        record = zlib.compress(payload) if self.compress else payload + b"\n"
+        self._file.write(record)
+        self._records.append([
+            chunk["chunk_id"],
+            self._offset,
+            len(record),
+            [parent["id"] for parent in chunk["parents"]],
+        ])
+        self._offset += len(record)
+    
+    def close(self):
+        self._file.close()
+        os.replace(self._tmp_data_path, self.data_path)
+        
+        tmp_index_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp_index_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "compressed": self.compress,
+                "records": self._records,
+            }, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_index_path, self.index_path)
+        
+        # Drop a data file left over from the other compression setting
+        other_data_path, _ = chunk_store_paths(self.data_path, not self.compress)
+        other_data_path.unlink(missing_ok=True)
+    
+    def discard(self):
+        self._file.close()
+        self._tmp_data_path.unlink(missing_ok=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class ChunkStore:
+    """
+    Read-only, memory-mapped access to one document's chunk store.
+    
+    Lookups by chunk ID are O(1) through the index; only the requested
+    records are decoded.
+    """
+    
+    def __init__(self, chunks_path: str | Path):
+        """
+        Open the store written for a chunks JSON file.
+        
+        Args:
+            chunks_path: Path to <doc>.json (the store files sit next to it)
+        
+        Raises:
+            FileNotFoundError: If the document has no chunk store
+            ValueError: If the index was written by an incompatible version
+        """
+        _, index_path = chunk_store_paths(chunks_path)
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported chunk index version in {index_path}")
+        
+        self.compressed: bool = index["compressed"]
+        self.data_path, self.index_path = chunk_store_paths(chunks_path, self.compressed)
+        self._records: List[IndexRecord] = index["records"]
+        self._positions: Dict[str, int] = {
+            record[0]: position for position, record in enumerate(self._records)
+        }
+        self._descendants: Optional[Dict[str, List[int]]] = None
+        
+        self._file = open(self.data_path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+    
+    def _read(self, position: int) -> Dict[str, Any]:
+        _, offset, length, _ = self._records[position]
+        record = self._mmap[offset:offset + length]
+        if self.compressed:
+            record = zlib.decompress(record)
+        return json.loads(record)
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def __contains__(self, chunk_id: str) -> bool:
+        return chunk_id in self._positions
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Yield every chunk lazily, in document order."""
+        for position in range(len(self._records)):
+            yield self._read(position)
+    
+    def ids(self) -> List[str]:
+        """Chunk IDs in document order."""
+        return [record[0] for record in self._records]
+    
+    def get(self, chunk_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch one chunk.
+        
+        Args:
+            chunk_id: ID of the chunk
+        
+        Returns:
+            The chunk, or None if the document has no such chunk
+        """
+        position = self._positions.get(chunk_id)
+        if position is None:
+            return None
+        return self._read(position)
+    
+    def subtree(self, chunk_id: str) -> List[Dict[str, Any]]:
+        """
+        Fetch a header's chunk and every chunk nested under it.
+        
+        Args:
+            chunk_id: ID of a chunk or of a header referenced in `parents`
+        
+        Returns:
+            Matching chunks in document order (empty if the ID is unknown)
+        """
+        if self._descendants is None:
+            self._descendants = {}
+            for position, record in enumerate(self._records):
+                for parent_id in record[3]:
+                    self._descendants.setdefault(parent_id, []).append(position)
+        
+        positions = list(self._descendants.get(chunk_id, []))
+        if chunk_id in self._positions:
+            positions.append(self._positions[chunk_id])
+        return [self._read(position) for position in sorted(positions)]
+    
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_chunk_store(chunks_path: str | Path, compress: bool = CHUNK_STORE_COMPRESS) -> Path:
+    """
+    Build the chunk store for an existing chunks JSON file.
+    
+    Args:
+        chunks_path: Path to <doc>.json
+        compress: Whether to compress each record
+    
+    Returns:
+        Path to the written index file
+    """
+    from backend.converters.markdown_to_chunks import iter_chunk_file
+    
+    with ChunkStoreWriter(chunks_path, compress) as writer:
+        for chunk in iter_chunk_file(chunks_path):
+            writer.write(chunk)
+    return writer.index_path
@@ -0,0 +1,170 @@
+"""
+Process-wide pool of pre-initialized Docling converters.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+from docling.document_converter import DocumentConverter
+from docling.datamodel.base_models import InputFormat
+
+from backend.config import DOCLING_POOL_SIZE, DOCLING_WARMUP_OCR
+
+# Pool key: (enable_ocr, enable_table_structure)
+PoolKey = Tuple[bool, bool]
+
+
+class ConverterPool:
+    """
+    Keeps warm DocumentConverter instances keyed by pipeline options.
+
+    Converters are checked out for the duration of a single conversion and
+    returned afterwards, so layout/table models are only loaded once per
+    pool slot instead of once per request.
+    """
+
+    def __init__(self, size: int = DOCLING_POOL_SIZE):
+        """
+        Args:
+            size: Maximum number of converters kept per pipeline-options key
+        """
+        self.size = max(1, size)
+        self._idle: Dict[PoolKey, List[DocumentConverter]] = {}
+        self._created: Dict[PoolKey, int] = {}
+        self._cond = threading.Condition()
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.warmup_seconds = 0.0
+
+    def _create(self, key: PoolKey) -> DocumentConverter:
+        """Build a converter and load its PDF pipeline models eagerly."""
+        # Imported here to avoid a circular import with pdf_to_markdown
+        from backend.converters.pdf_to_markdown import create_converter
+
+        enable_ocr, enable_table_structure = key
+        converter = create_converter(
+            enable_ocr=enable_ocr,
+            enable_table_structure=enable_table_structure,
+        )
+        converter.initialize_pipeline(InputFormat.PDF)
+        return converter
+
+    def warmup(self, keys: List[PoolKey]) -> float:
+        """
+        Pre-create one converter for each key.
+
+        Args:
+            keys: Pipeline-option keys to warm
+
+        Returns:
+            Seconds spent warming
+        """
+        start = time.perf_counter()
+        for key in keys:
+            with self._cond:
+                if self._created.get(key, 0) > 0:
+                    continue
+                self._created[key] = self._created.get(key, 0) + 1
+            try:
+                converter = self._create(key)
+            except Exception:
+                with self._cond:
+                    self._created[key] -= 1
+                raise
+            with self._cond:
+                self._idle.setdefault(key, []).append(converter)
+                self._cond.notify()
+        elapsed = time.perf_counter() - start
+        self.warmup_seconds += elapsed
+        return elapsed
+
+    @contextmanager
+    def checkout(
+        self,
+        enable_ocr: bool = False,
+        enable_table_structure: bool = True
+    ) -> Iterator[DocumentConverter]:
+        """
+        Borrow a converter for the given options, returning it on exit.
+
+        Blocks when all converters for the key are in use and the pool is full.
+        """
+        key = (enable_ocr, enable_table_structure)
+        converter = None
+
+        with self._cond:
+            while True:
+                idle = self._idle.get(key)
+                if idle:
+                    converter = idle.pop()
+                    self.hits += 1
+                    break
+                if self._created.get(key, 0) < self.size:
+                    self._created[key] = self._created.get(key, 0) + 1
+                    self.misses += 1
+                    break
+                self.waits += 1
+                self._cond.wait()
+
+        if converter is None:
+            try:
+                converter = self._create(key)
+            except Exception:
+                with self._cond:
+                    self._created[key] -= 1
+                    self._cond.notify()
+                raise
+
+        try:
+            yield converter
+        finally:
+            with self._cond:
+                self._idle.setdefault(key, []).append(converter)
+                self._cond.notify()
+
+    def stats(self) -> dict:
+        """Return pool counters for monitoring."""
+        with self._cond:
+            return {
+                "size": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "waits": self.waits,
+                "warmup_seconds": round(self.warmup_seconds, 3),
+                "converters": {
+                    f"ocr={ocr},tables={tables}": {
+                        "created": created,
+                        "idle": len(self._idle.get((ocr, tables), [])),
+                    }
+                    for (ocr, tables), created in self._created.items()
+                },
+            }
+
+
+_pool: ConverterPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_converter_pool() -> ConverterPool:
+    """Return the process-wide converter pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConverterPool()
+    return _pool
+
+
+def warmup_converter_pool() -> float:
+    """
+    Warm the default converter (and the OCR variant if configured).
+
+    Returns:
+        Seconds spent warming
+    """
+    keys: List[PoolKey] = [(False, True)]
+    if DOCLING_WARMUP_OCR:
+        keys.append((True, True))
+    return get_converter_pool().warmup(keys)
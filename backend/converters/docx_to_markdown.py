@@ -0,0 +1,221 @@
+"""
+Convert DOCX files directly to Markdown from their native structure.
+
+Reads the OOXML parts (styles, numbering, document body) with the standard
+library, so headings, lists and tables come straight from the Word styles
+instead of being recovered from a rendered PDF by LibreOffice and Docling.
+"""
+import re
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional
+from xml.etree import ElementTree
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_HEADING_STYLE = re.compile(r"^heading\s*(\d)$", re.IGNORECASE)
+_ORDERED_FORMATS = {
+    "decimal", "lowerLetter", "upperLetter", "lowerRoman", "upperRoman", "decimalZero",
+}
+
+
+def _read_part(archive: zipfile.ZipFile, name: str) -> Optional[ElementTree.Element]:
+    try:
+        return ElementTree.fromstring(archive.read(name))
+    except KeyError:
+        return None
+
+
+def _heading_styles(styles: Optional[ElementTree.Element]) -> Dict[str, int]:
+    """Map paragraph style IDs to heading levels (1-6)."""
+    levels: Dict[str, int] = {}
+    if styles is None:
+        return levels
+    for style in styles.iter(f"{_W}style"):
+        style_id = style.get(f"{_W}styleId")
+        name_el = style.find(f"{_W}name")
+        name = name_el.get(f"{_W}val", "") if name_el is not None else ""
+        outline = style.find(f"{_W}pPr/{_W}outlineLvl")
+        match = _HEADING_STYLE.match(name)
+        if name.lower() == "title":
+            levels[style_id] = 1
+        elif match:
+            levels[style_id] = int(match.group(1))
+        elif outline is not None:
+            levels[style_id] = int(outline.get(f"{_W}val", "9")) + 1
+    return {sid: level for sid, level in levels.items() if 1 <= level <= 6}
+
+
+def _list_formats(numbering: Optional[ElementTree.Element]) -> Dict[tuple, str]:
+    """Map (numId, ilvl) to the level's number format ('bullet', 'decimal', ...)."""
+    formats: Dict[tuple, str] = {}
+    if numbering is None:
+        return formats
+    abstract: Dict[str, Dict[str, str]] = {}
+    for abstract_num in numbering.iter(f"{_W}abstractNum"):
+        levels = {}
+        for lvl in abstract_num.iter(f"{_W}lvl"):
+            fmt = lvl.find(f"{_W}numFmt")
+            levels[lvl.get(f"{_W}ilvl")] = fmt.get(f"{_W}val") if fmt is not None else "bullet"
+        abstract[abstract_num.get(f"{_W}abstractNumId")] = levels
+    for num in numbering.iter(f"{_W}num"):
+        ref = num.find(f"{_W}abstractNumId")
+        if ref is None:
+            continue
+        for ilvl, fmt in abstract.get(ref.get(f"{_W}val"), {}).items():
+            formats[(num.get(f"{_W}numId"), ilvl)] = fmt
+    return formats
+
+
+def _paragraph_text(paragraph: ElementTree.Element, keep_breaks: bool = False) -> str:
+    """Text of a paragraph; manual line breaks become newlines if keep_breaks."""
+    parts = []
+    for node in paragraph.iter():
+        if node.tag == f"{_W}t":
+            parts.append(node.text or "")
+        elif node.tag == f"{_W}tab":
+            parts.append(" ")
+        elif node.tag in (f"{_W}br", f"{_W}cr"):
+            parts.append("\n" if keep_breaks else " ")
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+class _DocxMarkdownWriter:
+    """Walks the document body and renders Markdown blocks."""
+
+    def __init__(self, heading_styles: Dict[str, int], list_formats: Dict[tuple, str]):
+        self.heading_styles = heading_styles
+        self.list_formats = list_formats
+        self.blocks: List[str] = []
+        self.heading_count = 0
+        self._list_lines: List[str] = []
+        self._counters: Dict[tuple, int] = {}
+
+    def _end_list(self):
+        if self._list_lines:
+            self.blocks.append("\n".join(self._list_lines))
+            self._list_lines = []
+            self._counters = {}
+
+    def paragraph(self, paragraph: ElementTree.Element):
+        text = _paragraph_text(paragraph)
+        ppr = paragraph.find(f"{_W}pPr")
+        style_id = None
+        num_pr = None
+        outline = None
+        if ppr is not None:
+            style = ppr.find(f"{_W}pStyle")
+            style_id = style.get(f"{_W}val") if style is not None else None
+            num_pr = ppr.find(f"{_W}numPr")
+            outline = ppr.find(f"{_W}outlineLvl")
+        
+        level = self.heading_styles.get(style_id)
+        if level is None and outline is not None:
+            level = int(outline.get(f"{_W}val", "9")) + 1
+            level = level if 1 <= level <= 6 else None
+        
+        if not text:
+            return
+        if level is not None:
+            self._end_list()
+            self.blocks.append(f"{'#' * level} {text}")
+            self.heading_count += 1
+        elif num_pr is not None:
+            ilvl_el = num_pr.find(f"{_W}ilvl")
+            num_el = num_pr.find(f"{_W}numId")
+            ilvl = ilvl_el.get(f"{_W}val", "0") if ilvl_el is not None else "0"
+            num_id = num_el.get(f"{_W}val") if num_el is not None else None
+            fmt = self.list_formats.get((num_id, ilvl), "bullet")
+            indent = "  " * int(ilvl)
+            if fmt in _ORDERED_FORMATS:
+                key = (num_id, ilvl)
+                self._counters[key] = self._counters.get(key, 0) + 1
+                # Deeper levels restart when a shallower item appears
+                for other in [k for k in self._counters if k[0] == num_id and int(k[1]) > int(ilvl)]:
+                    del self._counters[other]
+                marker = f"{self._counters[key]}."
+            else:
+                marker = "-"
+            self._list_lines.append(f"{indent}{marker} {text}")
+        else:
+            self._end_list()
+            self.blocks.append(_paragraph_text(paragraph, keep_breaks=True))
+
+    def table(self, table: ElementTree.Element):
+        self._end_list()
+        rows = []
+        for tr in table.findall(f"{_W}tr"):
+            cells = []
+            for tc in tr.findall(f"{_W}tc"):
+                # Nested tables and multi-paragraph cells are flattened into one line
+                texts = [_paragraph_text(p) for p in tc.iter(f"{_W}p")]
+                cells.append(" ".join(t for t in texts if t).replace("|", "\\|"))
+            if any(cells):
+                rows.append(cells)
+        if not rows:
+            return
+        width = max(len(row) for row in rows)
+        rows = [row + [""] * (width - len(row)) for row in rows]
+        lines = ["| " + " | ".join(rows[0]) + " |", "|" + "---|" * width]
+        lines += ["| " + " | ".join(row) + " |" for row in rows[1:]]
+        self.blocks.append("\n".join(lines))
+
+    def walk(self, container: ElementTree.Element):
+        for child in container:
+            if child.tag == f"{_W}p":
+                self.paragraph(child)
+            elif child.tag == f"{_W}tbl":
+                self.table(child)
+            elif child.tag == f"{_W}sdt":
+                # Content controls (e.g. tables of contents) wrap regular blocks
+                content = child.find(f"{_W}sdtContent")
+                if content is not None:
+                    self.walk(content)
+        self._end_list()
+
+
+def convert_docx_to_markdown(input_path: str | Path, output_path: str | Path) -> int:
+    """
+    Convert a DOCX file's headings, paragraphs, lists and tables to Markdown.
+    
+    Heading levels come from the Word heading styles (or outline levels), so
+    no LibreOffice rendering or Docling layout analysis is needed. Legacy
+    binary .doc files are not readable this way: they report zero headings
+    and produce a blank Markdown file.
+    
+    Args:
+        input_path: Path to input DOCX file
+        output_path: Path for output Markdown file
+        
+    Returns:
+        Number of headings found (0 means the document has no explicit structure)
+        
+    Raises:
+        FileNotFoundError: If input file doesn't exist
+    """
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    
+    if not input_path.exists():
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+    
+    document = styles = numbering = None
+    if zipfile.is_zipfile(input_path):
+        with zipfile.ZipFile(input_path) as archive:
+            document = _read_part(archive, "word/document.xml")
+            styles = _read_part(archive, "word/styles.xml")
+            numbering = _read_part(archive, "word/numbering.xml")
+    
+    writer = _DocxMarkdownWriter(_heading_styles(styles), _list_formats(numbering))
+    body = document.find(f"{_W}body") if document is not None else None
+    if body is not None:
+        writer.walk(body)
+    
+    # Ensure output directory exists
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    # Save to file (blank when the document could not be read)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write("\n\n".join(writer.blocks) + "\n")
+    
+    return writer.heading_count
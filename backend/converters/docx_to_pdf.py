@@ -3,21 +3,69 @@ Convert DOCX files to PDF using LibreOffice.
 """
 from dotenv import load_dotenv
 load_dotenv()
-import subprocess
+import threading
 from pathlib import Path
 import os 
+from backend.config import (
+    LIBREOFFICE_INSTANCES,
+    LIBREOFFICE_BASE_PORT,
+    LIBREOFFICE_PROFILE_DIR,
+    LIBREOFFICE_TIMEOUT,
+)
+from backend.converters.libreoffice_pool import LibreOfficePool
 LIBREOFFICE_BIN = os.getenv("LIBREOFFICE_BIN")
 
+_pool: LibreOfficePool | None = None
+_pool_lock = threading.Lock()
 
-if not LIBREOFFICE_BIN:
-    raise RuntimeError("LIBREOFFICE_BIN not set")
 
-if not Path(LIBREOFFICE_BIN).exists():
-    raise RuntimeError(f"LibreOffice not found at {LIBREOFFICE_BIN}")
+def libreoffice_missing() -> str | None:
+    """Why LibreOffice cannot be used, or None if LIBREOFFICE_BIN points to a binary."""
+    if not LIBREOFFICE_BIN:
+        return "LIBREOFFICE_BIN not set"
+    if not Path(LIBREOFFICE_BIN).exists():
+        return f"LibreOffice not found at {LIBREOFFICE_BIN}"
+    return None
+
+
+def get_libreoffice_pool() -> LibreOfficePool:
+    """
+    Return the process-wide LibreOffice pool (instances start on first use).
+    
+    Raises:
+        RuntimeError: If LIBREOFFICE_BIN is not set or does not exist
+    """
+    global _pool
+    if _pool is None:
+        missing = libreoffice_missing()
+        if missing:
+            raise RuntimeError(missing)
+        with _pool_lock:
+            if _pool is None:
+                _pool = LibreOfficePool(
+                    binary=LIBREOFFICE_BIN,
+                    size=LIBREOFFICE_INSTANCES,
+                    base_port=LIBREOFFICE_BASE_PORT,
+                    profile_root=LIBREOFFICE_PROFILE_DIR,
+                    timeout=LIBREOFFICE_TIMEOUT,
+                )
+    return _pool
+
+
+def start_libreoffice_pool():
+    """Launch the LibreOffice instances ahead of the first conversion."""
+    get_libreoffice_pool().start()
+
+
+def stop_libreoffice_pool():
+    """Terminate the LibreOffice instances if they were started."""
+    if _pool is not None:
+        _pool.stop()
+
 
 def convert_docx_to_pdf(input_path: str | Path, output_path: str | Path) -> Path:
     """
-    Convert DOCX file to PDF using LibreOffice headless mode.
+    Convert DOCX file to PDF using a pooled headless LibreOffice instance.
     
     Args:
         input_path: Path to input DOCX file
@@ -28,7 +76,9 @@ def convert_docx_to_pdf(input_path: str | Path, output_path: str | Path) -> Path
         
     Raises:
         subprocess.CalledProcessError: If conversion fails
+        TimeoutError: If conversion exceeds LIBREOFFICE_TIMEOUT
         FileNotFoundError: If input file doesn't exist
+        RuntimeError: If LibreOffice is not configured (see libreoffice_missing)
     """
     input_path = Path(input_path)
     output_path = Path(output_path)
@@ -39,23 +89,5 @@ def convert_docx_to_pdf(input_path: str | Path, output_path: str | Path) -> Path
     # Ensure output directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # LibreOffice conversion command
-    cmd = [
-        LIBREOFFICE_BIN,
-        "--headless",
-        "--convert-to", "pdf",
-        "--outdir", str(output_path.parent),
-        str(input_path)
-    ]
-    
-    # Run conversion
-    result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-    
-    # LibreOffice creates the PDF with the same name as input
-    generated_pdf = output_path.parent / f"{input_path.stem}.pdf"
-    
-    # Rename if needed
-    if generated_pdf != output_path:
-        generated_pdf.rename(output_path)
-    
-    return output_path
+    # Run conversion on the next free instance
+    return get_libreoffice_pool().convert(input_path, output_path)
@@ -0,0 +1,255 @@
+"""
+Convert HTML files directly to Markdown, bypassing the PDF/Docling round trip.
+"""
+import re
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import List, Optional
+
+# Elements whose content is never rendered
+_SKIP_TAGS = {"head", "script", "style", "title", "noscript", "template", "svg"}
+
+# Elements that start a new block of text
+_BLOCK_TAGS = {
+    "p", "div", "section", "article", "header", "footer", "main", "aside", "nav",
+    "blockquote", "address", "figure", "figcaption", "dl", "dt", "dd", "center",
+}
+
+_HEADING_TAGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+
+# Word-exported HTML marks headings with an outline level instead of <hN>
+_OUTLINE_LEVEL = re.compile(r"mso-outline-level:\s*(\d)", re.IGNORECASE)
+_CHARSET = re.compile(rb"""charset\s*=\s*["']?([\w.:-]+)""", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class _MarkdownBuilder(HTMLParser):
+    """Streams HTML events into Markdown blocks (headings, paragraphs, lists, tables)."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks: List[str] = []
+        self.heading_count = 0
+        self._text: List[str] = []
+        self._skip_depth = 0
+        self._heading_level: Optional[int] = None
+        self._heading_tag: Optional[str] = None
+        self._lists: List[dict] = []
+        self._list_block: Optional[int] = None  # Index of the block holding list items
+        self._tables: List[dict] = []
+        self._pre_depth = 0
+
+    # ------------------------------------------------------------------
+    # Text handling
+    # ------------------------------------------------------------------
+
+    def _flush(self):
+        """Emit the pending text as a paragraph, heading or list item."""
+        if self._pre_depth:
+            return
+        text = _WHITESPACE.sub(" ", "".join(self._text)).strip()
+        self._text = []
+        if not text:
+            return
+
+        if self._tables:
+            # Inside a table cell: keep as cell text
+            table = self._tables[-1]
+            if table["cell"] is not None:
+                table["cell"].append(text)
+            return
+
+        if self._heading_level:
+            self.blocks.append(f"{'#' * self._heading_level} {text}")
+            self.heading_count += 1
+        elif self._lists:
+            current = self._lists[-1]
+            indent = "  " * (len(self._lists) - 1)
+            if current["ordered"]:
+                current["counter"] += 1
+                marker = f"{current['counter']}."
+            else:
+                marker = "-"
+            self._append_list_line(f"{indent}{marker} {text}")
+        else:
+            self.blocks.append(text)
+
+    def _append_list_line(self, line: str):
+        # Consecutive list items form one Markdown block; a paragraph that merely
+        # starts with "- " or "1. " is not a list
+        if self.blocks and self._list_block == len(self.blocks) - 1:
+            self.blocks[-1] += "\n" + line
+        else:
+            self.blocks.append(line)
+            self._list_block = len(self.blocks) - 1
+
+    # ------------------------------------------------------------------
+    # HTMLParser callbacks
+    # ------------------------------------------------------------------
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        if self._skip_depth:
+            return
+
+        attrs = dict(attrs)
+        level = _HEADING_TAGS.get(tag)
+        if level is None and tag in {"p", "div"}:
+            match = _OUTLINE_LEVEL.search(attrs.get("style") or "")
+            if match and 1 <= int(match.group(1)) <= 6:
+                level = int(match.group(1))
+
+        if level is not None and not self._tables:
+            self._flush()
+            self._heading_level = level
+            self._heading_tag = tag
+        elif tag in ("ul", "ol"):
+            self._flush()
+            self._lists.append({"ordered": tag == "ol", "counter": 0})
+        elif tag == "li":
+            self._flush()
+        elif tag == "table":
+            self._flush()
+            self._tables.append({"rows": [], "row": None, "cell": None})
+        elif tag == "tr" and self._tables:
+            self._tables[-1]["row"] = []
+        elif tag in ("td", "th") and self._tables:
+            self._flush()
+            self._tables[-1]["cell"] = []
+        elif tag == "br":
+            self._text.append("\n" if self._pre_depth else " ")
+        elif tag == "pre":
+            self._flush()
+            self._pre_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if self._skip_depth:
+            return
+
+        if self._heading_level and tag == self._heading_tag:
+            self._flush()
+            self._heading_level = None
+            self._heading_tag = None
+        elif tag in ("ul", "ol") and self._lists:
+            self._flush()
+            self._lists.pop()
+        elif tag in ("td", "th") and self._tables:
+            self._flush()
+            table = self._tables[-1]
+            if table["cell"] is not None and table["row"] is not None:
+                table["row"].append(" ".join(table["cell"]))
+            table["cell"] = None
+        elif tag == "tr" and self._tables:
+            table = self._tables[-1]
+            if table["row"]:
+                table["rows"].append(table["row"])
+            table["row"] = None
+        elif tag == "table" and self._tables:
+            self._flush()
+            table = self._tables.pop()
+            markdown = _render_table(table["rows"])
+            if self._tables:
+                # Nested table: flatten into the enclosing cell
+                outer = self._tables[-1]
+                if outer["cell"] is not None:
+                    outer["cell"].append(" ".join(" ".join(r) for r in table["rows"]))
+            elif markdown:
+                self.blocks.append(markdown)
+        elif tag == "pre" and self._pre_depth:
+            self._pre_depth -= 1
+            code = "".join(self._text).strip("\n")
+            self._text = []
+            if code:
+                self.blocks.append(f"```\n{code}\n```")
+        elif tag == "li" or tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._text.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _render_table(rows: List[List[str]]) -> str:
+    """Render rows as a GitHub-style pipe table (first row is the header)."""
+    rows = [[cell.replace("|", "\\|") for cell in row] for row in rows if any(row)]
+    if not rows:
+        return ""
+    width = max(len(row) for row in rows)
+    rows = [row + [""] * (width - len(row)) for row in rows]
+    lines = ["| " + " | ".join(rows[0]) + " |", "|" + "---|" * width]
+    lines += ["| " + " | ".join(row) + " |" for row in rows[1:]]
+    return "\n".join(lines)
+
+
+def _read_html(input_path: Path) -> str:
+    """Decode an HTML file using its declared charset (Word exports use windows-1252)."""
+    raw = input_path.read_bytes()
+    match = _CHARSET.search(raw[:4096])
+    encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return raw.decode(encoding, errors="replace")
+    except LookupError:
+        return raw.decode("utf-8", errors="replace")
+
+
+def html_to_markdown_text(html: str) -> tuple[str, int]:
+    """
+    Convert an HTML string to Markdown.
+    
+    Args:
+        html: HTML source
+        
+    Returns:
+        Tuple of (markdown, number of headings found)
+    """
+    builder = _MarkdownBuilder()
+    builder.feed(html)
+    builder.close()
+    return "\n\n".join(builder.blocks) + "\n", builder.heading_count
+
+
+def convert_html_to_markdown(input_path: str | Path, output_path: str | Path) -> int:
+    """
+    Convert HTML headings, paragraphs, lists and tables straight to Markdown.
+    
+    Produces the same shape convert_markdown_to_chunks() expects from the
+    Docling export (ATX headings, blank-line separated blocks, pipe tables)
+    without rendering a PDF.
+    
+    Args:
+        input_path: Path to input HTML file
+        output_path: Path for output Markdown file
+        
+    Returns:
+        Number of headings found (0 means the document has no explicit structure)
+        
+    Raises:
+        FileNotFoundError: If input file doesn't exist
+    """
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    
+    if not input_path.exists():
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+    
+    # Ensure output directory exists
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    markdown_content, heading_count = html_to_markdown_text(_read_html(input_path))
+    
+    # Save to file
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(markdown_content)
+    
+    return heading_count
@@ -0,0 +1,303 @@
+"""
+Pool of persistent headless LibreOffice instances for DOCX→PDF conversion.
+
+Each instance has its own user profile (-env:UserInstallation), so instances
+never contend for the profile lock and conversions run in parallel. When the
+Python UNO bridge is available, instances are long-lived listeners that accept
+conversions over a local socket, avoiding office startup per file; otherwise
+each conversion runs `soffice --convert-to` against the slot's private profile.
+"""
+import logging
+import queue
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    HAS_UNO = True
+except ImportError:  # python3-uno is shipped with LibreOffice, not on PyPI
+    HAS_UNO = False
+
+
+def _prop(name: str, value) -> "PropertyValue":
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+class LibreOfficeInstance:
+    """One headless LibreOffice with a private profile, optionally listening on a port."""
+
+    def __init__(self, binary: str, index: int, port: int, profile_dir: Path, listen: bool):
+        self.binary = binary
+        self.index = index
+        self.port = port
+        self.profile_dir = profile_dir
+        self.listen = listen
+        self.conversions = 0
+        self.restarts = 0
+        self._process: subprocess.Popen | None = None
+        self._desktop = None
+        # UNO calls run here so a hung office can be abandoned after a timeout
+        self._uno_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"uno-{index}")
+
+    @property
+    def profile_url(self) -> str:
+        return self.profile_dir.absolute().as_uri()
+
+    # ------------------------------------------------------------------
+    # Process management
+    # ------------------------------------------------------------------
+
+    def start(self, startup_timeout: float):
+        """Launch the listener and wait until it accepts connections."""
+        if not self.listen:
+            return
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        cmd = [
+            self.binary,
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--nodefault",
+            "--norestore",
+            "--nolockcheck",
+            f"-env:UserInstallation={self.profile_url}",
+            f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext",
+        ]
+        self._process = subprocess.Popen(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + startup_timeout
+        while time.monotonic() < deadline:
+            if self.healthy():
+                return
+            if self._process.poll() is not None:
+                break
+            time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f"LibreOffice instance {self.index} failed to start on port {self.port}")
+
+    def stop(self):
+        """Terminate the listener process."""
+        self._desktop = None
+        if self._process is None:
+            return
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._process = None
+
+    def restart(self, startup_timeout: float):
+        """Kill and relaunch the listener (on crash or hang)."""
+        logger.warning("Restarting LibreOffice instance %d", self.index)
+        self.stop()
+        # A hung UNO call keeps its thread busy; give the instance a fresh one
+        self._uno_thread.shutdown(wait=False, cancel_futures=True)
+        self._uno_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"uno-{self.index}")
+        self.restarts += 1
+        self.start(startup_timeout)
+
+    def healthy(self) -> bool:
+        """True if the process is alive and its UNO socket accepts connections."""
+        if not self.listen:
+            return True
+        if self._process is None or self._process.poll() is not None:
+            return False
+        try:
+            with socket.create_connection(("127.0.0.1", self.port), timeout=1):
+                return True
+        except OSError:
+            return False
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+
+    def _uno_convert(self, input_path: Path, output_path: Path):
+        if self._desktop is None:
+            local = uno.getComponentContext()
+            resolver = local.ServiceManager.createInstanceWithContext(
+                "com.sun.star.bridge.UnoUrlResolver", local
+            )
+            ctx = resolver.resolve(
+                f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+            )
+            self._desktop = ctx.ServiceManager.createInstanceWithContext(
+                "com.sun.star.frame.Desktop", ctx
+            )
+        document = self._desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(str(input_path.absolute())),
+            "_blank",
+            0,
+            (_prop("Hidden", True), _prop("ReadOnly", True)),
+        )
+        try:
+            document.storeToURL(
+                uno.systemPathToFileUrl(str(output_path.absolute())),
+                (_prop("FilterName", "writer_pdf_Export"),),
+            )
+        finally:
+            document.close(True)
+
+    def _cli_convert(self, input_path: Path, output_path: Path, timeout: float):
+        # Convert into a private directory: LibreOffice names output after the input
+        out_dir = self.profile_dir / "out"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        cmd = [
+            self.binary,
+            f"-env:UserInstallation={self.profile_url}",
+            "--headless",
+            "--convert-to", "pdf",
+            "--outdir", str(out_dir),
+            str(input_path)
+        ]
+        subprocess.run(cmd, check=True, capture_output=True, text=True, timeout=timeout)
+        shutil.move(str(out_dir / f"{input_path.stem}.pdf"), str(output_path))
+
+    def convert(self, input_path: Path, output_path: Path, timeout: float):
+        """
+        Convert one document, raising TimeoutError if it takes longer than timeout.
+        
+        The caller is responsible for restarting the instance after a timeout.
+        """
+        if self.listen:
+            future = self._uno_thread.submit(self._uno_convert, input_path, output_path)
+            try:
+                future.result(timeout=timeout)
+            except FutureTimeoutError:
+                raise TimeoutError(
+                    f"LibreOffice conversion of {input_path.name} timed out after {timeout}s"
+                )
+            except Exception:
+                # Drop the bridge; it is re-resolved on the next conversion
+                self._desktop = None
+                raise
+        else:
+            try:
+                self._cli_convert(input_path, output_path, timeout)
+            except subprocess.TimeoutExpired:
+                raise TimeoutError(
+                    f"LibreOffice conversion of {input_path.name} timed out after {timeout}s"
+                )
+        self.conversions += 1
+
+
+class LibreOfficePool:
+    """
+    Fixed set of LibreOffice instances handed out one conversion at a time.
+    
+    Instances are health-checked on checkout and restarted if dead, and an
+    instance whose conversion exceeds the timeout is killed and relaunched.
+    """
+
+    def __init__(
+        self,
+        binary: str,
+        size: int,
+        base_port: int,
+        profile_root: Path,
+        timeout: float,
+        startup_timeout: float = 60.0
+    ):
+        self.binary = binary
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.mode = "listener" if HAS_UNO else "isolated-cli"
+        self.timeouts = 0
+        self.failures = 0
+        self._instances: List[LibreOfficeInstance] = [
+            LibreOfficeInstance(
+                binary, i, base_port + i, profile_root / f"instance-{i}", listen=HAS_UNO
+            )
+            for i in range(self.size)
+        ]
+        self._idle: "queue.Queue[LibreOfficeInstance]" = queue.Queue()
+        self._started = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Launch every instance (idempotent)."""
+        with self._lock:
+            if self._started:
+                return
+            try:
+                for instance in self._instances:
+                    instance.start(self.startup_timeout)
+                    self._idle.put(instance)
+            except BaseException:
+                # Stop what did start (and the failed one), so a retry does not
+                # launch second copies on the same ports and profiles
+                for instance in self._instances:
+                    instance.stop()
+                self._idle = queue.Queue()
+                raise
+            self._started = True
+
+    def stop(self):
+        """Terminate every instance."""
+        with self._lock:
+            for instance in self._instances:
+                instance.stop()
+            self._idle = queue.Queue()
+            self._started = False
+
+    def convert(self, input_path: Path, output_path: Path) -> Path:
+        """
+        Convert a document to PDF on the next free instance.
+        
+        Raises:
+            TimeoutError: If the conversion exceeds the per-conversion timeout
+            subprocess.CalledProcessError: If the isolated CLI conversion fails
+        """
+        self.start()
+        instance = self._idle.get()
+        try:
+            if not instance.healthy():
+                instance.restart(self.startup_timeout)
+            instance.convert(input_path, output_path, self.timeout)
+        except TimeoutError:
+            self.timeouts += 1
+            instance.restart(self.startup_timeout)
+            raise
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self._idle.put(instance)
+        return output_path
+
+    def stats(self) -> dict:
+        """Return pool state for monitoring."""
+        return {
+            "mode": self.mode,
+            "size": self.size,
+            "started": self._started,
+            "idle": self._idle.qsize(),
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "instances": [
+                {
+                    "index": inst.index,
+                    "port": inst.port if inst.listen else None,
+                    "healthy": inst.healthy() if self._started else False,
+                    "conversions": inst.conversions,
+                    "restarts": inst.restarts,
+                }
+                for inst in self._instances
+            ],
+        }
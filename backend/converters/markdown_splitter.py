@@ -0,0 +1,153 @@
+"""
+Single-pass streaming Markdown header splitter.
+
+Produces the same sections as LangChain's MarkdownHeaderTextSplitter (with
+its defaults: headers stripped, lines aggregated by common metadata) while
+reading the input line by line and yielding each section as soon as the
+next one starts, so the whole document is never held in memory.
+"""
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from backend.config import CHUNK_HEADERS
+
+
+class MarkdownSection(NamedTuple):
+    """Text under one header path and the header titles it sits under."""
+    text: str
+    metadata: Dict[str, str]
+
+
+def _text_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Yield lines as str.split("\\n") would, including the empty last line after a final newline."""
+    line = ""
+    for line in lines:
+        yield line
+    if line.endswith("\n"):
+        yield ""
+
+
+def iter_markdown_sections(
+    lines: Iterable[str],
+    headers_to_split_on: List[Tuple[str, str]] = CHUNK_HEADERS
+) -> Iterator[MarkdownSection]:
+    """
+    Split Markdown lines into sections by header.
+    
+    Behaves like MarkdownHeaderTextSplitter.split_text: lines are stripped,
+    fenced code blocks are never split, blank lines end a paragraph and
+    consecutive paragraphs with the same metadata are joined with "  \\n".
+    
+    Args:
+        lines: Markdown lines, e.g. an open text file
+        headers_to_split_on: (separator, metadata name) pairs such as ("##", "header2")
+    
+    Yields:
+        MarkdownSection for each run of content with common header metadata
+    """
+    # Longest separator first so "###" is not taken for "#"
+    headers = [
+        (sep, name, sep.count("#"))
+        for sep, name in sorted(headers_to_split_on, key=lambda split: len(split[0]), reverse=True)
+    ]
+    header_starts = {sep[:1] for sep, _, _ in headers}
+    
+    # Header stack as (level, metadata name); metadata is replaced, never
+    # mutated, so sections already handed out keep their own copy
+    header_stack: List[Tuple[int, Optional[str]]] = []
+    metadata: Dict[str, str] = {}
+    paragraph: List[str] = []
+    
+    # Section being aggregated: paragraphs sharing pending_metadata
+    pending: List[str] = []
+    pending_metadata: Dict[str, str] = {}
+    
+    in_code_block = False
+    opening_fence = ""
+    
+    for line in _text_lines(lines):
+        line = line.strip()
+        if not line.isprintable():
+            line = "".join(filter(str.isprintable, line))
+        
+        if not in_code_block:
+            # Exclude inline code spans
+            if line.startswith("```") and line.count("```") == 1:
+                in_code_block = True
+                opening_fence = "```"
+            elif line.startswith("~~~"):
+                in_code_block = True
+                opening_fence = "~~~"
+        elif line.startswith(opening_fence):
+            in_code_block = False
+            opening_fence = ""
+        
+        if in_code_block:
+            paragraph.append(line)
+            continue
+        
+        header = None
+        if line[:1] in header_starts:
+            for sep, name, level in headers:
+                if line.startswith(sep) and (len(line) == len(sep) or line[len(sep)] == " "):
+                    header = (sep, name, level)
+                    break
+        
+        if header is None:
+            if line:
+                paragraph.append(line)
+                continue
+            if not paragraph:
+                continue
+        
+        # A header or blank line ends the current paragraph
+        if paragraph:
+            text = "\n".join(paragraph)
+            paragraph = []
+            if pending and pending_metadata == metadata:
+                pending.append(text)
+            else:
+                if pending:
+                    yield MarkdownSection("  \n".join(pending), pending_metadata)
+                pending = [text]
+                pending_metadata = metadata
+        
+        if header is not None and header[1] is not None:
+            sep, name, level = header
+            metadata = dict(metadata)
+            # Pop headers of the same or a deeper level
+            while header_stack and header_stack[-1][0] >= level:
+                _, popped = header_stack.pop()
+                metadata.pop(popped, None)
+            header_stack.append((level, name))
+            metadata[name] = line[len(sep):].strip()
+    
+    if paragraph:
+        text = "\n".join(paragraph)
+        if pending and pending_metadata == metadata:
+            pending.append(text)
+        else:
+            if pending:
+                yield MarkdownSection("  \n".join(pending), pending_metadata)
+            pending = [text]
+            pending_metadata = metadata
+    if pending:
+        yield MarkdownSection("  \n".join(pending), pending_metadata)
+
+
+def split_markdown_file(
+    path: str | Path,
+    headers_to_split_on: List[Tuple[str, str]] = CHUNK_HEADERS
+) -> Iterator[MarkdownSection]:
+    """
+    Stream the header sections of a Markdown file.
+    
+    Args:
+        path: Path to a Markdown file
+        headers_to_split_on: (separator, metadata name) pairs
+    
+    Yields:
+        MarkdownSection for each section, in document order
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from iter_markdown_sections(f, headers_to_split_on)
@@ -1,27 +1,134 @@
 """
-Convert Markdown files to JSON chunks with UUID tracking.
+Convert Markdown files to JSON chunks with deterministic UUID tracking.
 """
 import json
 import uuid
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List, Dict, Any
-from langchain_text_splitters import MarkdownHeaderTextSplitter
-from backend.config import CHUNK_HEADERS
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+from backend.config import CHUNK_HEADERS, CHUNK_STORE_ENABLED
+from backend.converters.chunk_store import ChunkStoreWriter
+from backend.converters.markdown_splitter import split_markdown_file
 
+# Splitter metadata names and the header levels they map to, outermost first
+HEADER_LEVELS = [("header1", "h1"), ("header2", "h2"), ("header3", "h3")]
 
-def convert_markdown_to_chunks(input_path: str | Path, output_path: str | Path) -> Path:
+# Namespace for chunk IDs: uuid5 of document ID, header path and occurrence
+CHUNK_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "navtrade:chunk")
+
+# (level, title) pairs from the outermost header down to the chunk's own
+HeaderPath = Tuple[Tuple[str, str], ...]
+
+
+def chunk_id_for(doc_id: str, path: HeaderPath, occurrence: int = 0) -> str:
+    """
+    Derive a stable chunk ID.
+    
+    The same document, header path and occurrence always give the same ID, so
+    re-chunking a revised document only changes the IDs of sections that moved.
+    
+    Args:
+        doc_id: Document identity (the chunks file stem by default)
+        path: Header path of the chunk; empty for content before the first header
+        occurrence: How many earlier chunks in the document share this path
+        
+    Returns:
+        UUID string
+    """
+    parts = [doc_id, *(f"{level}\x1e{title}" for level, title in path), str(occurrence)]
+    return str(uuid.uuid5(CHUNK_ID_NAMESPACE, "\x1f".join(parts)))
+
+
+class ChunkFileWriter:
+    """
+    Writes chunks to a JSON array file one at a time.
+    
+    Output is identical to json.dump(chunks, f, indent=2, ensure_ascii=False)
+    without holding the whole list in memory.
+    """
+
+    def __init__(self, output_path: Path):
+        self._file = open(output_path, 'w', encoding='utf-8')
+        self.count = 0
+
+    def write(self, chunk: Dict[str, Any]):
+        body = json.dumps(chunk, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+        self._file.write(("[\n  " if self.count == 0 else ",\n  ") + body)
+        self.count += 1
+
+    def close(self):
+        self._file.write("\n]" if self.count else "[]")
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_chunk_file(path: str | Path, block_size: int = 65536) -> Iterator[Dict[str, Any]]:
+    """
+    Yield chunks from a chunks JSON file one at a time.
+    
+    Reads the file in blocks and decodes one array element at a time, so
+    memory use is bounded by the largest chunk rather than the file size.
+    
+    Args:
+        path: Path to a chunks JSON file
+        block_size: Number of characters read per block
+    
+    Yields:
+        Chunk dictionaries in file order
+    
+    Raises:
+        ValueError: If the file is not a JSON array of objects
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(block_size).lstrip()
+        if not buffer.startswith("["):
+            raise ValueError(f"Not a chunks file: {path}")
+        buffer = buffer[1:]
+        eof = False
+        while True:
+            buffer = buffer.lstrip().lstrip(",").lstrip()
+            if buffer.startswith("]"):
+                return
+            try:
+                chunk, end = decoder.raw_decode(buffer)
+            except ValueError:
+                if eof:
+                    raise ValueError(f"Truncated chunks file: {path}")
+                block = f.read(block_size)
+                eof = not block
+                buffer += block
+                continue
+            yield chunk
+            buffer = buffer[end:]
+
+
+def convert_markdown_to_chunks(
+    input_path: str | Path,
+    output_path: str | Path,
+    on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None,
+    doc_id: Optional[str] = None
+) -> Path:
     """
     Convert Markdown to hierarchical chunks with UUID tracking.
     
     This function:
-    1. Splits markdown by headers
-    2. Assigns unique IDs to each chunk
+    1. Splits markdown by headers in a single streaming pass
+    2. Assigns deterministic IDs to each chunk (see chunk_id_for)
     3. Tracks parent-child relationships
-    4. Saves as JSON
+    4. Saves as JSON, writing each chunk as soon as it is built
+    5. Writes the compact chunk store alongside (if CHUNK_STORE_ENABLED)
     
     Args:
         input_path: Path to input Markdown file
         output_path: Path for output JSON file
+        on_chunk: Optional callback invoked with each chunk right after it is written
+        doc_id: Document identity used for chunk IDs (default: output file stem)
         
     Returns:
         Path to the generated JSON file
@@ -38,80 +145,65 @@ def convert_markdown_to_chunks(input_path: str | Path, output_path: str | Path)
     # Ensure output directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Read markdown file
-    with open(input_path, 'r', encoding='utf-8') as f:
-        markdown_text = f.read()
+    if doc_id is None:
+        doc_id = output_path.stem
     
-    # Initialize splitter
-    splitter = MarkdownHeaderTextSplitter(headers_to_split_on=CHUNK_HEADERS)
-    docs = splitter.split_text(markdown_text)
+    # Chunks seen per header path, and the ID of the latest one
+    occurrences: Dict[HeaderPath, int] = {}
+    latest_ids: Dict[HeaderPath, str] = {}
     
-    # Track header UUIDs
-    header_registry = {}
+    def get_header_uuid(path: HeaderPath) -> str:
+        """ID of the most recent section for a header path."""
+        if path not in latest_ids:
+            # Header with no text of its own yet: its first section will get this ID
+            latest_ids[path] = chunk_id_for(doc_id, path)
+        return latest_ids[path]
     
-    def get_header_uuid(level: str, title: str) -> str:
-        """Get or create UUID for a header."""
-        key = (level, title)
-        if key not in header_registry:
-            header_registry[key] = str(uuid.uuid4())
-        return header_registry[key]
+    store = ChunkStoreWriter(output_path) if CHUNK_STORE_ENABLED else nullcontext()
     
-    # Process chunks
-    final_chunks = []
-    
-    for doc in docs:
-        metadata = doc.metadata
-        
-        # Detect chunk's header level
-        if "header3" in metadata:
-            self_level = "h3"
-            self_title = metadata["header3"]
-        elif "header2" in metadata:
-            self_level = "h2"
-            self_title = metadata["header2"]
-        elif "header1" in metadata:
-            self_level = "h1"
-            self_title = metadata["header1"]
-        else:
-            self_level = None
-            self_title = None
-        
-        # Assign chunk ID
-        if self_level and self_title:
-            chunk_id = get_header_uuid(self_level, self_title)
-        else:
-            chunk_id = str(uuid.uuid4())
-        
-        # Build parent hierarchy (excluding self)
-        parents = []
-        for header_key, level in [("header1", "h1"), ("header2", "h2"), ("header3", "h3")]:
-            if header_key in metadata:
-                title = metadata[header_key]
-                header_id = get_header_uuid(level, title)
-                
-                # Skip if this is the chunk's own ID
-                if header_id == chunk_id:
-                    continue
-                
+    # Process chunks, streaming each one to the output files
+    with ChunkFileWriter(output_path) as writer, store:
+        for section in split_markdown_file(input_path, CHUNK_HEADERS):
+            metadata = section.metadata
+            
+            # Headers this chunk sits under, outermost first; the deepest is its own
+            path = tuple(
+                (level, metadata[header_key])
+                for header_key, level in HEADER_LEVELS
+                if header_key in metadata
+            )
+            self_level, self_title = path[-1] if path else (None, None)
+            
+            # Assign chunk ID from document, header path and occurrence
+            occurrence = occurrences.get(path, 0)
+            occurrences[path] = occurrence + 1
+            chunk_id = chunk_id_for(doc_id, path, occurrence)
+            if path:
+                latest_ids[path] = chunk_id
+            
+            # Build parent hierarchy (excluding self)
+            parents = []
+            for depth, (level, title) in enumerate(path[:-1], start=1):
                 parents.append({
-                    "id": header_id,
+                    "id": get_header_uuid(path[:depth]),
                     "header": level,
                     "title": title
                 })
-        
-        # Create chunk object
-        final_chunks.append({
-            "chunk_id": chunk_id,
-            "self": {
-                "header": self_level,
-                "title": self_title
-            },
-            "parents": parents,
-            "text": doc.page_content.strip()
-        })
-    
-    # Save to JSON
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(final_chunks, f, indent=2, ensure_ascii=False)
-    
-    return output_path
+            
+            # Create chunk object
+            chunk = {
+                "chunk_id": chunk_id,
+                "self": {
+                    "header": self_level,
+                    "title": self_title
+                },
+                "parents": parents,
+                "text": section.text.strip()
+            }
+            writer.write(chunk)
+            if CHUNK_STORE_ENABLED:
+                store.write(chunk)
+            if on_chunk:
+                on_chunk(chunk)
+    
+    return output_path
\ No newline at end of file
@@ -1,20 +1,40 @@
 """
 Convert PDF files to Markdown using Docling with hierarchical processing.
 """
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import pypdfium2
 from docling.document_converter import DocumentConverter, PdfFormatOption
-from docling.datamodel.base_models import InputFormat
+from docling.datamodel.base_models import InputFormat, ConversionStatus
+from docling.datamodel.document import ConversionResult, InputDocument
 from docling.datamodel.pipeline_options import PdfPipelineOptions
 from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+from docling_core.types.doc import DoclingDocument
 from hierarchical.postprocessor import ResultPostprocessor
+from backend.converters.converter_pool import get_converter_pool
 
+logger = logging.getLogger(__name__)
 
-def create_converter(enable_ocr: bool = False) -> DocumentConverter:
+# Inclusive, 1-based page range as accepted by DocumentConverter.convert()
+PageRange = Tuple[int, int]
+
+# Phase name → seconds spent (plus "pages"), filled in for the caller's metrics
+Phases = Dict[str, float]
+
+
+def create_converter(
+    enable_ocr: bool = False,
+    enable_table_structure: bool = True
+) -> DocumentConverter:
     """
     Create a DocumentConverter with specified options.
     
     Args:
         enable_ocr: Whether to enable OCR for scanned PDFs
+        enable_table_structure: Whether to run table structure recognition
         
     Returns:
         Configured DocumentConverter instance
@@ -23,7 +43,7 @@ def create_converter(enable_ocr: bool = False) -> DocumentConverter:
         do_layout_analysis=True,
         extract_hierarchy=True,
         do_ocr=enable_ocr,
-        do_table_structure=True
+        do_table_structure=enable_table_structure
     )
     
     converter = DocumentConverter(
@@ -38,16 +58,161 @@ def create_converter(enable_ocr: bool = False) -> DocumentConverter:
     return converter
 
 
+def count_pdf_pages(input_path: str | Path) -> int:
+    """Return the number of pages in a PDF."""
+    pdf = pypdfium2.PdfDocument(str(input_path))
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def shard_page_ranges(page_count: int, shard_pages: int) -> List[PageRange]:
+    """
+    Split a document into consecutive page ranges of at most shard_pages pages.
+    
+    Args:
+        page_count: Total pages in the document
+        shard_pages: Maximum pages per shard
+        
+    Returns:
+        List of inclusive, 1-based (start, end) page ranges
+    """
+    return [
+        (start, min(start + shard_pages - 1, page_count))
+        for start in range(1, page_count + 1, shard_pages)
+    ]
+
+
+def convert_pdf_shard(
+    input_path: str | Path,
+    page_range: PageRange,
+    enable_ocr: bool = False,
+    enable_table_structure: bool = True
+) -> dict:
+    """
+    Convert one page range of a PDF with Docling.
+    
+    Runs in a worker process; the document is returned as a plain dict so it
+    can be sent back to the coordinating process.
+    
+    Args:
+        input_path: Path to input PDF file
+        page_range: Inclusive, 1-based (start, end) pages to convert
+        enable_ocr: Whether to enable OCR
+        enable_table_structure: Whether to run table structure recognition
+        
+    Returns:
+        The shard's DoclingDocument as a dict
+    """
+    with get_converter_pool().checkout(
+        enable_ocr=enable_ocr,
+        enable_table_structure=enable_table_structure
+    ) as converter:
+        result = converter.convert(str(input_path), page_range=page_range)
+    return result.document.export_to_dict()
+
+
+def _write_markdown(
+    result: ConversionResult,
+    input_path: Path,
+    output_path: Path,
+    phases: Optional[Phases]
+) -> Path:
+    """Fix the header hierarchy of a conversion, export it and save the Markdown."""
+    phases = {} if phases is None else phases
+    phases["pages"] = len(result.document.pages)
+    
+    # Apply hierarchical postprocessing (fixes header hierarchy)
+    start = time.perf_counter()
+    ResultPostprocessor(result, source=str(input_path)).process()
+    phases["postprocess"] = time.perf_counter() - start
+    
+    # Export to Markdown
+    start = time.perf_counter()
+    markdown_content = result.document.export_to_markdown()
+    phases["markdown_export"] = time.perf_counter() - start
+    
+    # Save to file
+    start = time.perf_counter()
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(markdown_content)
+    phases["write"] = time.perf_counter() - start
+    
+    return output_path
+
+
+def merge_pdf_shards(
+    input_path: str | Path,
+    shard_documents: List[dict],
+    output_path: str | Path,
+    phases: Optional[Phases] = None
+) -> Path:
+    """
+    Merge converted shards (in page order), fix headers and export Markdown.
+    
+    Header correction runs once on the merged document against the full PDF,
+    so heading levels stay consistent across shard boundaries.
+    
+    Args:
+        input_path: Path to the original PDF
+        shard_documents: Shard documents from convert_pdf_shard(), in page order
+        output_path: Path for output Markdown file
+        phases: Optional dict receiving postprocess, export and write timings
+        
+    Returns:
+        Path to the generated Markdown file
+    """
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    
+    merged = DoclingDocument.concatenate(
+        [DoclingDocument.model_validate(doc) for doc in shard_documents]
+    )
+    result = ConversionResult(
+        input=InputDocument(
+            path_or_stream=input_path,
+            format=InputFormat.PDF,
+            backend=PyPdfiumDocumentBackend
+        ),
+        status=ConversionStatus.SUCCESS,
+        document=merged
+    )
+    
+    return _write_markdown(result, input_path, output_path, phases)
+
+
+def plan_shards(input_path: str | Path, shard_pages: int) -> Optional[List[PageRange]]:
+    """
+    Decide whether a PDF should be sharded.
+    
+    Returns:
+        Page ranges to convert in parallel, or None to convert in one piece
+    """
+    if shard_pages <= 0:
+        return None
+    if not hasattr(DoclingDocument, "concatenate"):
+        logger.warning("docling-core lacks DoclingDocument.concatenate; sharding disabled")
+        return None
+    ranges = shard_page_ranges(count_pdf_pages(input_path), shard_pages)
+    return ranges if len(ranges) > 1 else None
+
+
 def convert_pdf_to_markdown(
     input_path: str | Path,
     output_path: str | Path,
-    enable_ocr: bool = False
+    enable_ocr: bool = False,
+    enable_table_structure: bool = True,
+    shard_pages: int = 0,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    phases: Optional[Phases] = None
 ) -> Path:
     """
     Convert PDF to Markdown with hierarchical structure correction.
     
     Process:
-    1. Convert PDF using Docling
+    1. Convert PDF using Docling (optionally as page shards in parallel)
     2. Apply hierarchical postprocessing to fix header hierarchy
     3. Export to Markdown format
     
@@ -55,6 +220,13 @@ def convert_pdf_to_markdown(
         input_path: Path to input PDF file
         output_path: Path for output Markdown file
         enable_ocr: Whether to enable OCR (slower but works with scanned PDFs)
+        enable_table_structure: Whether to run table structure recognition
+        shard_pages: Split PDFs longer than this many pages into shards converted
+            in parallel worker processes (0 disables sharding)
+        max_workers: Worker processes for shards when no executor is given
+        executor: Existing process pool to run shards on
+        phases: Optional dict receiving per-phase timings (docling, postprocess,
+            markdown_export, write) and the page count
         
     Returns:
         Path to the generated Markdown file
@@ -71,20 +243,31 @@ def convert_pdf_to_markdown(
     # Ensure output directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Create converter
-    converter = create_converter(enable_ocr=enable_ocr)
+    phases = {} if phases is None else phases
+    shards = plan_shards(input_path, shard_pages)
+    start = time.perf_counter()
+    if shards:
+        pool = executor or ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [
+                pool.submit(
+                    convert_pdf_shard, input_path, page_range, enable_ocr, enable_table_structure
+                )
+                for page_range in shards
+            ]
+            shard_documents = [future.result() for future in futures]
+        finally:
+            if executor is None:
+                pool.shutdown()
+        phases["docling"] = time.perf_counter() - start
+        return merge_pdf_shards(input_path, shard_documents, output_path, phases)
     
-    # Convert PDF
-    result = converter.convert(str(input_path))
+    # Borrow a warm converter from the pool and convert PDF
+    with get_converter_pool().checkout(
+        enable_ocr=enable_ocr,
+        enable_table_structure=enable_table_structure
+    ) as converter:
+        result = converter.convert(str(input_path))
+    phases["docling"] = time.perf_counter() - start
     
-    # Apply hierarchical postprocessing (fixes header hierarchy)
-    ResultPostprocessor(result, source=str(input_path)).process()
-    
-    # Export to Markdown
-    markdown_content = result.document.export_to_markdown()
-    
-    # Save to file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(markdown_content)
-    
-    return output_path
+    return _write_markdown(result, input_path, output_path, phases)
@@ -0,0 +1,160 @@
+"""
+Registry of document converters, loaded lazily on first use.
+
+Docling, Playwright and LibreOffice are heavy or optional, so converter
+modules are only imported when a conversion first needs them. Availability
+is checked without importing anything, which lets the API start (and serve
+chat) on nodes where some converters are not installed, and report which
+ones are usable from /health.
+"""
+import importlib
+import importlib.util
+import sys
+import threading
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class ConverterUnavailableError(RuntimeError):
+    """A converter's dependencies are not installed or configured."""
+
+
+@dataclass(frozen=True)
+class ConverterSpec:
+    """Where a converter lives and what it needs."""
+    module: str                     # Submodule of backend.converters
+    function: str                   # Conversion function in that module
+    requires: Tuple[str, ...] = ()  # Importable packages it depends on
+    check: Optional[str] = None     # Function in the module returning why it cannot run, or None
+
+
+CONVERTERS: Dict[str, ConverterSpec] = {
+    "docx_to_pdf": ConverterSpec("docx_to_pdf", "convert_docx_to_pdf", check="libreoffice_missing"),
+    "html_to_pdf": ConverterSpec("html_to_pdf", "convert_html_to_pdf", requires=("playwright",)),
+    "pdf_to_markdown": ConverterSpec(
+        "pdf_to_markdown",
+        "convert_pdf_to_markdown",
+        requires=("docling", "docling_core", "pypdfium2", "hierarchical"),
+    ),
+    "html_to_markdown": ConverterSpec("html_to_markdown", "convert_html_to_markdown"),
+    "docx_to_markdown": ConverterSpec("docx_to_markdown", "convert_docx_to_markdown"),
+    "markdown_to_chunks": ConverterSpec("markdown_to_chunks", "convert_markdown_to_chunks"),
+}
+
+# Long-lived resources stopped at shutdown, if their module was ever loaded
+_POOL_SHUTDOWN = (
+    ("browser_pool", "stop_browser_pool"),
+    ("docx_to_pdf", "stop_libreoffice_pool"),
+)
+
+_load_lock = threading.Lock()
+
+
+def _qualified(module: str) -> str:
+    return f"{__package__}.{module}"
+
+
+def _spec(name: str) -> ConverterSpec:
+    try:
+        return CONVERTERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown converter: {name}") from None
+
+
+def unavailable_reason(name: str) -> Optional[str]:
+    """
+    Why a converter cannot run here, without importing its dependencies.
+    
+    Args:
+        name: Converter name (key of CONVERTERS)
+    
+    Returns:
+        Human-readable reason, or None if the converter is available
+    """
+    spec = _spec(name)
+    for package in spec.requires:
+        if package not in sys.modules and importlib.util.find_spec(package) is None:
+            return f"{package} is not installed"
+    if spec.check:
+        # Checks live in lightweight converter modules (no heavy imports)
+        return getattr(importlib.import_module(_qualified(spec.module)), spec.check)()
+    return None
+
+
+def ensure_available(name: str):
+    """
+    Raises:
+        ConverterUnavailableError: If the converter cannot run here
+    """
+    reason = unavailable_reason(name)
+    if reason:
+        raise ConverterUnavailableError(f"{name} converter unavailable: {reason}")
+
+
+def load_converter(name: str) -> ModuleType:
+    """
+    Import a converter's module, checking its dependencies first.
+    
+    Raises:
+        ConverterUnavailableError: If the converter cannot run here
+    """
+    ensure_available(name)
+    qualified = _qualified(_spec(name).module)
+    module = sys.modules.get(qualified)
+    if module is None:
+        # Serialize first imports: concurrent imports of Docling/Torch can deadlock
+        with _load_lock:
+            module = importlib.import_module(qualified)
+    return module
+
+
+def get_converter(name: str) -> Callable[..., Any]:
+    """
+    The conversion function of a converter, importing it on first use.
+    
+    Raises:
+        ConverterUnavailableError: If the converter cannot run here
+    """
+    return getattr(load_converter(name), _spec(name).function)
+
+
+def is_loaded(name: str) -> bool:
+    return _qualified(_spec(name).module) in sys.modules
+
+
+def converter_status() -> Dict[str, Dict[str, Any]]:
+    """Availability and load state of every converter, e.g. for /health."""
+    status = {}
+    for name in CONVERTERS:
+        reason = unavailable_reason(name)
+        status[name] = {"available": reason is None, "loaded": is_loaded(name), "reason": reason}
+    return status
+
+
+def preload_converters(names) -> Dict[str, Optional[str]]:
+    """
+    Import converters ahead of their first use, skipping unavailable ones.
+    
+    Args:
+        names: Converter names
+    
+    Returns:
+        Dict of name → None if loaded, or the reason it was skipped
+    """
+    results = {}
+    for name in names:
+        try:
+            load_converter(name)
+            results[name] = None
+        except ConverterUnavailableError as e:
+            results[name] = str(e)
+    return results
+
+
+def stop_converter_pools():
+    """Stop the browser and LibreOffice pools, without importing them if never used."""
+    for module, function in _POOL_SHUTDOWN:
+        loaded = sys.modules.get(_qualified(module))
+        if loaded is not None:
+            getattr(loaded, function)()
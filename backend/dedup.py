@@ -0,0 +1,577 @@
+"""
+Corpus-wide near-duplicate chunk detection with MinHash and LSH.
+
+Each chunk's text is reduced to a MinHash signature over word shingles, whose
+agreement estimates the Jaccard similarity of two chunks. Signatures of
+canonical chunks are split into bands and stored in SQLite by band hash, so
+finding the candidates for a new chunk is one bucket lookup per band however
+large the corpus is; only candidates are compared signature to signature.
+
+Duplicates always point at a canonical chunk (the first indexed of its kind),
+never at another duplicate. With DEDUP_REPLACE_TEXT, a duplicate's text is
+replaced in its chunks file by a duplicate_of reference and kept only in the
+index database. When a re-indexed or removed document takes canonical chunks
+with it, the documents that referenced them get their text back and are
+re-indexed, so their chunks are promoted to canonical or matched again.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.config import (
+    CHUNKS_DIR,
+    CHUNK_STORE_ENABLED,
+    DEDUP_DB_PATH,
+    DEDUP_THRESHOLD,
+    DEDUP_REPLACE_TEXT,
+)
+from backend.converters import ChunkStoreWriter, iter_chunk_file
+from backend.converters.markdown_to_chunks import ChunkFileWriter
+
+# Signature size and shingle length in words
+NUM_PERM = 128
+SHINGLE_SIZE = 5
+# Shorter chunks (headings, captions) are too small to call duplicates
+MIN_TOKENS = 2 * SHINGLE_SIZE
+
+# Fixed seed: stored signatures must be comparable across processes and restarts
+_SEED = 1
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.default_rng(_SEED)
+_PERM_A = _rng.integers(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """
+    Compute the MinHash signature of a text's word shingles.
+    
+    Args:
+        text: Chunk text
+    
+    Returns:
+        uint32 array of NUM_PERM values, or None if the text has fewer than MIN_TOKENS words
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < MIN_TOKENS:
+        return None
+    token_hashes = np.fromiter(
+        (zlib.crc32(token.encode("utf-8")) for token in tokens), dtype=np.uint64, count=len(tokens)
+    )
+    # Rolling hash of every SHINGLE_SIZE consecutive tokens
+    count = len(tokens) - SHINGLE_SIZE + 1
+    shingles = np.zeros(count, dtype=np.uint64)
+    for offset in range(SHINGLE_SIZE):
+        shingles = (shingles * np.uint64(1000003) + token_hashes[offset:offset + count]) & _MAX_HASH
+    shingles = np.unique(shingles)
+    
+    # Universal hashing (a*x + b mod p) as NUM_PERM random permutations
+    permuted = (np.outer(_PERM_A, shingles) + _PERM_B[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def lsh_parameters(threshold: float, num_perm: int = NUM_PERM) -> Tuple[int, int]:
+    """
+    Choose the number of bands and rows per band for a similarity threshold.
+    
+    Two chunks with Jaccard similarity s share at least one band with
+    probability 1 - (1 - s^rows)^bands; the pair minimizing the probability
+    of false positives below the threshold plus false negatives above it wins.
+    
+    Args:
+        threshold: Jaccard similarity at which chunks count as duplicates
+        num_perm: Signature size
+    
+    Returns:
+        Tuple of (bands, rows)
+    """
+    below = np.linspace(0.0, threshold, 200)
+    above = np.linspace(threshold, 1.0, 200)
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        false_positive = np.mean(1 - (1 - below ** rows) ** bands) * threshold
+        false_negative = np.mean((1 - above ** rows) ** bands) * (1 - threshold)
+        if false_positive + false_negative < best_error:
+            best, best_error = (bands, rows), false_positive + false_negative
+    return best
+
+
+def rewrite_chunk_file(chunks_path: Path, update: Callable[[Dict[str, Any]], bool]) -> int:
+    """
+    Rewrite a chunks file in place, and its chunk store if CHUNK_STORE_ENABLED.
+    
+    Args:
+        chunks_path: Chunks JSON file
+        update: Called with each chunk; modifies it and returns True if it changed
+    
+    Returns:
+        Number of chunks changed
+    """
+    tmp_path = chunks_path.with_name(chunks_path.name + ".tmp")
+    store = ChunkStoreWriter(chunks_path) if CHUNK_STORE_ENABLED else None
+    changed = 0
+    try:
+        with ChunkFileWriter(tmp_path) as writer:
+            for chunk in iter_chunk_file(chunks_path):
+                if update(chunk):
+                    changed += 1
+                writer.write(chunk)
+                if store is not None:
+                    store.write(chunk)
+    except BaseException:
+        if store is not None:
+            store.discard()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, chunks_path)
+    if store is not None:
+        store.close()
+    return changed
+
+
+def _band_key(values: np.ndarray) -> int:
+    return int.from_bytes(hashlib.blake2b(values.tobytes(), digest_size=8).digest(), "big", signed=True)
+
+
+class DedupIndex:
+    """
+    SQLite-backed LSH index of canonical chunk signatures.
+    
+    Documents are named by their chunks file stem (data/chunks/<doc>.json).
+    """
+    
+    def __init__(
+        self,
+        db_path: Path = DEDUP_DB_PATH,
+        threshold: float = DEDUP_THRESHOLD,
+        chunks_dir: Path = CHUNKS_DIR,
+        replace_text: bool = DEDUP_REPLACE_TEXT
+    ):
+        """
+        Args:
+            db_path: SQLite file holding the index
+            threshold: Estimated Jaccard similarity at which chunks count as duplicates
+            chunks_dir: Directory of the chunks files
+            replace_text: Replace duplicate text in chunks files by a duplicate_of reference
+        """
+        self.threshold = threshold
+        self.chunks_dir = chunks_dir
+        self.replace_text = replace_text
+        self.bands, self.rows = lsh_parameters(threshold)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS signatures (
+                    id INTEGER PRIMARY KEY,
+                    chunk_id TEXT NOT NULL,
+                    doc TEXT NOT NULL,
+                    signature BLOB NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS signatures_doc ON signatures (doc)")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS buckets (
+                    band INTEGER NOT NULL,
+                    key INTEGER NOT NULL,
+                    id INTEGER NOT NULL,
+                    PRIMARY KEY (band, key, id)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS buckets_id ON buckets (id)")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS duplicates (
+                    chunk_id TEXT NOT NULL,
+                    doc TEXT NOT NULL,
+                    duplicate_of TEXT NOT NULL,
+                    canonical_doc TEXT NOT NULL,
+                    similarity REAL NOT NULL,
+                    PRIMARY KEY (doc, chunk_id)
+                )
+                """
+            )
+            # Original text of duplicates replaced by a reference in their chunks file
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS replaced (
+                    doc TEXT NOT NULL,
+                    chunk_id TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    PRIMARY KEY (doc, chunk_id)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS documents (
+                    doc TEXT PRIMARY KEY,
+                    chunk_count INTEGER NOT NULL,
+                    duplicate_count INTEGER NOT NULL,
+                    indexed_at REAL NOT NULL
+                )
+                """
+            )
+    
+    def _delete(self, doc: str):
+        """Remove a document's rows (caller holds the lock and a transaction)."""
+        self._conn.execute(
+            "DELETE FROM buckets WHERE id IN (SELECT id FROM signatures WHERE doc = ?)", (doc,)
+        )
+        self._conn.execute("DELETE FROM signatures WHERE doc = ?", (doc,))
+        self._conn.execute("DELETE FROM duplicates WHERE doc = ?", (doc,))
+        self._conn.execute("DELETE FROM replaced WHERE doc = ?", (doc,))
+        self._conn.execute("DELETE FROM documents WHERE doc = ?", (doc,))
+    
+    def _restore_text(self, doc: str, chunks_path: Path) -> bool:
+        """
+        Put the replaced text of a document's duplicates back into its chunks
+        file (caller holds the lock and a transaction).
+        
+        Returns:
+            True if the file was rewritten
+        """
+        texts = dict(self._conn.execute(
+            "SELECT chunk_id, text FROM replaced WHERE doc = ?", (doc,)
+        ).fetchall())
+        if not texts or not chunks_path.exists():
+            return False
+        
+        def restore(chunk: Dict[str, Any]) -> bool:
+            if chunk["chunk_id"] not in texts or "duplicate_of" not in chunk:
+                return False
+            chunk["text"] = texts[chunk["chunk_id"]]
+            del chunk["duplicate_of"]
+            return True
+        
+        rewrite_chunk_file(chunks_path, restore)
+        self._conn.execute("DELETE FROM replaced WHERE doc = ?", (doc,))
+        return True
+    
+    def _replace_text(self, doc: str, chunks_path: Path, duplicates: List[Dict[str, Any]]) -> bool:
+        """
+        Replace the text of a document's duplicates by a duplicate_of reference,
+        keeping the text in the index (caller holds the lock and a transaction).
+        
+        Returns:
+            True if the file was rewritten
+        """
+        references = {
+            d["chunk_id"]: {key: d[key] for key in ("duplicate_of", "document", "similarity")}
+            for d in duplicates
+        }
+        if not references:
+            return False
+        texts = []
+        
+        def replace(chunk: Dict[str, Any]) -> bool:
+            reference = references.get(chunk["chunk_id"])
+            if reference is None or "duplicate_of" in chunk:
+                return False
+            texts.append((doc, chunk["chunk_id"], chunk["text"]))
+            chunk["text"] = ""
+            chunk["duplicate_of"] = reference
+            return True
+        
+        if not rewrite_chunk_file(chunks_path, replace):
+            return False
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO replaced (doc, chunk_id, text) VALUES (?, ?, ?)", texts
+        )
+        return True
+    
+    def _band_keys(self, signature: np.ndarray) -> List[int]:
+        return [
+            _band_key(signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+    
+    def _best_match(self, signature: np.ndarray, keys: List[int]) -> Optional[Tuple[str, str, float]]:
+        """Most similar canonical chunk above the threshold (caller holds the lock)."""
+        candidates = set()
+        for band, key in enumerate(keys):
+            candidates.update(
+                row[0] for row in self._conn.execute(
+                    "SELECT id FROM buckets WHERE band = ? AND key = ?", (band, key)
+                )
+            )
+        best = None
+        for candidate in sorted(candidates):
+            chunk_id, doc, blob = self._conn.execute(
+                "SELECT chunk_id, doc, signature FROM signatures WHERE id = ?", (candidate,)
+            ).fetchone()
+            similarity = float(np.mean(np.frombuffer(blob, dtype=np.uint32) == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[2]):
+                best = (chunk_id, doc, similarity)
+        return best
+    
+    def _resolves(self, duplicate_of: str, canonical_doc: str) -> bool:
+        """Whether a canonical chunk is still indexed (caller holds the lock)."""
+        return self._conn.execute(
+            "SELECT 1 FROM signatures WHERE chunk_id = ? AND doc = ?", (duplicate_of, canonical_doc)
+        ).fetchone() is not None
+    
+    def _dependents(self, doc: str, broken_only: bool) -> List[str]:
+        """
+        Other documents with duplicates of doc's chunks (caller holds the lock).
+        
+        With broken_only, just those referencing chunks no longer canonical in doc.
+        """
+        query = "SELECT DISTINCT doc FROM duplicates WHERE canonical_doc = ? AND doc != ?"
+        if broken_only:
+            query += (
+                " AND NOT EXISTS (SELECT 1 FROM signatures WHERE signatures.chunk_id ="
+                " duplicates.duplicate_of AND signatures.doc = duplicates.canonical_doc)"
+            )
+        return [row[0] for row in self._conn.execute(query + " ORDER BY doc", (doc, doc))]
+    
+    def _reindex(self, doc: str, chunks_path: Path) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Index a document from scratch with its full text, then replace the text
+        of its duplicates if replace_text (caller holds the lock and a transaction).
+        
+        Returns:
+            Tuple of (duplicates, whether the chunks file was rewritten)
+        """
+        restored = self._restore_text(doc, chunks_path)
+        self._delete(doc)
+        duplicates = self._index(doc, chunks_path)
+        replaced = self.replace_text and self._replace_text(doc, chunks_path, duplicates)
+        return duplicates, restored or replaced
+    
+    def _repair_dependents(self, doc: str) -> List[str]:
+        """
+        Re-index the documents that referenced a changed or removed document
+        (caller holds the lock and a transaction). Chunk IDs follow header
+        paths, so a reference can survive while the canonical text changed:
+        every direct dependent is checked again. Further down, only documents
+        whose references into a re-indexed dependent broke are. Replaced text
+        is put back first, so formerly duplicate chunks become canonical or
+        duplicates of another chunk.
+        
+        Returns:
+            Documents whose chunks file was rewritten
+        """
+        pending, repaired, rewritten = [(doc, False)], {doc}, []
+        while pending:
+            changed, broken_only = pending.pop()
+            for dependent in self._dependents(changed, broken_only):
+                if dependent in repaired:
+                    continue
+                repaired.add(dependent)
+                pending.append((dependent, True))
+                chunks_path = self.chunks_dir / f"{dependent}.json"
+                if not chunks_path.exists():
+                    self._delete(dependent)
+                    continue
+                try:
+                    if self._reindex(dependent, chunks_path)[1]:
+                        rewritten.append(dependent)
+                except (ValueError, KeyError):
+                    self._delete(dependent)  # No longer a chunks file
+        return rewritten
+    
+    def index_document(
+        self,
+        doc: str,
+        chunks_path: Path,
+        rewritten: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        (Re-)index a document's chunks, flagging near-duplicates of the corpus.
+        
+        Chunks are checked against every canonical chunk indexed before them,
+        including earlier chunks of the same document; those with no match
+        become canonical themselves. With replace_text, the text of the
+        duplicates is replaced by a reference in the chunks file. Documents
+        that referenced canonical chunks this document no longer has are
+        re-indexed.
+        
+        Args:
+            doc: Document name (chunks file stem)
+            chunks_path: Chunks JSON file
+            rewritten: Extended with the documents (this one included) whose
+                chunks file was rewritten, so callers can refresh other indexes
+        
+        Returns:
+            List of {"chunk_id", "duplicate_of", "document", "similarity"} in
+            file order, where document is the canonical chunk's document
+        """
+        with self._lock, self._conn:
+            duplicates, changed = self._reindex(doc, chunks_path)
+            repaired = self._repair_dependents(doc)
+        if rewritten is not None:
+            rewritten.extend(([doc] if changed else []) + repaired)
+        return duplicates
+    
+    def _index(self, doc: str, chunks_path: Path) -> List[Dict[str, Any]]:
+        """Index a document with no rows (caller holds the lock and a transaction)."""
+        duplicates = []
+        count = 0
+        for chunk in iter_chunk_file(chunks_path):
+            count += 1
+            reference = chunk.get("duplicate_of")
+            if reference and not chunk["text"]:
+                # Text replaced before the index kept it, so it cannot be put
+                # back: keep the reference only while its canonical chunk is indexed
+                if self._resolves(reference["duplicate_of"], reference["document"]):
+                    duplicates.append({"chunk_id": chunk["chunk_id"], **reference})
+                continue
+            signature = minhash_signature(chunk["text"])
+            if signature is None:
+                continue
+            keys = self._band_keys(signature)
+            match = self._best_match(signature, keys)
+            if match is not None:
+                duplicate_of, canonical_doc, similarity = match
+                duplicates.append({
+                    "chunk_id": chunk["chunk_id"],
+                    "duplicate_of": duplicate_of,
+                    "document": canonical_doc,
+                    "similarity": round(similarity, 4),
+                })
+                continue
+            cursor = self._conn.execute(
+                "INSERT INTO signatures (chunk_id, doc, signature) VALUES (?, ?, ?)",
+                (chunk["chunk_id"], doc, signature.tobytes()),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO buckets (band, key, id) VALUES (?, ?, ?)",
+                [(band, key, cursor.lastrowid) for band, key in enumerate(keys)],
+            )
+        self._conn.executemany(
+            "INSERT INTO duplicates (chunk_id, doc, duplicate_of, canonical_doc, similarity)"
+            " VALUES (?, ?, ?, ?, ?)",
+            [
+                (d["chunk_id"], doc, d["duplicate_of"], d["document"], d["similarity"])
+                for d in duplicates
+            ],
+        )
+        self._conn.execute(
+            "INSERT INTO documents (doc, chunk_count, duplicate_count, indexed_at) VALUES (?, ?, ?, ?)",
+            (doc, count, len(duplicates), time.time()),
+        )
+        return duplicates
+    
+    def remove_document(self, doc: str, rewritten: Optional[List[str]] = None):
+        """
+        Drop a document from the index, re-indexing the documents that referenced it.
+        
+        Args:
+            doc: Document name (chunks file stem)
+            rewritten: Extended with the documents whose chunks file was rewritten
+        """
+        with self._lock, self._conn:
+            self._delete(doc)
+            repaired = self._repair_dependents(doc)
+        if rewritten is not None:
+            rewritten.extend(repaired)
+    
+    def sync(self, chunks_dir: Optional[Path] = None, rewritten: Optional[List[str]] = None) -> int:
+        """
+        Index chunk files the index has never seen, oldest first, and drop
+        documents whose file is gone.
+        
+        Args:
+            chunks_dir: Directory of the chunks files (default: the index's)
+            rewritten: Extended with the documents whose chunks file was rewritten
+        
+        Returns:
+            Number of documents added
+        """
+        chunks_dir = chunks_dir or self.chunks_dir
+        with self._lock:
+            indexed = {row[0] for row in self._conn.execute("SELECT doc FROM documents")}
+        present = {}
+        for chunks_path in chunks_dir.glob("*.json"):
+            stem = chunks_path.stem
+            # Skip chunk store indexes and compare-mode candidate outputs
+            if stem.endswith(".idx") or stem.endswith(".fast"):
+                continue
+            present[stem] = chunks_path
+        
+        for doc in indexed - present.keys():
+            self.remove_document(doc, rewritten)
+        added = 0
+        # Earlier documents become the canonical copies
+        for doc in sorted(present.keys() - indexed, key=lambda doc: present[doc].stat().st_mtime_ns):
+            try:
+                self.index_document(doc, present[doc], rewritten)
+                added += 1
+            except (ValueError, KeyError):
+                continue  # Not a chunks file
+        return added
+    
+    def get_duplicates(self, doc: str) -> List[Dict[str, Any]]:
+        """
+        Near-duplicate chunks flagged in a document.
+        
+        Args:
+            doc: Document name (chunks file stem)
+        
+        Returns:
+            List of {"chunk_id", "duplicate_of", "document", "similarity"}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chunk_id, duplicate_of, canonical_doc, similarity FROM duplicates"
+                " WHERE doc = ? ORDER BY rowid",
+                (doc,),
+            ).fetchall()
+        return [
+            {"chunk_id": chunk_id, "duplicate_of": duplicate_of, "document": document, "similarity": similarity}
+            for chunk_id, duplicate_of, document, similarity in rows
+        ]
+    
+    def stats(self) -> dict:
+        """Indexed document, chunk, canonical and duplicate counts."""
+        with self._lock:
+            documents, chunks, duplicates = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(chunk_count), 0), COALESCE(SUM(duplicate_count), 0)"
+                " FROM documents"
+            ).fetchone()
+            canonical = self._conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+            replaced = self._conn.execute("SELECT COUNT(*) FROM replaced").fetchone()[0]
+        return {
+            "documents": documents,
+            "chunks": chunks,
+            "canonical_chunks": canonical,
+            "duplicates": duplicates,
+            "replaced": replaced,
+            "replace_text": self.replace_text,
+            "threshold": self.threshold,
+            "bands": self.bands,
+            "rows": self.rows,
+        }
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_index: DedupIndex | None = None
+
+
+def get_dedup_index() -> DedupIndex:
+    """Return the process-wide near-duplicate index."""
+    global _index
+    if _index is None:
+        _index = DedupIndex()
+    return _index
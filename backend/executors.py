@@ -0,0 +1,221 @@
+"""
+Executor layer that keeps blocking conversion work off the event loop.
+
+Docling and chunking are CPU-bound and run in a process pool so several
+documents convert in parallel across cores. Subprocess and file work
+(LibreOffice, copies) runs in a bounded thread pool.
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from backend.config import DOCLING_WORKERS, SUBPROCESS_WORKERS, DOCLING_WARMUP, DOCLING_SHARD_PAGES
+
+_process_pool: ProcessPoolExecutor | None = None
+_thread_pool: ThreadPoolExecutor | None = None
+
+# Latest converter-pool snapshot reported by each Docling worker process
+_worker_pool_stats: Dict[int, dict] = {}
+
+
+# ============================================================================
+# Worker-side functions (must be importable by spawned processes)
+# ============================================================================
+
+def _init_docling_worker():
+    """Process pool initializer: load Docling models once per worker."""
+    from backend.converters import unavailable_reason
+    if DOCLING_WARMUP and unavailable_reason("pdf_to_markdown") is None:
+        from backend.converters import warmup_converter_pool
+        warmup_converter_pool()
+
+
+def _ping() -> int:
+    """No-op task used to force worker processes to start."""
+    return os.getpid()
+
+
+def _pdf_to_markdown_job(
+    input_path: Path,
+    output_path: Path,
+    enable_ocr: bool,
+    enable_table_structure: bool
+) -> tuple[Path, int, dict, dict]:
+    """Run Docling conversion and report this worker's pool counters and phase timings."""
+    from backend.converters import convert_pdf_to_markdown, get_converter_pool
+
+    phases: Dict[str, float] = {}
+    path = convert_pdf_to_markdown(
+        input_path,
+        output_path,
+        enable_ocr=enable_ocr,
+        enable_table_structure=enable_table_structure,
+        phases=phases
+    )
+    return path, os.getpid(), get_converter_pool().stats(), phases
+
+
+def _merge_pdf_shards_job(input_path: Path, shard_documents: list, output_path: Path) -> tuple[Path, dict]:
+    """Merge converted shards into Markdown and report the phase timings."""
+    from backend.converters.pdf_to_markdown import merge_pdf_shards
+    
+    phases: Dict[str, float] = {}
+    path = merge_pdf_shards(input_path, shard_documents, output_path, phases)
+    return path, phases
+
+
+def _markdown_to_chunks_job(input_path: Path, output_path: Path, doc_id: str | None) -> Path:
+    """Run Markdown chunking in a worker process."""
+    from backend.converters import convert_markdown_to_chunks
+
+    return convert_markdown_to_chunks(input_path, output_path, doc_id=doc_id)
+
+
+# ============================================================================
+# Lifecycle
+# ============================================================================
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(
+            max_workers=max(1, SUBPROCESS_WORKERS),
+            thread_name_prefix="convert"
+        )
+    return _thread_pool
+
+
+def _get_cpu_pool() -> Executor:
+    """Process pool for CPU-heavy work, or the thread pool if disabled."""
+    global _process_pool
+    if DOCLING_WORKERS <= 0:
+        return _get_thread_pool()
+    if _process_pool is None:
+        # Spawn rather than fork: the API process may hold threads and ML runtimes
+        _process_pool = ProcessPoolExecutor(
+            max_workers=DOCLING_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_docling_worker
+        )
+    return _process_pool
+
+
+async def start_executors():
+    """Create executors and start (and warm) every Docling worker."""
+    loop = asyncio.get_running_loop()
+    _get_thread_pool()
+    pool = _get_cpu_pool()
+    if isinstance(pool, ProcessPoolExecutor):
+        await asyncio.gather(*(
+            loop.run_in_executor(pool, _ping) for _ in range(DOCLING_WORKERS)
+        ))
+    elif DOCLING_WARMUP:
+        from backend.converters import unavailable_reason, warmup_converter_pool
+        if unavailable_reason("pdf_to_markdown") is None:
+            await loop.run_in_executor(pool, warmup_converter_pool)
+
+
+def shutdown_executors():
+    """Shut down executors, cancelling queued work."""
+    global _process_pool, _thread_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+    if _thread_pool is not None:
+        _thread_pool.shutdown(wait=False, cancel_futures=True)
+        _thread_pool = None
+
+
+# ============================================================================
+# Public API
+# ============================================================================
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run blocking I/O or subprocess work in the bounded thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_thread_pool(), partial(func, *args, **kwargs))
+
+
+async def run_cpu(func: Callable[..., Any], *args) -> Any:
+    """Run a CPU-bound, module-level (picklable) function in a worker process."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_cpu_pool(), func, *args)
+
+
+async def pdf_to_markdown(
+    input_path: Path,
+    output_path: Path,
+    enable_ocr: bool = False,
+    enable_table_structure: bool = True,
+    phases: Optional[Dict[str, float]] = None
+) -> Path:
+    """
+    Convert a PDF to Markdown in a Docling worker.
+    
+    PDFs longer than DOCLING_SHARD_PAGES are split into page ranges converted
+    concurrently across the worker processes, then merged in one worker.
+    
+    If given, phases receives the time spent in each conversion phase
+    (docling, postprocess, markdown_export, write) and the page count.
+    
+    Raises:
+        FileNotFoundError: If the input file does not exist
+    """
+    loop = asyncio.get_running_loop()
+    phases = {} if phases is None else phases
+    if DOCLING_SHARD_PAGES > 0:
+        if not input_path.exists():
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+        from backend.converters.pdf_to_markdown import plan_shards, convert_pdf_shard
+        shards = await run_blocking(plan_shards, input_path, DOCLING_SHARD_PAGES)
+        if shards:
+            pool = _get_cpu_pool()
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            start = time.perf_counter()
+            shard_documents = await asyncio.gather(*(
+                loop.run_in_executor(
+                    pool, convert_pdf_shard, input_path, page_range,
+                    enable_ocr, enable_table_structure
+                )
+                for page_range in shards
+            ))
+            phases["docling"] = time.perf_counter() - start
+            path, merge_phases = await loop.run_in_executor(
+                pool, _merge_pdf_shards_job, input_path, list(shard_documents), output_path
+            )
+            phases.update(merge_phases)
+            return path
+    
+    path, pid, stats, worker_phases = await loop.run_in_executor(
+        _get_cpu_pool(),
+        _pdf_to_markdown_job,
+        input_path,
+        output_path,
+        enable_ocr,
+        enable_table_structure
+    )
+    _worker_pool_stats[pid] = stats
+    phases.update(worker_phases)
+    return path
+
+
+async def markdown_to_chunks(input_path: Path, output_path: Path, doc_id: str | None = None) -> Path:
+    """Chunk a Markdown file in a worker."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_cpu_pool(), _markdown_to_chunks_job, input_path, output_path, doc_id
+    )
+
+
+def executor_stats() -> dict:
+    """Worker counts and the last converter-pool snapshot from each worker."""
+    return {
+        "docling_workers": DOCLING_WORKERS,
+        "subprocess_workers": SUBPROCESS_WORKERS,
+        "worker_converter_pools": {str(pid): s for pid, s in _worker_pool_stats.items()},
+    }
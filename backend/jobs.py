@@ -0,0 +1,324 @@
+"""
+Persistent job queue for asynchronous document processing.
+
+Jobs are stored in SQLite so queued work survives restarts; a configurable
+number of asyncio workers drain the queue and run the same pipeline as
+/process, recording per-stage progress as they go. Several API processes
+can share one queue: a job is claimed with a single conditional UPDATE and
+held under a lease its worker renews, so only jobs whose owner stopped
+renewing (crashed or shut down) are requeued.
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional
+
+from backend.config import JOBS_DB_PATH, JOB_WORKERS, JOB_LEASE_SECONDS
+from backend.executors import run_blocking
+from backend.models import ProcessRequest
+from backend.pipeline import STAGES, process_file
+
+logger = logging.getLogger(__name__)
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobStore:
+    """SQLite-backed job table used as a local work queue."""
+
+    def __init__(self, db_path: Path = JOBS_DB_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    input_path TEXT NOT NULL,
+                    file_type TEXT NOT NULL,
+                    stages TEXT NOT NULL,
+                    chunks_path TEXT,
+                    cache_hits TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner TEXT,
+                    lease_until REAL
+                )
+                """
+            )
+            # Queues created before leases existed
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column, kind in (("owner", "TEXT"), ("lease_until", "REAL")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_state_created ON jobs (state, created_at)"
+            )
+
+    def enqueue(self, request: ProcessRequest, input_path: Path, file_type: str) -> str:
+        """
+        Add a job to the queue.
+        
+        Returns:
+            New job ID
+        """
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        stages = {stage: "pending" for stage in STAGES}
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, state, request, input_path, file_type, stages,"
+                " created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, request.model_dump_json(), str(input_path), file_type,
+                 json.dumps(stages), now, now),
+            )
+        return job_id
+
+    def claim(self, owner: str, lease: float = JOB_LEASE_SECONDS) -> Optional[sqlite3.Row]:
+        """
+        Move the oldest queued job to running and return it.
+        
+        A single UPDATE that only matches a still-queued row, so two
+        processes can never claim the same job.
+        
+        Args:
+            owner: ID of the claiming runner
+            lease: Seconds the claim holds without renew()
+        
+        Raises:
+            sqlite3.OperationalError: If the database stays locked by another process
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET state = ?, owner = ?, lease_until = ?, updated_at = ?"
+                " WHERE id = (SELECT id FROM jobs WHERE state = ? ORDER BY created_at LIMIT 1)"
+                " AND state = ? RETURNING *",
+                (RUNNING, owner, now + lease, now, QUEUED, QUEUED),
+            ).fetchone()
+    
+    def renew(self, job_id: str, owner: str, lease: float = JOB_LEASE_SECONDS) -> bool:
+        """
+        Extend the lease on a running job.
+        
+        Returns:
+            False if the job is no longer held by owner
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ? AND state = ?",
+                (time.time() + lease, job_id, owner, RUNNING),
+            )
+        return cursor.rowcount > 0
+
+    def set_stage(self, job_id: str, owner: str, stage: str, status: str) -> bool:
+        """
+        Record progress for one pipeline stage.
+        
+        Returns:
+            False if the job is no longer held by owner (nothing is written)
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT stages FROM jobs WHERE id = ? AND owner = ? AND state = ?",
+                (job_id, owner, RUNNING),
+            ).fetchone()
+            if row is None:
+                return False
+            stages = json.loads(row["stages"])
+            stages[stage] = status
+            self._conn.execute(
+                "UPDATE jobs SET stages = ?, updated_at = ? WHERE id = ? AND owner = ?",
+                (json.dumps(stages), time.time(), job_id, owner),
+            )
+        return True
+
+    def finish(
+        self,
+        job_id: str,
+        owner: str,
+        chunks_path: Path | None = None,
+        cache_hits: List[str] | None = None,
+        error: str | None = None
+    ) -> bool:
+        """
+        Mark a job as succeeded (with its output) or failed (with an error).
+        
+        Returns:
+            False if the job is no longer held by owner (nothing is written)
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = ?, chunks_path = ?, cache_hits = ?, error = ?,"
+                " lease_until = NULL, updated_at = ? WHERE id = ? AND owner = ? AND state = ?",
+                (
+                    FAILED if error else SUCCEEDED,
+                    str(chunks_path) if chunks_path else None,
+                    json.dumps(cache_hits or []),
+                    error,
+                    time.time(),
+                    job_id,
+                    owner,
+                    RUNNING,
+                ),
+            )
+        return cursor.rowcount > 0
+
+    def requeue_expired(self) -> int:
+        """
+        Return running jobs whose lease ran out (their process crashed or was
+        shut down) to the queue. Jobs another process is still renewing stay.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = ?, owner = NULL, lease_until = NULL, updated_at = ?"
+                " WHERE state = ? AND (lease_until IS NULL OR lease_until < ?)",
+                (QUEUED, now, RUNNING, now),
+            )
+        return cursor.rowcount
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return a job as a dict, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row["id"],
+            "state": row["state"],
+            "file_type": row["file_type"],
+            "stages": json.loads(row["stages"]),
+            "chunks_path": row["chunks_path"],
+            "cache_hits": json.loads(row["cache_hits"]) if row["cache_hits"] else [],
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobRunner:
+    """Pool of asyncio workers draining a JobStore."""
+
+    def __init__(self, store: JobStore, concurrency: int = JOB_WORKERS):
+        self.store = store
+        self.concurrency = max(1, concurrency)
+        self.owner = uuid.uuid4().hex  # Identifies this process's claims
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """Start the workers (interrupted jobs are requeued once their lease expires)."""
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        self._wakeup.set()
+
+    async def stop(self):
+        """Cancel the workers; their running jobs are requeued when the lease expires."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wake idle workers after a job is enqueued."""
+        self._wakeup.set()
+
+    async def _requeue_expired(self):
+        requeued = await run_blocking(self.store.requeue_expired)
+        if requeued:
+            logger.info("Requeued %d interrupted job(s)", requeued)
+    
+    async def _worker(self):
+        while True:
+            try:
+                await self._requeue_expired()
+                row = await run_blocking(self.store.claim, self.owner)
+            except sqlite3.OperationalError as e:
+                # Database locked by another process for longer than the busy timeout
+                logger.warning("Job queue unavailable, retrying: %s", e)
+                await asyncio.sleep(1)
+                continue
+            if row is None:
+                self._wakeup.clear()
+                try:
+                    # Poll occasionally in case another process enqueued work
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=5)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(row)
+
+    async def _run(self, row: sqlite3.Row):
+        job_id = row["id"]
+        request = ProcessRequest.model_validate_json(row["request"])
+        # Stage updates are written off the event loop, one after another
+        last_update: Optional[asyncio.Task] = None
+        
+        async def write_stage(previous: Optional[asyncio.Task], stage: str, status: str):
+            if previous is not None:
+                await asyncio.gather(previous, return_exceptions=True)
+            await run_blocking(self.store.set_stage, job_id, self.owner, stage, status)
+
+        def on_stage(stage: str, status: str):
+            nonlocal last_update
+            last_update = asyncio.create_task(write_stage(last_update, stage, status))
+
+        work = asyncio.create_task(
+            process_file(Path(row["input_path"]), row["file_type"], request, on_stage=on_stage)
+        )
+        heartbeat = asyncio.create_task(self._renew_lease(job_id, work))
+        try:
+            result = await work
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise  # Runner stopping
+            # The heartbeat lost the lease: the job belongs to another worker now
+            logger.warning("Abandoned job %s after losing its lease", job_id)
+        except Exception as e:
+            logger.exception("Job %s failed", job_id)
+            await self._finish(last_update, job_id, error=str(e))
+        else:
+            await self._finish(
+                last_update, job_id, chunks_path=result.chunks_path, cache_hits=result.cache_hits
+            )
+        finally:
+            heartbeat.cancel()
+    
+    async def _finish(self, last_update: Optional[asyncio.Task], job_id: str, **outcome):
+        if last_update is not None:
+            await asyncio.gather(last_update, return_exceptions=True)
+        if not await run_blocking(self.store.finish, job_id, self.owner, **outcome):
+            logger.warning("Job %s finished after losing its lease; result discarded", job_id)
+    
+    async def _renew_lease(self, job_id: str, work: asyncio.Task):
+        """Keep the claim on a running job alive, cancelling the work if it is lost."""
+        while True:
+            await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+            try:
+                if not await run_blocking(self.store.renew, job_id, self.owner):
+                    logger.warning("Lost the lease on job %s", job_id)
+                    work.cancel()
+                    return
+            except sqlite3.OperationalError as e:
+                logger.warning("Could not renew the lease on job %s: %s", job_id, e)
@@ -1,72 +1,404 @@
 """
 FastAPI application for document processing and chat.
 """
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTasks
+import asyncio
+import json
+import logging
 import time
 from pathlib import Path
+from typing import Optional
 
-from backend.models import ProcessRequest, ProcessResponse, Item, Model
-from backend.utils import detect_file_type, ensure_path_exists, generate_output_path
-from backend.config import INPUT_DIR, PDF_DIR, CHUNKS_DIR , MARKDOWN_DIR
-from backend.converters import (
-    convert_docx_to_pdf,
-    convert_html_to_pdf,
-    convert_pdf_to_markdown,
-    convert_markdown_to_chunks
+from backend.models import (
+    ProcessRequest,
+    ProcessResponse,
+    Item,
+    ThreadMessages,
+    Model,
+    JobResponse,
+    JobStatus,
+    DocumentChunks,
+    ChunkResult,
+    ChunkSubtree,
+    SearchResponse,
+    DocumentDuplicates,
 )
+from backend.utils import detect_file_type
+from backend.config import (
+    INPUT_DIR,
+    HTML_BROWSER_WARMUP,
+    LIBREOFFICE_WARMUP,
+    DEDUP_ENABLED,
+    CONVERTER_WARMUP,
+    CONVERTER_PRELOAD,
+)
+from backend import converters
+from backend.converters import ConverterUnavailableError, converter_status
+from backend.executors import start_executors, shutdown_executors, executor_stats, run_blocking
+from backend.chunk_index import get_chunk_index
+from backend.search import get_search_index
+from backend.dedup import get_dedup_index
+from backend.jobs import JobStore, JobRunner
+from backend import metrics
+from backend.streaming import DisconnectAwareStreamingResponse, metered_stream
+from backend.providers import (
+    ProviderBusyError,
+    ProviderError,
+    close_providers,
+    get_provider,
+    provider_stats,
+)
+from backend.response_cache import (
+    close_response_cache,
+    count_lookup,
+    get_response_cache,
+    record,
+    replay,
+    response_key,
+)
+from backend.threads import Transcript, close_thread_store, get_thread_store
+from backend.sse import SSE_HEADERS, SSE_MEDIA_TYPE, get_generation_buffer
+from backend.pipeline import process_file, refresh_rewritten_documents, stream_process_file
+
+logger = logging.getLogger(__name__)
+
+# Opened in lifespan, so importing the app does not touch jobs.db
+job_store: Optional[JobStore] = None
+job_runner: Optional[JobRunner] = None
+
+# Converter warm-up progress, reported by /health
+warmup_status = {"mode": CONVERTER_WARMUP, "state": "pending", "seconds": None, "skipped": {}}
 
-app = FastAPI(title="Document Processor API", version="1.0.0")
 
-# Mock responses for chat models
-RESPONSE_MODEL_A = "This is the response from Model A. " * 10
-RESPONSE_MODEL_B = "This is the response from Model B. " * 10
-RESPONSE_MODEL_C = "This is the response from Model C. " * 10
+async def warm_converters():
+    """
+    Load and start the converter resources enabled in the config.
+    
+    Converters whose dependencies are missing are skipped (and listed in
+    warmup_status) rather than failing start-up.
+    """
+    warmup_status["state"] = "running"
+    start = time.perf_counter()
+    try:
+        skipped = await asyncio.to_thread(converters.preload_converters, CONVERTER_PRELOAD)
+        # Starts Docling workers, each loading layout/table models once
+        await start_executors()
+        if HTML_BROWSER_WARMUP:
+            skipped["html_to_pdf"] = converters.unavailable_reason("html_to_pdf")
+            if not skipped["html_to_pdf"]:
+                # Launch Chromium once for all HTML→PDF conversions
+                await asyncio.to_thread(converters.start_browser_pool)
+        if LIBREOFFICE_WARMUP:
+            skipped["docx_to_pdf"] = converters.unavailable_reason("docx_to_pdf")
+            if not skipped["docx_to_pdf"]:
+                # Start persistent LibreOffice instances, each with its own profile
+                await asyncio.to_thread(converters.start_libreoffice_pool)
+    except Exception as e:
+        warmup_status["state"] = f"failed: {e}"
+        raise
+    warmup_status["skipped"] = {name: reason for name, reason in skipped.items() if reason}
+    for name, reason in warmup_status["skipped"].items():
+        logger.warning("Skipped warm-up of %s: %s", name, reason)
+    warmup_status["state"] = "done"
+    warmup_status["seconds"] = round(time.perf_counter() - start, 3)
 
 
+def _log_warmup_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Converter warm-up failed: %s", task.exception())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start long-lived resources; warm converters as set by CONVERTER_WARMUP."""
+    global job_store, job_runner
+    job_store = await run_blocking(JobStore)
+    job_runner = JobRunner(job_store)
+    # Index chunk files written before the search index existed
+    await asyncio.to_thread(get_search_index().sync)
+    if DEDUP_ENABLED:
+        # Register existing chunks as canonical copies for duplicate detection
+        rewritten = []
+        await asyncio.to_thread(get_dedup_index().sync, None, rewritten)
+        await asyncio.to_thread(refresh_rewritten_documents, rewritten)
+    # Build every model's provider now so a bad CHAT_PROVIDERS fails start-up
+    for model in Model:
+        get_provider(model)
+    await asyncio.to_thread(get_thread_store)
+    # Load persisted chat responses (RESPONSE_CACHE_PERSIST)
+    await asyncio.to_thread(get_response_cache)
+    warmup_task = None
+    if CONVERTER_WARMUP == "blocking":
+        await warm_converters()
+    elif CONVERTER_WARMUP == "background":
+        # Serve (chat, cached documents) while converters come up
+        warmup_task = asyncio.create_task(warm_converters())
+        warmup_task.add_done_callback(_log_warmup_failure)
+    else:
+        warmup_status["state"] = "off"
+    job_runner.start()
+    yield
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+        await asyncio.gather(warmup_task, return_exceptions=True)
+    await job_runner.stop()
+    await run_blocking(job_store.close)
+    await get_generation_buffer().close()
+    await close_providers()
+    close_response_cache()
+    close_thread_store()
+    await asyncio.to_thread(converters.stop_converter_pools)
+    shutdown_executors()
+
+
+app = FastAPI(title="Document Processor API", version="1.0.0", lifespan=lifespan)
+
 # ============================================================================
 # CHAT ENDPOINTS (existing functionality)
 # ============================================================================
 
-def stream_text(text: str):
-    """Generator to stream text character by character."""
-    for ch in text:
-        yield ch
-        time.sleep(0.01)
-
-
 @app.get("/")
 async def root():
     """Root endpoint for health check."""
     return {"message": "Welcome to the Document Processor API!"}
 
 @app.post("/result")
-async def send_response(item: Item):
+async def send_response(
+    item: Item,
+    accept: str | None = Header(None),
+    last_event_id: str | None = Header(None)
+):
     """
     Stream chat response based on selected model.
     
+    The model's provider (CHAT_PROVIDERS) either streams a canned response or
+    proxies an OpenAI-compatible server, passing text through as it arrives.
+    With RESPONSE_CACHE_ENABLED, a prompt already answered by the same model
+    is replayed from the response cache unless item.bypassCache is set; the
+    X-Cache header reports HIT, MISS or BYPASS.
+    
+    The prompt and the reply are appended to the thread (item.threadId), and
+    providers that take history get the thread's context window, so clients
+    only send the new message.
+    
+    With `Accept: text/event-stream` the response is a resumable SSE stream:
+    a client that lost its connection re-sends the request with
+    `Last-Event-ID` and receives only the missing frames.
+    
     Args:
         item: Chat request with user input, model, and thread ID
+        accept: Accept header (text/event-stream selects SSE)
+        last_event_id: ID of the last SSE event received, to resume
         
     Returns:
         Streaming response with model output
+    
+    Raises:
+        HTTPException: 503 if the model is at its concurrency limit, 502 if
+            the upstream request fails before streaming starts, 410 if the
+            generation to resume has expired, 400 for a malformed Last-Event-ID
     """
-    if item.model == Model.MODEL_A:
-        response = RESPONSE_MODEL_A
-    elif item.model == Model.MODEL_B:
-        response = RESPONSE_MODEL_B
-    elif item.model == Model.MODEL_C:
-        response = RESPONSE_MODEL_C
-    else:
-        response = "Model not supported."
+    start = time.perf_counter()
+    use_sse = SSE_MEDIA_TYPE in (accept or "")
+    if use_sse and last_event_id:
+        try:
+            generation, after = get_generation_buffer().resume(last_event_id)
+        except KeyError:
+            raise HTTPException(
+                status_code=410,
+                detail="Generation expired; send the request again without Last-Event-ID"
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return DisconnectAwareStreamingResponse(
+            metered_stream(generation.events(after), item.model, start),
+            media_type=SSE_MEDIA_TYPE,
+            headers=SSE_HEADERS
+        )
+    
+    provider = get_provider(item.model)
+    threads = get_thread_store()
+    history = await asyncio.to_thread(threads.context, item.threadId) if provider.uses_history else []
+    transcript = Transcript(threads, item.threadId, item.model)
+    tasks = BackgroundTasks()
+    
+    cache = get_response_cache()
+    frames = None
+    headers = {}
+    if cache is not None:
+        # The same label can be served by another provider or upstream model after a restart
+        key = response_key(
+            item.model,
+            item.userInput,
+            {"provider": type(provider).__name__, "upstream": provider.describe(), "history": history}
+        )
+        cached = None if item.bypassCache else cache.get(key)
+        if cached is not None:
+            count_lookup(item.model, "hit", sum(len(frame.encode("utf-8")) for frame in cached))
+            frames = replay(cached)
+            headers["X-Cache"] = "HIT"
+        else:
+            result = "bypass" if item.bypassCache else "miss"
+            count_lookup(item.model, result)
+            headers["X-Cache"] = result.upper()
+    
+    if frames is None:
+        try:
+            stream = await provider.open_stream(item, history)
+        except ProviderBusyError as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+        except ProviderError as e:
+            raise HTTPException(status_code=502, detail=str(e))
+        frames = stream if cache is None else record(stream, cache, key, item.model)
+        # Frees the provider slot and upstream connection even if the client left early
+        tasks.add_task(stream.aclose)
+    
+    # Only prompts that get a reply are added to the thread; the reply (or the
+    # part that was sent) is saved once the stream ends
+    await asyncio.to_thread(threads.append, item.threadId, "user", item.userInput)
+    tasks.add_task(transcript.save)
+    frames = transcript.tee(frames)
+    
+    if use_sse:
+        # Generation outlives the connection so the client can resume it
+        generation = get_generation_buffer().start(item.model, frames, tasks)
+        return DisconnectAwareStreamingResponse(
+            metered_stream(generation.events(), item.model, start),
+            media_type=SSE_MEDIA_TYPE,
+            headers={**headers, **SSE_HEADERS}
+        )
+    return DisconnectAwareStreamingResponse(
+        metered_stream(frames, item.model, start),
+        media_type="text/plain",
+        headers=headers,
+        background=tasks
+    )
+
+
+@app.get("/chat/generations")
+async def chat_generations():
+    """Buffered SSE generations: total, still running, and retention limits."""
+    return get_generation_buffer().stats()
+
+
+@app.get("/chat/providers")
+async def chat_providers():
+    """Provider, upstream, active streams and concurrency limit per chat model."""
+    return provider_stats()
+
+
+@app.get("/threads/{thread_id}/messages", response_model=ThreadMessages)
+async def get_thread_messages(
+    thread_id: str,
+    before: int | None = Query(None, ge=1, description="Only messages older than this message ID"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of messages returned")
+):
+    """
+    Page through a thread's history, newest page first.
+    
+    Start without `before` to get the latest messages; pass the returned
+    `next_before` to load the page before them.
     
-    return StreamingResponse(stream_text(response), media_type="text/plain")
+    Raises:
+        HTTPException: If the thread has no messages
+    """
+    threads = get_thread_store()
+    if not await asyncio.to_thread(threads.exists, thread_id):
+        raise HTTPException(status_code=404, detail=f"Thread not found: {thread_id}")
+    messages, next_before = await asyncio.to_thread(threads.messages, thread_id, before, limit)
+    return ThreadMessages(thread_id=thread_id, messages=messages, next_before=next_before)
+
+
+@app.delete("/threads/{thread_id}")
+async def delete_thread(thread_id: str):
+    """
+    Delete a thread and its messages.
+    
+    Raises:
+        HTTPException: If the thread does not exist
+    """
+    if not await asyncio.to_thread(get_thread_store().delete, thread_id):
+        raise HTTPException(status_code=404, detail=f"Thread not found: {thread_id}")
+    return {"deleted": thread_id}
+
+
+@app.get("/chat/cache")
+async def chat_cache():
+    """Response cache size, bounds, and hits, misses, hit ratio and bytes saved per model."""
+    cache = get_response_cache()
+    if cache is None:
+        return {"enabled": False}
+    return cache.stats()
+
+
+@app.delete("/chat/cache")
+async def clear_chat_cache():
+    """Drop every cached chat response."""
+    cache = get_response_cache()
+    if cache is None:
+        raise HTTPException(status_code=404, detail="Response cache is disabled (RESPONSE_CACHE_ENABLED)")
+    await asyncio.to_thread(cache.clear)
+    return {"cleared": True}
 
 
 # ============================================================================
 # DOCUMENT PROCESSING ENDPOINT
 # ============================================================================
 
+def resolve_input(request: ProcessRequest) -> tuple[Path, str]:
+    """
+    Resolve and validate the input file of a processing request.
+    
+    Args:
+        request: Processing request with file path (relative to data/input/)
+        
+    Returns:
+        Tuple of (absolute input path, detected file type)
+        
+    Raises:
+        HTTPException: 404 if the file does not exist, 400 if unsupported
+    """
+    # Handle both absolute and relative paths
+    # User can provide: "report.docx" or "/absolute/path/to/report.docx"
+    input_path = Path(request.file_path)
+    
+    # If absolute path is provided, use it directly
+    # If relative path, assume it's relative to INPUT_DIR
+    if not input_path.is_absolute():
+        input_path = INPUT_DIR / request.file_path
+    
+    # Validate input file exists
+    if not input_path.exists():
+        # Provide helpful error message based on path type
+        if Path(request.file_path).is_absolute():
+            raise HTTPException(
+                status_code=404,
+                detail=f"File not found: {request.file_path}"
+            )
+        else:
+            raise HTTPException(
+                status_code=404,
+                detail=f"File not found in data/input/: {request.file_path}. Please check that the file exists in the input directory."
+            )
+    
+    # Detect file type
+    start = time.perf_counter()
+    file_type = detect_file_type(input_path)
+    metrics.STAGE_SECONDS.observe(
+        time.perf_counter() - start, stage="detect", file_type=file_type or "unsupported"
+    )
+    if not file_type:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type: {input_path.suffix}"
+        )
+    
+    return input_path, file_type
+
+
 @app.post("/process", response_model=ProcessResponse)
 async def process_document(request: ProcessRequest):
     """
@@ -95,79 +427,249 @@ async def process_document(request: ProcessRequest):
     Raises:
         HTTPException: If file is not found or processing fails
     """
+    input_path, file_type = resolve_input(request)
+    
     try:
-        # Handle both absolute and relative paths
-        # User can provide: "report.docx" or "/absolute/path/to/report.docx"
-        input_path = Path(request.file_path)
-        
-        # If absolute path is provided, use it directly
-        # If relative path, assume it's relative to INPUT_DIR
-        if not input_path.is_absolute():
-            input_path = INPUT_DIR / request.file_path
-        
-        # Validate input file exists
-        if not input_path.exists():
-            # Provide helpful error message based on path type
-            if Path(request.file_path).is_absolute():
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"File not found: {request.file_path}"
-                )
-            else:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"File not found in data/input/: {request.file_path}. Please check that the file exists in the input directory."
-                )
-        
-        # Detect file type
-        file_type = detect_file_type(input_path)
-        if not file_type:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unsupported file type: {input_path.suffix}"
-            )
-        
-        # Step 1: Convert to PDF if needed → save to data/pdf/
-        if file_type == "pdf":
-            pdf_path = PDF_DIR / input_path.name  # Copy to pdf folder for consistency
-            if input_path != pdf_path:
-                import shutil
-                shutil.copy2(input_path, pdf_path)
-        elif file_type == "docx":
-            pdf_path = generate_output_path(input_path, PDF_DIR, ".pdf")
-            convert_docx_to_pdf(input_path, pdf_path)
-        elif file_type == "html":
-            pdf_path = generate_output_path(input_path, PDF_DIR, ".pdf")
-            # Use async version of HTML to PDF converter
-            from backend.converters.html_to_pdf import convert_html_to_pdf_async
-            await convert_html_to_pdf_async(input_path, pdf_path)
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_type}")
-        
-        # Step 2: Convert PDF to Markdown → save to data/markdown/
-        markdown_path = generate_output_path(pdf_path, MARKDOWN_DIR, ".md")
-        convert_pdf_to_markdown(pdf_path, markdown_path, enable_ocr=request.enable_ocr)
-        
-        # Step 3: Convert Markdown to chunks → save to data/chunks/
-        chunks_path = generate_output_path(markdown_path, CHUNKS_DIR, ".json")
-        convert_markdown_to_chunks(markdown_path, chunks_path)
+        # Convert → Markdown → chunks in executors so the event loop stays free
+        result = await process_file(input_path, file_type, request)
         
         return ProcessResponse(
             success=True,
-            chunks_path=str(chunks_path),
+            chunks_path=str(result.chunks_path),
             message=f"Successfully processed {input_path.name}",
-            file_type=file_type
+            file_type=file_type,
+            cache_hits=result.cache_hits,
+            pipeline=result.pipeline,
+            comparison=result.comparison,
+            delta=result.delta,
+            duplicates=result.duplicates
         )
         
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except ConverterUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
 
+
+@app.post("/process/stream")
+async def process_document_stream(request: ProcessRequest):
+    """
+    Process a document, streaming progress and chunks as newline-delimited JSON.
+    
+    Takes the same body as /process. Each line is one event:
+    - {"event": "stage", "stage": "pdf", "status": "running"}
+    - {"event": "chunk", "chunk": {"chunk_id": ..., "self": ..., "parents": ..., "text": ...}}
+    - {"event": "done", "chunks_path": ..., "chunk_count": ..., ...} or
+      {"event": "error", "detail": ...} as the last line
+    
+    Chunks are sent as soon as they are built, so consumers can start on the
+    first section while the rest of the document is still being chunked.
+    
+    Raises:
+        HTTPException: If the file is not found or unsupported
+    """
+    input_path, file_type = resolve_input(request)
+    
+    async def ndjson():
+        async for event in stream_process_file(input_path, file_type, request):
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+# ============================================================================
+# BACKGROUND JOB ENDPOINTS
+# ============================================================================
+
+@app.post("/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(request: ProcessRequest):
+    """
+    Queue a document for background processing and return immediately.
+    
+    Takes the same body as /process. Poll GET /jobs/{job_id} for progress.
+    
+    Raises:
+        HTTPException: If the file is not found or unsupported
+    """
+    input_path, file_type = resolve_input(request)
+    job_id = await run_blocking(job_store.enqueue, request, input_path, file_type)
+    job_runner.notify()
+    return JobResponse(job_id=job_id, state="queued")
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """
+    Get state, per-stage progress and (when done) the chunks path of a job.
+    
+    Raises:
+        HTTPException: If the job ID is unknown
+    """
+    job = await run_blocking(job_store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return JobStatus(**job)
+
+# ============================================================================
+# CHUNK RETRIEVAL ENDPOINTS
+# ============================================================================
+
+@app.get("/documents/{doc}/chunks", response_model=DocumentChunks)
+async def get_document_chunks(
+    doc: str,
+    offset: int = Query(0, ge=0, description="Index of the first chunk returned"),
+    limit: int | None = Query(None, ge=1, description="Maximum number of chunks returned")
+):
+    """
+    Get the chunks of a processed document.
+    
+    `doc` is the chunks file stem, e.g. "report" for data/chunks/report.json.
+    
+    Raises:
+        HTTPException: If the document has not been processed
+    """
+    chunks = await run_blocking(get_chunk_index().get_document, doc)
+    if chunks is None:
+        raise HTTPException(status_code=404, detail=f"Document not found: {doc}")
+    end = None if limit is None else offset + limit
+    return DocumentChunks(document=doc, total=len(chunks), chunks=chunks[offset:end])
+
+
+@app.get("/chunks/{chunk_id}", response_model=ChunkResult)
+async def get_chunk(chunk_id: str):
+    """
+    Get one chunk by ID, from whichever document contains it.
+    
+    Raises:
+        HTTPException: If no processed document has this chunk
+    """
+    found = await run_blocking(get_chunk_index().get_chunk, chunk_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail=f"Chunk not found: {chunk_id}")
+    doc, chunk = found
+    return ChunkResult(document=doc, chunk=chunk)
+
+
+@app.get("/chunks/{chunk_id}/subtree", response_model=ChunkSubtree)
+async def get_chunk_subtree(chunk_id: str):
+    """
+    Get a header's chunk and every chunk nested under it, in document order.
+    
+    `chunk_id` may also be a header ID from a chunk's `parents` list.
+    
+    Raises:
+        HTTPException: If the ID is unknown
+    """
+    found = await run_blocking(get_chunk_index().get_subtree, chunk_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail=f"Chunk not found: {chunk_id}")
+    doc, chunks = found
+    return ChunkSubtree(document=doc, chunk_id=chunk_id, chunks=chunks)
+
+
+@app.get("/documents/{doc}/duplicates", response_model=DocumentDuplicates)
+async def get_document_duplicates(doc: str):
+    """
+    Get the chunks of a document flagged as near-duplicates of earlier chunks.
+    
+    Each entry names the canonical chunk (fetch it with GET /chunks/{duplicate_of})
+    and the estimated similarity.
+    
+    Raises:
+        HTTPException: If the document has not been processed
+    """
+    chunks_path = get_chunk_index().chunks_path(doc)
+    if chunks_path is None or not chunks_path.exists():
+        raise HTTPException(status_code=404, detail=f"Document not found: {doc}")
+    duplicates = await run_blocking(get_dedup_index().get_duplicates, doc)
+    return DocumentDuplicates(document=doc, duplicates=duplicates)
+
+
+@app.get("/search", response_model=SearchResponse)
+async def search_chunks(
+    q: str = Query(..., min_length=1, description="Free-text query"),
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of results"),
+    doc: str | None = Query(None, description="Restrict results to one document")
+):
+    """
+    Full-text search over every processed chunk, ranked by BM25.
+    
+    Matches chunk text and header titles (own and parents, weighted higher);
+    chunks matching more of the query terms rank first.
+    """
+    start = time.perf_counter()
+    results = await run_blocking(get_search_index().search, q, limit, doc)
+    return SearchResponse(
+        query=q,
+        results=results,
+        took_ms=(time.perf_counter() - start) * 1000
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """
+    Pipeline and chat streaming metrics in the Prometheus text format.
+    
+    Per-stage latency histograms (detect, to_pdf, docling, postprocess,
+    markdown_export, fast_markdown, chunking, write), documents processed
+    by file type and outcome, in-flight gauges, input sizes, PDF page counts
+    and /result stream first-byte time, throughput and concurrency.
+    """
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
+    """
+    Health check endpoint.
+    
+    Also reports converter warm-up progress and, per converter, whether its
+    dependencies are available here and whether it has been loaded yet.
+    """
+    return {
+        "status": "healthy",
+        "warmup": warmup_status,
+        "converters": converter_status(),
+    }
+
+
+def require_converter(name: str):
+    """
+    Raises:
+        HTTPException: 503 if the converter cannot run on this node
+    """
+    try:
+        converters.ensure_available(name)
+    except ConverterUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@app.get("/converters/pool")
+async def converter_pool_stats():
+    """Docling converter pool hit/miss counters and warmup time."""
+    require_converter("pdf_to_markdown")
+    return {
+        "api_process": converters.get_converter_pool().stats(),
+        **executor_stats(),
+    }
+
+
+@app.get("/converters/browser")
+async def browser_pool_stats():
+    """HTML→PDF browser pool state and conversion/restart counters."""
+    require_converter("html_to_pdf")
+    return converters.get_browser_pool().stats()
+
+
+@app.get("/converters/libreoffice")
+async def libreoffice_pool_stats():
+    """LibreOffice instance health, conversion and restart counters."""
+    require_converter("docx_to_pdf")
+    # Health checks open a socket per instance, so keep them off the event loop
+    return await run_blocking(converters.get_libreoffice_pool().stats)
 
 
 # if __name__ == "__main__":
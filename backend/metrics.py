@@ -0,0 +1,361 @@
+"""
+In-process metrics exposed in the Prometheus text format at GET /metrics.
+
+A small registry of counters, gauges and histograms with labels, so the API
+needs no metrics client library. Work that runs in Docling worker processes
+reports its phase timings back to the API process, which records them here.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# Seconds: from fast cache hits to long OCR conversions
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+SIZE_BUCKETS = tuple(float(2 ** power) for power in range(10, 31, 2))  # 1 KiB .. 1 GiB
+PAGE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+RATE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)  # Bytes per second
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    """Base for a named metric family with a fixed set of label names."""
+    
+    type_name = ""
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+    
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    
+    type_name = "counter"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+    
+    def inc(self, amount: float = 1, **labels: str):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+    
+    def items(self) -> List[Tuple[LabelValues, float]]:
+        """(label values in labelnames order, value) for every label set."""
+        with self._lock:
+            return list(self._values.items())
+    
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. work in flight."""
+    
+    type_name = "gauge"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+    
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, amount: float = 1, **labels: str):
+        self.inc(-amount, **labels)
+    
+    def set(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+    
+    @contextmanager
+    def track_inprogress(self, **labels: str) -> Iterator[None]:
+        """Count the enclosed block as in flight while it runs."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+    
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observations over cumulative buckets."""
+    
+    type_name = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Per label set: (count per bucket, sum, count)
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+    
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+    
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+    
+    def totals(self) -> Dict[LabelValues, Tuple[float, int]]:
+        """Sum and count of observations per label set (label values in labelnames order)."""
+        with self._lock:
+            return {key: (total, count) for key, (_, total, count) in self._values.items()}
+    
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall time of the enclosed block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+    
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(c), s, n)) for key, (c, s, n) in self._values.items())
+        lines = []
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """Collection of metric families rendered together."""
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Duplicate metric: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+    
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+# Content type of Registry.render() output
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# ----------------------------------------------------------------------------
+# Document pipeline
+# ----------------------------------------------------------------------------
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "navtrade_pipeline_stage_seconds",
+    "Time spent in each pipeline stage (detect, to_pdf, docling, postprocess, "
+    "markdown_export, fast_markdown, chunking, write).",
+    ["stage", "file_type"],
+))
+STAGES_IN_FLIGHT = REGISTRY.register(Gauge(
+    "navtrade_pipeline_stages_in_flight",
+    "Pipeline stages currently running.",
+    ["stage"],
+))
+DOCUMENTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "navtrade_documents_in_flight",
+    "Documents currently being processed.",
+))
+DOCUMENTS_TOTAL = REGISTRY.register(Counter(
+    "navtrade_documents_processed_total",
+    "Documents processed, by file type and outcome (success or failure).",
+    ["file_type", "outcome"],
+))
+INPUT_BYTES = REGISTRY.register(Histogram(
+    "navtrade_input_size_bytes",
+    "Size of submitted source documents.",
+    ["file_type"],
+    buckets=SIZE_BUCKETS,
+))
+PDF_PAGES = REGISTRY.register(Histogram(
+    "navtrade_pdf_pages",
+    "Pages per PDF converted with Docling.",
+    ["file_type"],
+    buckets=PAGE_BUCKETS,
+))
+
+# ----------------------------------------------------------------------------
+# Chat streaming (/result)
+# ----------------------------------------------------------------------------
+
+STREAM_FIRST_BYTE_SECONDS = REGISTRY.register(Histogram(
+    "navtrade_chat_stream_first_byte_seconds",
+    "Time from request to the first streamed byte of a chat response.",
+    ["model"],
+))
+STREAM_DURATION_SECONDS = REGISTRY.register(Histogram(
+    "navtrade_chat_stream_duration_seconds",
+    "Duration of chat response streams.",
+    ["model"],
+))
+STREAM_BYTES_PER_SECOND = REGISTRY.register(Histogram(
+    "navtrade_chat_stream_bytes_per_second",
+    "Throughput of completed chat response streams.",
+    ["model"],
+    buckets=RATE_BUCKETS,
+))
+STREAM_BYTES_TOTAL = REGISTRY.register(Counter(
+    "navtrade_chat_stream_bytes_total",
+    "Bytes streamed in chat responses.",
+    ["model"],
+))
+STREAMS_ACTIVE = REGISTRY.register(Gauge(
+    "navtrade_chat_streams_active",
+    "Chat response streams currently open.",
+))
+PROVIDER_ERRORS_TOTAL = REGISTRY.register(Counter(
+    "navtrade_chat_provider_errors_total",
+    "Chat requests rejected before streaming: busy (no free slot) or upstream (request failed).",
+    ["model", "error"],
+))
+STREAM_DISCONNECTS_TOTAL = REGISTRY.register(Counter(
+    "navtrade_chat_stream_disconnects_total",
+    "Chat response streams ended early because the client disconnected.",
+    ["model"],
+))
+SSE_RESUMES_TOTAL = REGISTRY.register(Counter(
+    "navtrade_chat_sse_resumes_total",
+    "SSE reconnects with Last-Event-ID: resumed, or expired (generation no longer buffered).",
+    ["outcome"],
+))
+RESPONSE_CACHE_REQUESTS_TOTAL = REGISTRY.register(Counter(
+    "navtrade_chat_response_cache_requests_total",
+    "Chat requests by response cache result: hit, miss or bypass.",
+    ["model", "result"],
+))
+RESPONSE_CACHE_BYTES_SAVED_TOTAL = REGISTRY.register(Counter(
+    "navtrade_chat_response_cache_bytes_saved_total",
+    "Response bytes replayed from the cache instead of being generated.",
+    ["model"],
+))
+RESPONSE_CACHE_ENTRIES = REGISTRY.register(Gauge(
+    "navtrade_chat_response_cache_entries",
+    "Responses held in the response cache.",
+))
+RESPONSE_CACHE_BYTES = REGISTRY.register(Gauge(
+    "navtrade_chat_response_cache_bytes",
+    "Size of the responses held in the response cache.",
+))
+
+
+@contextmanager
+def track_stage(stage: str, file_type: str) -> Iterator[None]:
+    """Time a pipeline stage and count it as in flight while it runs."""
+    with STAGES_IN_FLIGHT.track_inprogress(stage=stage), STAGE_SECONDS.time(stage=stage, file_type=file_type):
+        yield
+
+
+def observe_phases(phases: Dict[str, float], file_type: str):
+    """
+    Record phase timings reported by a worker process.
+    
+    Args:
+        phases: Stage name → seconds; a "pages" entry is recorded as the page count
+        file_type: Source file type of the document
+    """
+    for stage, value in phases.items():
+        if stage == "pages":
+            PDF_PAGES.observe(value, file_type=file_type)
+        else:
+            STAGE_SECONDS.observe(value, stage=stage, file_type=file_type)
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text format."""
+    return REGISTRY.render()
@@ -1,6 +1,40 @@
 """
 Data models and schemas for the document processor.
 """
-from .schemas import ProcessRequest, ProcessResponse, Model, Item
+from .schemas import (
+    ProcessRequest,
+    ProcessResponse,
+    PipelineMode,
+    Model,
+    Item,
+    JobResponse,
+    JobStatus,
+    DocumentChunks,
+    ChunkResult,
+    ChunkSubtree,
+    SearchHit,
+    SearchResponse,
+    DuplicateChunk,
+    DocumentDuplicates,
+    ThreadMessage,
+    ThreadMessages,
+)
 
-__all__ = ["ProcessRequest", "ProcessResponse", "Model", "Item"]
+__all__ = [
+    "ProcessRequest",
+    "ProcessResponse",
+    "PipelineMode",
+    "Model",
+    "Item",
+    "JobResponse",
+    "JobStatus",
+    "DocumentChunks",
+    "ChunkResult",
+    "ChunkSubtree",
+    "SearchHit",
+    "SearchResponse",
+    "DuplicateChunk",
+    "DocumentDuplicates",
+    "ThreadMessage",
+    "ThreadMessages",
+]
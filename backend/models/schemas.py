@@ -3,7 +3,7 @@ Pydantic models for API requests and responses.
 """
 from pydantic import BaseModel, Field
 from enum import StrEnum
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 
 class Model(StrEnum):
@@ -13,17 +13,44 @@ class Model(StrEnum):
     MODEL_C = "model_c"
 
 
+class PipelineMode(StrEnum):
+    """Document processing pipeline selection."""
+    STANDARD = "standard"   # Source → PDF → Docling → Markdown
+    FAST = "fast"           # Source → Markdown directly (HTML, DOCX), falls back to standard
+    COMPARE = "compare"     # Standard, plus fast-path chunks and a comparison report
+
+
 class Item(BaseModel):
     """Chat request model."""
     userInput: str = Field(..., description="User's input message")
     model: Model = Field(..., description="Model to use for response")
     threadId: str = Field(..., description="Conversation thread ID")
+    bypassCache: bool = Field(
+        default=False,
+        description="Generate a fresh response instead of replaying a cached one (the cache is refreshed)"
+    )
 
 
 class ProcessRequest(BaseModel):
     """Document processing request model."""
     file_path: str = Field(..., description="Path to the input file")
     enable_ocr: bool = Field(default=False, description="Enable OCR for scanned PDFs")
+    enable_table_structure: bool = Field(
+        default=True,
+        description="Run Docling table structure recognition"
+    )
+    use_cache: bool = Field(
+        default=True,
+        description="Reuse cached artifacts for unchanged documents and options"
+    )
+    pipeline_mode: PipelineMode = Field(
+        default=PipelineMode.STANDARD,
+        description="standard (PDF + Docling), fast (direct Markdown) or compare (both)"
+    )
+    incremental: bool = Field(
+        default=False,
+        description="Report chunk IDs added, changed or removed since the previous run"
+    )
 
 
 class ProcessResponse(BaseModel):
@@ -32,3 +59,110 @@ class ProcessResponse(BaseModel):
     chunks_path: Optional[str] = Field(None, description="Path to output chunks JSON")
     message: str = Field(..., description="Status message")
     file_type: Optional[str] = Field(None, description="Detected file type")
+    cache_hits: List[str] = Field(
+        default_factory=list,
+        description="Pipeline stages served from the artifact cache (pdf, markdown, chunks)"
+    )
+    pipeline: Optional[str] = Field(None, description="Pipeline actually used (standard or fast)")
+    comparison: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Chunk-level differences of the fast path versus the PDF path (compare mode)"
+    )
+    delta: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Added, changed and removed chunk IDs versus the previous chunks file (incremental)"
+    )
+    duplicates: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Chunks that near-duplicate an earlier chunk in the corpus (count and chunks)"
+    )
+
+
+class DocumentChunks(BaseModel):
+    """Chunks of one processed document."""
+    document: str = Field(..., description="Document name (chunks file stem)")
+    total: int = Field(..., description="Number of chunks in the document")
+    chunks: List[Dict[str, Any]] = Field(..., description="Chunks in document order")
+
+
+class ChunkResult(BaseModel):
+    """A single chunk and the document it belongs to."""
+    document: str = Field(..., description="Document name (chunks file stem)")
+    chunk: Dict[str, Any] = Field(..., description="Chunk (chunk_id, self, parents, text)")
+
+
+class ChunkSubtree(BaseModel):
+    """A header's chunk and every chunk nested under it."""
+    document: str = Field(..., description="Document name (chunks file stem)")
+    chunk_id: str = Field(..., description="Requested chunk or header ID")
+    chunks: List[Dict[str, Any]] = Field(..., description="Subtree chunks in document order")
+
+
+class SearchHit(BaseModel):
+    """One ranked search result."""
+    chunk_id: str = Field(..., description="Matching chunk ID")
+    document: str = Field(..., description="Document name (chunks file stem)")
+    score: float = Field(..., description="BM25 score (higher is more relevant)")
+
+
+class SearchResponse(BaseModel):
+    """Ranked chunks for a full-text query."""
+    query: str = Field(..., description="Query as submitted")
+    results: List[SearchHit] = Field(default_factory=list, description="Best matches first")
+    took_ms: float = Field(..., description="Query time in milliseconds")
+
+
+class DuplicateChunk(BaseModel):
+    """A chunk flagged as a near-duplicate of a canonical chunk."""
+    chunk_id: str = Field(..., description="Duplicate chunk ID")
+    duplicate_of: str = Field(..., description="Canonical chunk ID")
+    document: str = Field(..., description="Document of the canonical chunk")
+    similarity: float = Field(..., description="Estimated Jaccard similarity of word shingles")
+
+
+class DocumentDuplicates(BaseModel):
+    """Near-duplicate chunks of one processed document."""
+    document: str = Field(..., description="Document name (chunks file stem)")
+    duplicates: List[DuplicateChunk] = Field(default_factory=list, description="Duplicates in document order")
+
+
+class ThreadMessage(BaseModel):
+    """One stored message of a conversation thread."""
+    id: int = Field(..., description="Message ID (increasing within a thread)")
+    role: str = Field(..., description="user or assistant")
+    model: Optional[str] = Field(None, description="Model that wrote an assistant message")
+    content: str = Field(..., description="Message text")
+    complete: bool = Field(True, description="False if the reply was cut short by a disconnect")
+    created_at: float = Field(..., description="Time stored (Unix seconds)")
+
+
+class ThreadMessages(BaseModel):
+    """A page of a thread's messages."""
+    thread_id: str = Field(..., description="Conversation thread ID")
+    messages: List[ThreadMessage] = Field(default_factory=list, description="Messages, oldest first")
+    next_before: Optional[int] = Field(
+        None,
+        description="Pass as ?before= for the previous (older) page; null at the start of the thread"
+    )
+
+
+class JobResponse(BaseModel):
+    """Response for a newly submitted processing job."""
+    job_id: str = Field(..., description="ID to poll at GET /jobs/{job_id}")
+    state: str = Field(..., description="Job state (queued, running, succeeded, failed)")
+
+
+class JobStatus(BaseModel):
+    """Status of a processing job."""
+    job_id: str = Field(..., description="Job ID")
+    state: str = Field(..., description="Job state (queued, running, succeeded, failed)")
+    file_type: Optional[str] = Field(None, description="Detected file type")
+    stages: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Per-stage progress (pending, running, done, cached)"
+    )
+    chunks_path: Optional[str] = Field(None, description="Path to output chunks JSON once done")
+    cache_hits: List[str] = Field(default_factory=list, description="Stages served from cache")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    created_at: float = Field(..., description="Submission time (Unix seconds)")
+    updated_at: float = Field(..., description="Last state change (Unix seconds)")
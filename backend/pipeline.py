@@ -0,0 +1,539 @@
+"""
+Document processing pipeline: source → PDF → Markdown → JSON chunks.
+"""
+import asyncio
+import shutil
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from backend import executors, metrics
+from backend.cache import ArtifactCache, get_artifact_cache, hash_file, stage_key
+from backend.chunk_index import get_chunk_index
+from backend.search import get_search_index
+from backend.dedup import get_dedup_index
+from backend.config import (
+    PDF_DIR,
+    MARKDOWN_DIR,
+    CHUNKS_DIR,
+    CHUNK_HEADERS,
+    CHUNK_STORE_ENABLED,
+    CHUNK_STORE_COMPRESS,
+    FAST_PATH_MIN_HEADINGS,
+    DOCLING_SHARD_PAGES,
+    DEDUP_ENABLED,
+)
+from backend.converters import (
+    ensure_available,
+    get_converter,
+    load_converter,
+    convert_docx_to_markdown,
+    convert_html_to_markdown,
+    convert_markdown_to_chunks,
+    iter_chunk_file,
+    compare_chunk_files,
+    chunk_fingerprints,
+    diff_chunk_fingerprints,
+    chunk_store_paths,
+    export_chunk_store,
+)
+from backend.models import ProcessRequest, PipelineMode
+from backend.utils import generate_output_path
+
+# Pipeline stages in execution order
+STAGES = ["pdf", "markdown", "chunks"]
+
+# Progress callback: (stage, status) where status is 'running', 'done', 'cached' or 'skipped'
+StageCallback = Callable[[str, str], None]
+
+# Chunk callback: called from a worker thread with each chunk as it is produced
+ChunkCallback = Callable[[Dict[str, Any]], None]
+
+# Chunks a streaming client may fall behind by before chunking pauses
+STREAM_MAX_PENDING_CHUNKS = 64
+
+# Direct source → Markdown converters used by the fast pipeline mode.
+# Each returns the number of headings found; too few means the document's
+# structure is layout-only and the Docling path is used instead.
+FAST_PATH_CONVERTERS: Dict[str, Callable[[Path, Path], int]] = {
+    "html": convert_html_to_markdown,
+    "docx": convert_docx_to_markdown,
+}
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of a pipeline run."""
+    chunks_path: Path
+    cache_hits: List[str] = field(default_factory=list)
+    pipeline: str = "standard"
+    comparison: Optional[Dict[str, Any]] = None
+    delta: Optional[Dict[str, Any]] = None
+    duplicates: Optional[Dict[str, Any]] = None
+
+
+def refresh_rewritten_documents(docs: List[str]):
+    """
+    Serve chunks files rewritten by the duplicate index (text replaced or put
+    back) from the retrieval API and search.
+    """
+    for doc in docs:
+        get_chunk_index().invalidate(doc)
+        chunks_path = CHUNKS_DIR / f"{doc}.json"
+        if chunks_path.exists():
+            stat = chunks_path.stat()
+            get_search_index().index_document(doc, chunks_path, f"file:{stat.st_size}:{stat.st_mtime_ns}")
+
+
+async def convert_to_pdf(input_path: Path, file_type: str) -> Path:
+    """
+    Stage 1: Bring the source document into data/pdf/.
+    
+    Args:
+        input_path: Source document
+        file_type: Detected file type ('pdf', 'docx' or 'html')
+        
+    Returns:
+        Path to the PDF in PDF_DIR
+        
+    Raises:
+        ValueError: If the file type is not supported
+        ConverterUnavailableError: If LibreOffice or Playwright is not available
+    """
+    if file_type == "pdf":
+        pdf_path = PDF_DIR / input_path.name  # Copy to pdf folder for consistency
+        if input_path != pdf_path:
+            await executors.run_blocking(shutil.copy2, input_path, pdf_path)
+    elif file_type == "docx":
+        pdf_path = generate_output_path(input_path, PDF_DIR, ".pdf")
+        await executors.run_blocking(get_converter("docx_to_pdf"), input_path, pdf_path)
+    elif file_type == "html":
+        pdf_path = generate_output_path(input_path, PDF_DIR, ".pdf")
+        # Use async version of HTML to PDF converter
+        html_to_pdf = load_converter("html_to_pdf")
+        await html_to_pdf.convert_html_to_pdf_async(input_path, pdf_path)
+    else:
+        raise ValueError(f"Unsupported file type: {file_type}")
+    return pdf_path
+
+
+class _PipelineRun:
+    """State for processing one document: output paths, cache keys and progress."""
+
+    def __init__(
+        self,
+        input_path: Path,
+        file_type: str,
+        request: ProcessRequest,
+        on_stage: Optional[StageCallback],
+        on_chunk: Optional[ChunkCallback] = None
+    ):
+        self.input_path = input_path
+        self.file_type = file_type
+        self.request = request
+        self.on_stage = on_stage
+        self.on_chunk = on_chunk
+        self.cache: Optional[ArtifactCache] = get_artifact_cache() if request.use_cache else None
+        self.cache_hits: List[str] = []
+        self.source_hash = ""
+        
+        # Output locations (keyed by stem, as before)
+        if file_type == "pdf":
+            self.pdf_path = PDF_DIR / input_path.name
+        else:
+            self.pdf_path = generate_output_path(input_path, PDF_DIR, ".pdf")
+        self.markdown_path = generate_output_path(self.pdf_path, MARKDOWN_DIR, ".md")
+        self.chunks_path = generate_output_path(self.markdown_path, CHUNKS_DIR, ".json")
+        # Document identity for deterministic chunk IDs
+        self.doc_id = self.chunks_path.stem
+
+    def report(self, stage: str, status: str):
+        if status == "cached":
+            self.cache_hits.append(stage)
+        if self.on_stage:
+            self.on_stage(stage, status)
+
+    async def cache_lookup(self, key: str, target_path: Path) -> bool:
+        if self.cache is None:
+            return False
+        return bool(await executors.run_blocking(self.cache.lookup, key, target_path))
+
+    async def cache_store(self, key: str, path: Path, meta: Optional[Dict[str, Any]] = None):
+        if self.cache is not None:
+            # Stats the artifact and rewrites the manifest: keep it off the event loop
+            await executors.run_blocking(self.cache.store, key, path, meta)
+
+    def cached_pipeline(self, markdown_key: str, default: str) -> str:
+        """Path ('fast' or 'standard') that produced the Markdown cached under a key."""
+        if self.cache is None:
+            return default
+        return self.cache.meta(markdown_key).get("pipeline", default)
+
+    # ------------------------------------------------------------------
+    # Cache keys: source content → PDF → Markdown → chunks
+    # ------------------------------------------------------------------
+
+    def pdf_key(self) -> str:
+        return stage_key("pdf", self.source_hash, {"file_type": self.file_type})
+
+    def docling_markdown_key(self) -> str:
+        return stage_key("markdown", self.pdf_key(), {
+            "enable_ocr": self.request.enable_ocr,
+            "enable_table_structure": self.request.enable_table_structure,
+            "shard_pages": DOCLING_SHARD_PAGES,
+        })
+
+    def fast_markdown_key(self) -> str:
+        return stage_key("markdown", self.source_hash, {
+            "fast_path": self.file_type,
+            "min_headings": FAST_PATH_MIN_HEADINGS,
+        })
+
+    def chunks_key(self, markdown_key: str) -> str:
+        # Chunk IDs depend on the document ID, so it is part of the key
+        return stage_key("chunks", markdown_key, {"headers": CHUNK_HEADERS, "doc_id": self.doc_id})
+
+    @staticmethod
+    def chunk_store_keys(chunks_key: str) -> tuple[str, str]:
+        """Keys of the chunk store data and index files written with a chunks file."""
+        return tuple(
+            stage_key("chunks", chunks_key, {"chunk_store": part, "compress": CHUNK_STORE_COMPRESS})
+            for part in ("data", "index")
+        )
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    async def docling_markdown(self, markdown_path: Path):
+        """Source → PDF → Docling Markdown, reusing cached artifacts."""
+        markdown_key = self.docling_markdown_key()
+        if await self.cache_lookup(markdown_key, markdown_path):
+            self.report("pdf", "cached")
+            self.report("markdown", "cached")
+            return
+        # Fail before rendering a PDF that Docling could not convert
+        ensure_available("pdf_to_markdown")
+        
+        # Step 1: Convert to PDF if needed → save to data/pdf/
+        pdf_key = self.pdf_key()
+        if await self.cache_lookup(pdf_key, self.pdf_path):
+            self.report("pdf", "cached")
+        else:
+            self.report("pdf", "running")
+            with metrics.track_stage("to_pdf", self.file_type):
+                self.pdf_path = await convert_to_pdf(self.input_path, self.file_type)
+            await self.cache_store(pdf_key, self.pdf_path)
+            self.report("pdf", "done")
+        
+        # Step 2: Convert PDF to Markdown → save to data/markdown/
+        self.report("markdown", "running")
+        phases: Dict[str, float] = {}
+        with metrics.STAGES_IN_FLIGHT.track_inprogress(stage="docling"):
+            await executors.pdf_to_markdown(
+                self.pdf_path,
+                markdown_path,
+                enable_ocr=self.request.enable_ocr,
+                enable_table_structure=self.request.enable_table_structure,
+                phases=phases
+            )
+        metrics.observe_phases(phases, self.file_type)
+        await self.cache_store(markdown_key, markdown_path)
+        self.report("markdown", "done")
+
+    async def fast_markdown(self, markdown_path: Path, fallback: bool = True) -> bool:
+        """
+        Source → Markdown directly, skipping PDF rendering and Docling.
+        
+        Returns:
+            True if the fast path was used, False if it fell back to Docling
+        """
+        self.report("markdown", "running")
+        converter = FAST_PATH_CONVERTERS[self.file_type]
+        with metrics.track_stage("fast_markdown", self.file_type):
+            heading_count = await executors.run_cpu(converter, self.input_path, markdown_path)
+        if heading_count >= FAST_PATH_MIN_HEADINGS or not fallback:
+            self.report("pdf", "skipped")
+            self.report("markdown", "done")
+            return True
+        
+        # Structure is layout-only: recover it with the PDF/Docling path
+        await self.docling_markdown(markdown_path)
+        return False
+
+    async def chunks(
+        self,
+        markdown_path: Path,
+        chunks_path: Path,
+        chunks_key: Optional[str],
+        doc_id: Optional[str] = None
+    ):
+        """Step 3: Convert Markdown to chunks → save to data/chunks/."""
+        doc_id = doc_id or self.doc_id
+        self.report("chunks", "running")
+        with metrics.track_stage("chunking", self.file_type):
+            if self.on_chunk:
+                # Chunk in a thread of this process so each chunk reaches the
+                # callback as it is built; the default executor is used so a slow
+                # client cannot tie up the subprocess thread pool
+                await asyncio.to_thread(
+                    convert_markdown_to_chunks, markdown_path, chunks_path, self.on_chunk, doc_id
+                )
+            else:
+                await executors.markdown_to_chunks(markdown_path, chunks_path, doc_id)
+        if chunks_key:
+            await self.cache_store(chunks_key, chunks_path)
+            await self.cache_chunk_store(chunks_key, chunks_path)
+        self.report("chunks", "done")
+
+    async def cache_chunk_store(self, chunks_key: str, chunks_path: Path):
+        if CHUNK_STORE_ENABLED:
+            for key, path in zip(self.chunk_store_keys(chunks_key), chunk_store_paths(chunks_path)):
+                await self.cache_store(key, path)
+
+    async def restore_chunk_store(self, chunks_key: str):
+        """Bring back the chunk store of a cached chunks file, rebuilding it if needed."""
+        if not CHUNK_STORE_ENABLED:
+            return
+        for key, path in zip(self.chunk_store_keys(chunks_key), chunk_store_paths(self.chunks_path)):
+            if not await self.cache_lookup(key, path):
+                break
+        else:
+            return
+        await executors.run_blocking(export_chunk_store, self.chunks_path)
+        await self.cache_chunk_store(chunks_key, self.chunks_path)
+    
+    async def deduplicate(self, chunks_key: str) -> Dict[str, Any]:
+        """Flag near-duplicates of the corpus, replacing their text if DEDUP_REPLACE_TEXT."""
+        rewritten: List[str] = []
+        duplicates = await executors.run_blocking(
+            get_dedup_index().index_document, self.doc_id, self.chunks_path, rewritten
+        )
+        if self.doc_id in rewritten:
+            # Cache the rewritten file so a cache hit serves it as it is now
+            await self.cache_store(chunks_key, self.chunks_path)
+            await self.cache_chunk_store(chunks_key, self.chunks_path)
+        # Other documents got their text back (or lost it) when their canonical chunks changed
+        others = [doc for doc in rewritten if doc != self.doc_id]
+        if others:
+            await executors.run_blocking(refresh_rewritten_documents, others)
+        return {"count": len(duplicates), "chunks": duplicates}
+
+    async def run(self) -> PipelineResult:
+        """Process the document, recording outcome, size and in-flight metrics."""
+        size = await executors.run_blocking(lambda: self.input_path.stat().st_size)
+        metrics.INPUT_BYTES.observe(size, file_type=self.file_type)
+        with metrics.DOCUMENTS_IN_FLIGHT.track_inprogress():
+            try:
+                result = await self._run()
+            except Exception:
+                metrics.DOCUMENTS_TOTAL.inc(file_type=self.file_type, outcome="failure")
+                raise
+        metrics.DOCUMENTS_TOTAL.inc(file_type=self.file_type, outcome="success")
+        return result
+    
+    async def _run(self) -> PipelineResult:
+        self.source_hash = await executors.run_blocking(hash_file, self.input_path)
+        mode = self.request.pipeline_mode
+        use_fast = mode == PipelineMode.FAST and self.file_type in FAST_PATH_CONVERTERS
+        pipeline = "fast" if use_fast else "standard"
+        
+        markdown_key = self.fast_markdown_key() if use_fast else self.docling_markdown_key()
+        chunks_key = self.chunks_key(markdown_key)
+        
+        # Snapshot the previous chunks before this run overwrites them
+        previous_chunks = None
+        if self.request.incremental:
+            previous_chunks = await executors.run_blocking(chunk_fingerprints, self.chunks_path)
+        
+        if await self.cache_lookup(chunks_key, self.chunks_path):
+            if use_fast:
+                pipeline = self.cached_pipeline(markdown_key, pipeline)
+            for stage in STAGES:
+                # The fast path never rendered a PDF
+                self.report(stage, "skipped" if stage == "pdf" and pipeline == "fast" else "cached")
+            await self.restore_chunk_store(chunks_key)
+            if self.on_chunk:
+                await asyncio.to_thread(_replay_chunks, self.chunks_path, self.on_chunk)
+        else:
+            if use_fast:
+                if await self.cache_lookup(markdown_key, self.markdown_path):
+                    pipeline = self.cached_pipeline(markdown_key, pipeline)
+                    # A remembered fallback came from a (cached) PDF, not the fast path
+                    self.report("pdf", "skipped" if pipeline == "fast" else "cached")
+                    self.report("markdown", "cached")
+                else:
+                    if not await self.fast_markdown(self.markdown_path):
+                        pipeline = "standard"
+                    # Cache under the fast key too, so a fallback is remembered
+                    await self.cache_store(markdown_key, self.markdown_path, {"pipeline": pipeline})
+            else:
+                await self.docling_markdown(self.markdown_path)
+            await self.chunks(self.markdown_path, self.chunks_path, chunks_key)
+        
+        result = PipelineResult(
+            chunks_path=self.chunks_path,
+            cache_hits=self.cache_hits,
+            pipeline=pipeline,
+        )
+        if DEDUP_ENABLED:
+            result.duplicates = await self.deduplicate(chunks_key)
+        if previous_chunks is not None:
+            current_chunks = await executors.run_blocking(chunk_fingerprints, self.chunks_path)
+            result.delta = diff_chunk_fingerprints(previous_chunks, current_chunks)
+        
+        if mode == PipelineMode.COMPARE and self.file_type in FAST_PATH_CONVERTERS:
+            # Fast path outputs go next to the reference outputs with a .fast suffix
+            fast_markdown_path = MARKDOWN_DIR / f"{self.markdown_path.stem}.fast.md"
+            fast_chunks_path = CHUNKS_DIR / f"{self.chunks_path.stem}.fast.json"
+            # Progress and streamed chunks reflect the reference pipeline only
+            self.on_stage = None
+            self.on_chunk = None
+            await self.fast_markdown(fast_markdown_path, fallback=False)
+            fast_text = await executors.run_blocking(fast_markdown_path.read_text, encoding="utf-8")
+            if not fast_text.strip():
+                # e.g. a legacy binary .doc: nothing to compare against
+                result.comparison = {
+                    "skipped": True,
+                    "reason": f"The fast {self.file_type} converter could not extract any content",
+                }
+            else:
+                # Own document ID, so candidate chunk IDs never collide with the reference's
+                await self.chunks(
+                    fast_markdown_path, fast_chunks_path, chunks_key=None, doc_id=fast_chunks_path.stem
+                )
+                result.comparison = await executors.run_blocking(
+                    compare_chunk_files, self.chunks_path, fast_chunks_path
+                )
+                result.comparison["candidate_chunks_path"] = str(fast_chunks_path)
+                await executors.run_blocking(get_chunk_index().invalidate, fast_chunks_path.stem)
+        
+        # Serve the new chunks from the retrieval API and search
+        await executors.run_blocking(get_chunk_index().invalidate, self.doc_id)
+        await executors.run_blocking(
+            get_search_index().index_document, self.doc_id, self.chunks_path, chunks_key
+        )
+        return result
+
+
+async def process_file(
+    input_path: Path,
+    file_type: str,
+    request: ProcessRequest,
+    on_stage: Optional[StageCallback] = None
+) -> PipelineResult:
+    """
+    Run every pipeline stage for one document without blocking the event loop.
+    
+    Stages whose content-addressed key is already in the artifact cache are
+    skipped, starting from the last stage: a cached chunks file means nothing
+    is re-run at all.
+    
+    Pipeline modes:
+    - standard: source → PDF → Docling → Markdown → chunks
+    - fast: source → Markdown directly for formats with explicit structure,
+      falling back to standard when too few headings are found
+    - compare: standard, plus the fast path written to *.fast.* files and a
+      chunk-level comparison of the two
+    
+    Args:
+        input_path: Validated path to the source document
+        file_type: Detected file type
+        request: Processing options
+        on_stage: Optional callback notified as each stage starts and finishes
+        
+    Returns:
+        PipelineResult with the chunks path and the stages served from cache
+    """
+    return await _PipelineRun(input_path, file_type, request, on_stage).run()
+
+
+class StreamCancelled(Exception):
+    """Raised inside the chunking thread when the streaming client has gone away."""
+
+
+def _replay_chunks(chunks_path: Path, on_chunk: ChunkCallback):
+    """Feed the chunks of an existing chunks file to a chunk callback."""
+    for chunk in iter_chunk_file(chunks_path):
+        on_chunk(chunk)
+
+
+async def stream_process_file(
+    input_path: Path,
+    file_type: str,
+    request: ProcessRequest,
+    max_pending: int = STREAM_MAX_PENDING_CHUNKS
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the pipeline for one document, yielding progress and chunks as events.
+    
+    Events, in order:
+    - {"event": "stage", "stage": ..., "status": ...} as each stage starts and finishes
+    - {"event": "chunk", "chunk": {...}} for every chunk, as soon as it is built
+      (replayed from the chunks file on a cache hit)
+    - {"event": "done", ...} with the PipelineResult fields and chunk count,
+      or {"event": "error", "detail": ...} if processing failed
+    
+    At most max_pending chunks are buffered: chunking pauses until the consumer
+    catches up, so memory stays flat however large the document is. Closing
+    the generator (e.g. on client disconnect) stops chunking and cancels the run.
+    
+    Args:
+        input_path: Validated path to the source document
+        file_type: Detected file type
+        request: Processing options
+        max_pending: Maximum number of chunks buffered ahead of the consumer
+        
+    Yields:
+        Event dictionaries
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    slots = threading.Semaphore(max_pending)
+    cancelled = threading.Event()
+    
+    def on_stage(stage: str, status: str):
+        events.put_nowait({"event": "stage", "stage": stage, "status": status})
+    
+    def on_chunk(chunk: Dict[str, Any]):
+        # Runs in the chunking thread: block while the consumer is behind
+        while not slots.acquire(timeout=0.5):
+            if cancelled.is_set():
+                raise StreamCancelled()
+        if cancelled.is_set():
+            raise StreamCancelled()
+        loop.call_soon_threadsafe(events.put_nowait, {"event": "chunk", "chunk": chunk})
+    
+    async def run():
+        try:
+            result = await _PipelineRun(input_path, file_type, request, on_stage, on_chunk).run()
+            events.put_nowait({
+                "event": "done",
+                "chunks_path": str(result.chunks_path),
+                "file_type": file_type,
+                "cache_hits": result.cache_hits,
+                "pipeline": result.pipeline,
+                "comparison": result.comparison,
+                "delta": result.delta,
+                "duplicates": result.duplicates,
+            })
+        except Exception as e:
+            events.put_nowait({"event": "error", "detail": f"Processing failed: {str(e)}"})
+        finally:
+            events.put_nowait(None)
+    
+    task = asyncio.create_task(run())
+    chunk_count = 0
+    try:
+        while (event := await events.get()) is not None:
+            if event["event"] == "chunk":
+                slots.release()
+                chunk_count += 1
+            elif event["event"] == "done":
+                event["chunk_count"] = chunk_count
+            yield event
+    finally:
+        cancelled.set()
+        if not task.done():
+            task.cancel()
@@ -0,0 +1,20 @@
+"""
+Chat model providers behind the /result endpoint.
+"""
+from .base import ChatProvider, ProviderBusyError, ProviderError, ProviderStream
+from .mock import MockProvider
+from .openai_compat import OpenAICompatibleProvider
+from .registry import close_providers, get_http_client, get_provider, provider_stats
+
+__all__ = [
+    "ChatProvider",
+    "ProviderBusyError",
+    "ProviderError",
+    "ProviderStream",
+    "MockProvider",
+    "OpenAICompatibleProvider",
+    "close_providers",
+    "get_http_client",
+    "get_provider",
+    "provider_stats",
+]
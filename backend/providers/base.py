@@ -0,0 +1,128 @@
+"""
+Chat provider interface: per-model concurrency limits and stream lifecycle.
+"""
+import asyncio
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from backend import metrics
+from backend.models import Item
+
+
+History = List[Dict[str, str]]
+
+
+class ProviderError(Exception):
+    """The upstream model failed or could not be reached."""
+
+
+class ProviderBusyError(ProviderError):
+    """No concurrency slot became free within the queue timeout."""
+
+
+class ProviderStream:
+    """
+    A provider's token stream that frees its concurrency slot when closed.
+    
+    Closes itself when exhausted; call aclose() when the consumer stops early
+    (e.g. the client disconnected). Closing twice is a no-op.
+    """
+    
+    def __init__(self, chunks: AsyncIterator[str], release: Callable[[], None]):
+        self._chunks = chunks
+        self._release = release
+        self._closed = False
+    
+    def __aiter__(self) -> "ProviderStream":
+        return self
+    
+    async def __anext__(self) -> str:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            await self.aclose()
+            raise
+    
+    async def aclose(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self._chunks.aclose()
+        finally:
+            self._release()
+
+
+class ChatProvider:
+    """
+    Base class for chat model backends.
+    
+    Subclasses implement _open(), which starts generation (sending the
+    upstream request and checking its status) and returns the text stream.
+    Errors raised there surface before any response bytes are sent.
+    """
+    
+    # Whether replies depend on the thread history passed to _open()
+    uses_history = False
+    
+    def __init__(self, model: str, max_concurrency: int, queue_timeout: float):
+        """
+        Args:
+            model: Model label (Model enum value) for metrics and errors
+            max_concurrency: Streams this model serves at once
+            queue_timeout: Seconds a request waits for a free slot
+        """
+        self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self.active = 0
+    
+    async def _open(self, item: Item, history: History) -> AsyncIterator[str]:
+        raise NotImplementedError
+    
+    async def open_stream(self, item: Item, history: Optional[History] = None) -> ProviderStream:
+        """
+        Start generating a response, waiting for a concurrency slot first.
+        
+        Args:
+            item: Chat request
+            history: Earlier messages of the thread as {"role", "content"} dicts
+        
+        Raises:
+            ProviderBusyError: If no slot frees up within queue_timeout
+            ProviderError: If the upstream request fails before streaming
+        """
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            metrics.PROVIDER_ERRORS_TOTAL.inc(model=self.model, error="busy")
+            raise ProviderBusyError(
+                f"{self.model} is at its limit of {self.max_concurrency} concurrent streams"
+            ) from None
+        self.active += 1
+        try:
+            chunks = await self._open(item, history or [])
+        except BaseException as e:
+            self._release()
+            if isinstance(e, ProviderError):
+                metrics.PROVIDER_ERRORS_TOTAL.inc(model=self.model, error="upstream")
+            raise
+        return ProviderStream(chunks, self._release)
+    
+    def _release(self):
+        self.active -= 1
+        self._slots.release()
+    
+    async def close(self):
+        """Release resources held by the provider."""
+    
+    def stats(self) -> dict:
+        return {
+            "provider": type(self).__name__,
+            "active": self.active,
+            "max_concurrency": self.max_concurrency,
+        }
+    
+    def describe(self) -> Optional[str]:
+        """Upstream the provider talks to, if any."""
+        return None
@@ -0,0 +1,111 @@
+"""
+Local stand-in for an OpenAI-compatible LLM server.
+
+Implements POST /v1/chat/completions (streaming and not) and GET /v1/models
+with a deterministic reply generated at a configurable pace, so the
+"openai" provider can be developed and load-tested without a GPU.
+
+Usage:
+    uv run python -m backend.providers.fake_openai --port 8001 --token-delay 0.02
+    CHAT_PROVIDERS="model_a=openai,model_b=openai" uv run uvicorn backend.main:app
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import AsyncIterator, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from backend.streaming import split_tokens
+
+# Pace of the fake model (overridable on the command line)
+FIRST_TOKEN_DELAY = float(os.getenv("FAKE_LLM_FIRST_TOKEN_DELAY", "0.2"))  # Seconds before the first token
+TOKEN_DELAY = float(os.getenv("FAKE_LLM_TOKEN_DELAY", "0.02"))              # Seconds per token
+REPLY_WORDS = int(os.getenv("FAKE_LLM_REPLY_WORDS", "60"))                 # Words per reply
+
+_FILLER = (
+    "The policy schedule lists the items under restriction together with the licence "
+    "conditions that apply to each heading of the tariff chapter."
+).split()
+
+app = FastAPI(title="Fake OpenAI-compatible server")
+
+
+def reply_tokens(model: str, messages: List[dict]) -> List[str]:
+    """Deterministic reply: echoes the last user message and the history length, then filler words."""
+    prompt = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    words = [f"[{model}]", f"({max(0, len(messages) - 1)} earlier messages)", "You", "said:", *prompt.split()[:20], "—"]
+    words += [_FILLER[i % len(_FILLER)] for i in range(max(0, REPLY_WORDS - len(words)))]
+    return split_tokens(" ".join(words), "word")
+
+
+def _chunk(completion_id: str, created: int, model: str, delta: dict, finish_reason=None) -> str:
+    event = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(event)}\n\n"
+
+
+async def _events(model: str, tokens: List[str]) -> AsyncIterator[str]:
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+    await asyncio.sleep(FIRST_TOKEN_DELAY)
+    yield _chunk(completion_id, created, model, {"role": "assistant", "content": ""})
+    for index, token in enumerate(tokens):
+        if index:
+            await asyncio.sleep(TOKEN_DELAY)
+        yield _chunk(completion_id, created, model, {"content": token})
+    yield _chunk(completion_id, created, model, {}, finish_reason="stop")
+    yield "data: [DONE]\n\n"
+
+
+@app.get("/v1/models")
+async def list_models():
+    return {"object": "list", "data": [{"id": "fake", "object": "model", "owned_by": "local"}]}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "fake")
+    tokens = reply_tokens(model, body.get("messages") or [])
+    if body.get("stream"):
+        return StreamingResponse(_events(model, tokens), media_type="text/event-stream")
+    
+    await asyncio.sleep(FIRST_TOKEN_DELAY + TOKEN_DELAY * len(tokens))
+    text = "".join(tokens)
+    return JSONResponse({
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)},
+    })
+
+
+def main():
+    global FIRST_TOKEN_DELAY, TOKEN_DELAY, REPLY_WORDS
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--first-token-delay", type=float, default=FIRST_TOKEN_DELAY)
+    parser.add_argument("--token-delay", type=float, default=TOKEN_DELAY)
+    parser.add_argument("--reply-words", type=int, default=REPLY_WORDS)
+    args = parser.parse_args()
+    FIRST_TOKEN_DELAY, TOKEN_DELAY, REPLY_WORDS = args.first_token_delay, args.token_delay, args.reply_words
+    
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Canned responses streamed at a model-like pace (no inference).
+"""
+from typing import AsyncIterator
+
+from backend.models import Item
+from backend.providers.base import ChatProvider, History
+from backend.streaming import stream_text
+
+# Mock responses for chat models
+MOCK_RESPONSES = {
+    "model_a": "This is the response from Model A. " * 10,
+    "model_b": "This is the response from Model B. " * 10,
+    "model_c": "This is the response from Model C. " * 10,
+}
+
+
+class MockProvider(ChatProvider):
+    """Streams a fixed response per model, ignoring the prompt."""
+    
+    def __init__(self, model: str, max_concurrency: int, queue_timeout: float):
+        super().__init__(model, max_concurrency, queue_timeout)
+        self.response = MOCK_RESPONSES.get(model, "Model not supported.")
+    
+    async def _open(self, item: Item, history: History) -> AsyncIterator[str]:
+        return stream_text(self.response)
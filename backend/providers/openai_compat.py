@@ -0,0 +1,144 @@
+"""
+Provider for OpenAI-compatible chat completion servers (vLLM, llama.cpp,
+Ollama, OpenAI itself, or the bundled fake server).
+"""
+import json
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from backend.models import Item
+from backend.providers.base import ChatProvider, History, ProviderError
+
+
+def parse_sse_lines(lines: List[bytes]) -> tuple[str, bool]:
+    """
+    Extract the streamed text from complete Server-Sent Events lines.
+    
+    Args:
+        lines: Lines of a chat.completion.chunk event stream
+    
+    Returns:
+        Tuple of (concatenated delta content, whether [DONE] was seen)
+    
+    Raises:
+        ProviderError: If a data line is not valid JSON
+    """
+    texts = []
+    for line in lines:
+        line = line.strip()
+        if not line.startswith(b"data:"):
+            continue  # Blank separators, comments and other fields
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            return "".join(texts), True
+        try:
+            event = json.loads(data)
+        except ValueError:
+            raise ProviderError(f"Malformed event from upstream: {data[:200]!r}") from None
+        for choice in event.get("choices") or ():
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                texts.append(content)
+    return "".join(texts), False
+
+
+class OpenAICompatibleProvider(ChatProvider):
+    """
+    Proxies chat requests to POST {base_url}/chat/completions with stream=true.
+    
+    Text is forwarded as soon as it arrives: every network read is parsed and
+    the deltas it completes are passed on as one piece, so nothing is held
+    back waiting for more tokens. The thread history is sent ahead of the
+    prompt, so clients never resend earlier turns.
+    """
+    
+    uses_history = True
+    
+    def __init__(
+        self,
+        model: str,
+        max_concurrency: int,
+        queue_timeout: float,
+        client: httpx.AsyncClient,
+        base_url: str,
+        upstream_model: Optional[str] = None,
+        api_key: str = "",
+        read_timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            model: Model label (Model enum value)
+            max_concurrency: Streams this model serves at once
+            queue_timeout: Seconds a request waits for a free slot
+            client: Shared, connection-pooled HTTP client
+            base_url: API root, e.g. http://127.0.0.1:8001/v1
+            upstream_model: Model name sent upstream (default: the label)
+            api_key: Bearer token, if the server needs one
+            read_timeout: Max seconds between upstream reads for this model
+                (default: the shared client's)
+        """
+        super().__init__(model, max_concurrency, queue_timeout)
+        self.client = client
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.upstream_model = upstream_model or model
+        self.headers: Dict[str, str] = {"Accept": "text/event-stream"}
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+        shared = client.timeout
+        self.timeout = httpx.Timeout(
+            connect=shared.connect,
+            read=shared.read if read_timeout is None else read_timeout,
+            write=shared.write,
+            pool=shared.pool,
+        )
+    
+    async def _open(self, item: Item, history: History) -> AsyncIterator[str]:
+        payload = {
+            "model": self.upstream_model,
+            "messages": [*history, {"role": "user", "content": item.userInput}],
+            "stream": True,
+            "user": item.threadId,
+        }
+        request = self.client.build_request(
+            "POST", self.url, json=payload, headers=self.headers, timeout=self.timeout
+        )
+        try:
+            response = await self.client.send(request, stream=True)
+        except httpx.TimeoutException as e:
+            raise ProviderError(f"{self.model}: upstream timed out ({type(e).__name__})") from e
+        except httpx.HTTPError as e:
+            raise ProviderError(f"{self.model}: upstream unreachable ({e})") from e
+        if response.status_code != 200:
+            body = await response.aread()
+            await response.aclose()
+            raise ProviderError(
+                f"{self.model}: upstream returned {response.status_code}: {body[:200].decode(errors='replace')}"
+            )
+        return self._relay(response)
+    
+    async def _relay(self, response: httpx.Response) -> AsyncIterator[str]:
+        """Yield the text of each network read of the event stream."""
+        partial = b""
+        try:
+            async for data in response.aiter_bytes():
+                lines = (partial + data).split(b"\n")
+                partial = lines.pop()
+                text, done = parse_sse_lines(lines)
+                if text:
+                    yield text
+                if done:
+                    return
+            text, _ = parse_sse_lines([partial])
+            if text:
+                yield text
+        except httpx.HTTPError as e:
+            raise ProviderError(f"{self.model}: upstream stream failed ({type(e).__name__})") from e
+        finally:
+            await response.aclose()
+    
+    def stats(self) -> dict:
+        return {**super().stats(), "read_timeout": self.timeout.read}
+    
+    def describe(self) -> Optional[str]:
+        return f"{self.url} ({self.upstream_model})"
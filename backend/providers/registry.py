@@ -0,0 +1,130 @@
+"""
+One provider per chat model, built from CHAT_PROVIDERS on first use.
+"""
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from backend.config import (
+    CHAT_PROVIDERS,
+    OPENAI_BASE_URL,
+    OPENAI_API_KEY,
+    CHAT_MAX_CONCURRENCY,
+    CHAT_QUEUE_TIMEOUT,
+    CHAT_CONNECT_TIMEOUT,
+    CHAT_READ_TIMEOUT,
+    CHAT_HTTP_MAX_CONNECTIONS,
+)
+from backend.providers.base import ChatProvider
+from backend.providers.mock import MockProvider
+from backend.providers.openai_compat import OpenAICompatibleProvider
+
+_providers: Dict[str, ChatProvider] = {}
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The connection-pooled HTTP client shared by every upstream provider."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=CHAT_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=CHAT_HTTP_MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(
+                connect=CHAT_CONNECT_TIMEOUT,
+                read=CHAT_READ_TIMEOUT,
+                write=CHAT_CONNECT_TIMEOUT,
+                pool=CHAT_QUEUE_TIMEOUT,
+            ),
+        )
+    return _client
+
+
+def parse_target(target: str) -> Tuple[str, str, Dict[str, float]]:
+    """
+    Split a CHAT_PROVIDERS target into its parts.
+    
+    Args:
+        target: "kind[:upstream model name]" followed by optional ";max=<streams>"
+            and ";timeout=<read timeout in seconds>", e.g. "openai:llama3;max=8;timeout=30"
+    
+    Returns:
+        Tuple of (kind, upstream model name or "", overrides by option name)
+    
+    Raises:
+        ValueError: If an option is unknown or not a positive number
+    """
+    provider, *options = target.split(";")
+    kind, _, upstream_model = provider.strip().partition(":")
+    overrides: Dict[str, float] = {}
+    for option in options:
+        name, _, value = option.partition("=")
+        name = name.strip()
+        if name not in ("max", "timeout"):
+            raise ValueError(f"Unknown chat provider option {name!r} in {target!r}")
+        try:
+            overrides[name] = int(value) if name == "max" else float(value)
+        except ValueError:
+            overrides[name] = 0
+        if overrides[name] <= 0:
+            raise ValueError(f"Chat provider option {name} must be a positive number in {target!r}")
+    return kind, upstream_model, overrides
+
+
+def create_provider(model: str, target: str) -> ChatProvider:
+    """
+    Build the provider for a model.
+    
+    Args:
+        model: Model label (Model enum value)
+        target: "mock" or "openai[:upstream model name]", optionally with
+            per-model ";max=" and ";timeout=" overrides (see parse_target)
+    
+    Raises:
+        ValueError: If the provider kind or an option is unknown
+    """
+    kind, upstream_model, overrides = parse_target(target)
+    max_concurrency = int(overrides.get("max", CHAT_MAX_CONCURRENCY))
+    if kind == "mock":
+        return MockProvider(model, max_concurrency, CHAT_QUEUE_TIMEOUT)
+    if kind == "openai":
+        return OpenAICompatibleProvider(
+            model,
+            max_concurrency,
+            CHAT_QUEUE_TIMEOUT,
+            client=get_http_client(),
+            base_url=OPENAI_BASE_URL,
+            upstream_model=upstream_model or None,
+            api_key=OPENAI_API_KEY,
+            read_timeout=overrides.get("timeout"),
+        )
+    raise ValueError(f"Unknown chat provider for {model}: {target}")
+
+
+def get_provider(model: str) -> ChatProvider:
+    """Return the provider serving a model (mock unless set in CHAT_PROVIDERS)."""
+    provider = _providers.get(model)
+    if provider is None:
+        provider = _providers[model] = create_provider(model, CHAT_PROVIDERS.get(model, "mock"))
+    return provider
+
+
+def provider_stats() -> Dict[str, dict]:
+    """Active streams and limits of every provider created so far."""
+    return {
+        model: {**provider.stats(), "upstream": provider.describe()}
+        for model, provider in _providers.items()
+    }
+
+
+async def close_providers():
+    """Close providers and the shared HTTP client (at shutdown)."""
+    global _client
+    for provider in _providers.values():
+        await provider.close()
+    _providers.clear()
+    if _client is not None:
+        await _client.aclose()
+        _client = None
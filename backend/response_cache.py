@@ -0,0 +1,305 @@
+"""
+Cache of complete /result responses, keyed by model and normalized prompt.
+
+A response is stored as the list of frames the provider streamed, so a hit
+is replayed with the same framing, without waiting for generation and
+without taking one of the model's concurrency slots. Entries live in a
+bounded in-memory LRU with a time-to-live and can be mirrored to SQLite so
+they survive restarts. Only responses that streamed to completion are
+stored; a disconnect or upstream error leaves the cache untouched.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import AsyncIterator, List, Optional
+
+from backend import metrics
+from backend.config import (
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_TTL,
+    RESPONSE_CACHE_PERSIST,
+    RESPONSE_CACHE_DB_PATH,
+)
+
+# Bump when the key or the stored format changes so old entries are not reused
+CACHE_VERSION = 1
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prompt(text: str) -> str:
+    """
+    Canonical form of a prompt for cache keys.
+    
+    Applies Unicode NFKC normalization, collapses runs of whitespace to one
+    space and trims the ends; case and punctuation are kept, since they can
+    change a model's answer.
+    """
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def response_key(model: str, prompt: str, context: Optional[dict] = None) -> str:
+    """
+    Derive the cache key for a chat request.
+    
+    Args:
+        model: Model label
+        prompt: User input (normalized here)
+        context: Anything else that changes the response, e.g. the provider
+            and upstream model serving the label
+    
+    Returns:
+        Hex digest identifying the response
+    """
+    payload = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "model": model,
+            "prompt": normalize_prompt(prompt),
+            "context": context or {},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Entry:
+    """A cached response: its frames, size in bytes and creation time."""
+    
+    __slots__ = ("model", "frames", "size", "created_at")
+    
+    def __init__(self, model: str, frames: List[str], created_at: float):
+        self.model = model
+        self.frames = frames
+        self.size = sum(len(frame.encode("utf-8")) for frame in frames)
+        self.created_at = created_at
+
+
+class ResponseCache:
+    """
+    Bounded LRU of streamed responses with a time-to-live.
+    
+    The least recently used entries are evicted once either max_entries or
+    max_bytes is exceeded. With a db_path, stores and evictions are mirrored
+    to SQLite and unexpired entries are loaded back on start.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        ttl: float = RESPONSE_CACHE_TTL,
+        db_path: Optional[Path] = None
+    ):
+        """
+        Args:
+            max_entries: Responses kept at most
+            max_bytes: Total UTF-8 size of the kept responses at most
+            ttl: Seconds an entry is served (0 = until evicted)
+            db_path: SQLite file to persist entries in (None = memory only)
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path is not None:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+            with self._lock, self._conn:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        model TEXT NOT NULL,
+                        frames TEXT NOT NULL,
+                        created_at REAL NOT NULL
+                    )
+                    """
+                )
+            self._load()
+    
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return self.ttl > 0 and now - entry.created_at > self.ttl
+    
+    def _load(self):
+        """Read back persisted entries, newest last, dropping expired ones."""
+        now = time.time()
+        with self._lock, self._conn:
+            if self.ttl > 0:
+                self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            rows = self._conn.execute(
+                "SELECT key, model, frames, created_at FROM responses ORDER BY created_at"
+            ).fetchall()
+            for key, model, frames, created_at in rows:
+                self._insert(key, _Entry(model, json.loads(frames), created_at))
+            self._delete_rows([key for key, *_ in rows if key not in self._entries])
+            self._update_gauges()
+    
+    def get(self, key: str) -> Optional[List[str]]:
+        """
+        Return the frames of a cached response and mark it recently used.
+        
+        Returns:
+            Frames on a hit, None on a miss or an expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry, time.time()):
+                # The persisted row is purged on the next start or eviction pass
+                self._remove(key)
+                self._update_gauges()
+                return None
+            self._entries.move_to_end(key)
+            return entry.frames
+    
+    def put(self, key: str, model: str, frames: List[str]):
+        """
+        Store a complete response, evicting least recently used entries.
+        
+        Responses larger than max_bytes on their own are not cached.
+        Blocks on SQLite when persistence is on; call from a thread.
+        """
+        entry = _Entry(model, list(frames), time.time())
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            evicted = self._insert(key, entry)
+            self._update_gauges()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO responses (key, model, frames, created_at)"
+                        " VALUES (?, ?, ?, ?)",
+                        (key, model, json.dumps(entry.frames), entry.created_at),
+                    )
+                    self._delete_rows(evicted)
+    
+    def clear(self):
+        """Drop every entry, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._update_gauges()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM responses")
+    
+    def _insert(self, key: str, entry: _Entry) -> List[str]:
+        """Add an entry and evict to the bounds (caller holds the lock)."""
+        self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        evicted = []
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            old_key, _ = next(iter(self._entries.items()))
+            self._remove(old_key)
+            evicted.append(old_key)
+        return evicted
+    
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+    
+    def _delete_rows(self, keys: List[str]):
+        if self._conn is not None and keys:
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in keys])
+    
+    def _update_gauges(self):
+        metrics.RESPONSE_CACHE_ENTRIES.set(len(self._entries))
+        metrics.RESPONSE_CACHE_BYTES.set(self._bytes)
+    
+    def stats(self) -> dict:
+        """Size and bounds, with hit ratio per model since start."""
+        with self._lock:
+            entries, size = len(self._entries), self._bytes
+        models = {}
+        for (model, result), count in metrics.RESPONSE_CACHE_REQUESTS_TOTAL.items():
+            models.setdefault(model, {"hit": 0, "miss": 0, "bypass": 0})[result] = int(count)
+        for model, counts in models.items():
+            lookups = counts["hit"] + counts["miss"]
+            counts["hit_ratio"] = round(counts["hit"] / lookups, 4) if lookups else None
+            counts["bytes_saved"] = int(metrics.RESPONSE_CACHE_BYTES_SAVED_TOTAL.value(model=model))
+        return {
+            "enabled": True,
+            "persistent": self._conn is not None,
+            "entries": entries,
+            "bytes": size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "models": models,
+        }
+    
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+
+async def replay(frames: List[str]) -> AsyncIterator[str]:
+    """Stream cached frames back as they were sent, without pacing."""
+    for frame in frames:
+        yield frame
+        await asyncio.sleep(0)  # Let other streams run between frames
+
+
+async def record(
+    frames: AsyncIterator[str],
+    cache: ResponseCache,
+    key: str,
+    model: str
+) -> AsyncIterator[str]:
+    """
+    Pass a provider stream through and cache it once it completes.
+    
+    Nothing is stored if the stream fails or the consumer stops early.
+    """
+    sent: List[str] = []
+    async for frame in frames:
+        sent.append(frame)
+        yield frame
+    await asyncio.to_thread(cache.put, key, model, sent)
+
+
+def count_lookup(model: str, result: str, saved_bytes: int = 0):
+    """Record a cache hit, miss or bypass (and the bytes a hit did not regenerate)."""
+    metrics.RESPONSE_CACHE_REQUESTS_TOTAL.inc(model=model, result=result)
+    if saved_bytes:
+        metrics.RESPONSE_CACHE_BYTES_SAVED_TOTAL.inc(saved_bytes, model=model)
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide response cache, or None when RESPONSE_CACHE_ENABLED is off."""
+    global _cache
+    if _cache is None and RESPONSE_CACHE_ENABLED:
+        _cache = ResponseCache(db_path=RESPONSE_CACHE_DB_PATH if RESPONSE_CACHE_PERSIST else None)
+    return _cache
+
+
+def close_response_cache():
+    """Close the cache's database (at shutdown)."""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
@@ -0,0 +1,281 @@
+"""
+Full-text BM25 search over every processed chunk.
+
+The inverted index lives in SQLite: for every (term, document) pair one row
+holds the row IDs of the chunks containing the term and its frequency in
+each, packed as arrays. Terms in header titles (own and parents) count
+HEADERS_WEIGHT times. A document is re-indexed in one transaction whenever
+the pipeline writes its chunks, and skipped when its chunks are unchanged.
+
+Queries score every posting of their terms at once with numpy, so common
+terms matching most of the corpus still rank in milliseconds.
+"""
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.config import CHUNKS_DIR, SEARCH_DB_PATH
+from backend.converters import iter_chunk_file
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Relative weight of terms in header titles versus body text
+HEADERS_WEIGHT = 2.0
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-cased word terms."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _headers(chunk: Dict[str, Any]) -> str:
+    titles = [parent["title"] for parent in chunk["parents"]]
+    if chunk["self"]["title"]:
+        titles.append(chunk["self"]["title"])
+    return "\n".join(titles)
+
+
+class SearchIndex:
+    """SQLite-backed inverted index of chunk text and header titles, ranked by BM25."""
+    
+    def __init__(self, db_path: Path = SEARCH_DB_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        # (chunk length by row ID, chunk count, average length), rebuilt after changes
+        self._lengths: Optional[Tuple[np.ndarray, int, float]] = None
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS documents (
+                    doc TEXT PRIMARY KEY,
+                    version TEXT NOT NULL,
+                    chunk_count INTEGER NOT NULL,
+                    indexed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chunks (
+                    id INTEGER PRIMARY KEY,
+                    chunk_id TEXT NOT NULL,
+                    doc TEXT NOT NULL,
+                    length REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS chunks_doc ON chunks (doc)")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT NOT NULL,
+                    doc TEXT NOT NULL,
+                    ids BLOB NOT NULL,
+                    tfs BLOB NOT NULL,
+                    PRIMARY KEY (term, doc)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc)")
+    
+    def _delete(self, doc: str):
+        """Remove a document's rows (caller holds the lock and a transaction)."""
+        self._conn.execute("DELETE FROM postings WHERE doc = ?", (doc,))
+        self._conn.execute("DELETE FROM chunks WHERE doc = ?", (doc,))
+        self._conn.execute("DELETE FROM documents WHERE doc = ?", (doc,))
+        self._lengths = None
+    
+    def index_document(self, doc: str, chunks_path: Path, version: str) -> bool:
+        """
+        (Re-)index a document's chunks unless this version is already indexed.
+        
+        Args:
+            doc: Document name (chunks file stem)
+            chunks_path: Chunks JSON file
+            version: Identifier of the chunks content (e.g. the chunks cache key)
+        
+        Returns:
+            True if the document was (re-)indexed, False if it was up to date
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM documents WHERE doc = ?", (doc,)
+            ).fetchone()
+            if row is not None and row[0] == version:
+                return False
+            with self._conn:
+                self._delete(doc)
+                postings: Dict[str, Tuple[List[int], List[float]]] = {}
+                count = 0
+                for chunk in iter_chunk_file(chunks_path):
+                    text_terms = tokenize(chunk["text"])
+                    header_terms = tokenize(_headers(chunk))
+                    frequencies: Dict[str, float] = Counter(text_terms)
+                    for term in header_terms:
+                        frequencies[term] = frequencies.get(term, 0) + HEADERS_WEIGHT
+                    cursor = self._conn.execute(
+                        "INSERT INTO chunks (chunk_id, doc, length) VALUES (?, ?, ?)",
+                        (chunk["chunk_id"], doc, len(text_terms) + HEADERS_WEIGHT * len(header_terms)),
+                    )
+                    for term, frequency in frequencies.items():
+                        ids, tfs = postings.setdefault(term, ([], []))
+                        ids.append(cursor.lastrowid)
+                        tfs.append(frequency)
+                    count += 1
+                self._conn.executemany(
+                    "INSERT INTO postings (term, doc, ids, tfs) VALUES (?, ?, ?, ?)",
+                    (
+                        (
+                            term,
+                            doc,
+                            np.asarray(ids, dtype=np.int64).tobytes(),
+                            np.asarray(tfs, dtype=np.float32).tobytes(),
+                        )
+                        for term, (ids, tfs) in postings.items()
+                    ),
+                )
+                self._conn.execute(
+                    "INSERT INTO documents (doc, version, chunk_count, indexed_at) VALUES (?, ?, ?, ?)",
+                    (doc, version, count, time.time()),
+                )
+        return True
+    
+    def remove_document(self, doc: str):
+        """Drop a document from the index."""
+        with self._lock, self._conn:
+            self._delete(doc)
+    
+    def sync(self, chunks_dir: Path = CHUNKS_DIR) -> int:
+        """
+        Index chunk files the index has never seen and drop documents whose file is gone.
+        
+        Returns:
+            Number of documents added
+        """
+        with self._lock:
+            indexed = {row[0] for row in self._conn.execute("SELECT doc FROM documents")}
+        present = {}
+        for chunks_path in chunks_dir.glob("*.json"):
+            stem = chunks_path.stem
+            # Skip chunk store indexes and compare-mode candidate outputs
+            if stem.endswith(".idx") or stem.endswith(".fast"):
+                continue
+            present[stem] = chunks_path
+        
+        for doc in indexed - present.keys():
+            self.remove_document(doc)
+        added = 0
+        for doc in present.keys() - indexed:
+            stat = present[doc].stat()
+            try:
+                self.index_document(doc, present[doc], f"file:{stat.st_size}:{stat.st_mtime_ns}")
+                added += 1
+            except (ValueError, KeyError):
+                continue  # Not a chunks file
+        return added
+    
+    def _chunk_lengths(self) -> Tuple[np.ndarray, int, float]:
+        """Chunk lengths by row ID, chunk count and average length (caller holds the lock)."""
+        if self._lengths is None:
+            rows = self._conn.execute("SELECT id, length FROM chunks").fetchall()
+            lengths = np.zeros(max((row_id for row_id, _ in rows), default=0) + 1, dtype=np.float32)
+            if rows:
+                row_ids, values = zip(*rows)
+                lengths[list(row_ids)] = values
+            average = float(lengths.sum()) / len(rows) if rows else 0.0
+            self._lengths = (lengths, len(rows), average or 1.0)
+        return self._lengths
+    
+    def search(self, query: str, limit: int = 10, doc: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Rank chunks against a free-text query with BM25.
+        
+        Args:
+            query: Free text; chunks matching any of its terms are ranked
+            limit: Maximum number of results
+            doc: Restrict results to one document
+        
+        Returns:
+            List of {"chunk_id", "document", "score"}, best first (higher is better)
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit < 1:
+            return []
+        
+        with self._lock:
+            lengths, total, average = self._chunk_lengths()
+            ids_parts, score_parts = [], []
+            for term in terms:
+                rows = self._conn.execute(
+                    "SELECT doc, ids, tfs FROM postings WHERE term = ?", (term,)
+                ).fetchall()
+                # Document frequency always spans the whole corpus, so scores
+                # do not depend on the document filter
+                df = sum(len(ids) for _, ids, _ in rows) // 8
+                rows = [row for row in rows if doc is None or row[0] == doc]
+                if not rows:
+                    continue
+                ids = np.concatenate([np.frombuffer(ids, dtype=np.int64) for _, ids, _ in rows])
+                tfs = np.concatenate([np.frombuffer(tfs, dtype=np.float32) for _, _, tfs in rows])
+                idf = np.log1p((total - df + 0.5) / (df + 0.5))
+                norm = K1 * (1.0 - B + B * lengths[ids] / average)
+                ids_parts.append(ids)
+                score_parts.append(idf * tfs * (K1 + 1.0) / (tfs + norm))
+            if not ids_parts:
+                return []
+            
+            scores = np.bincount(
+                np.concatenate(ids_parts),
+                weights=np.concatenate(score_parts),
+                minlength=len(lengths),
+            )
+            matched = np.flatnonzero(scores)
+            if len(matched) > limit:
+                matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+            top = matched[np.argsort(-scores[matched], kind="stable")].tolist()
+            
+            placeholders = ",".join("?" * len(top))
+            found = {
+                row_id: (chunk_id, document)
+                for row_id, chunk_id, document in self._conn.execute(
+                    f"SELECT id, chunk_id, doc FROM chunks WHERE id IN ({placeholders})", top
+                )
+            }
+        return [
+            {"chunk_id": found[row_id][0], "document": found[row_id][1], "score": float(scores[row_id])}
+            for row_id in top
+        ]
+    
+    def stats(self) -> dict:
+        """Indexed document and chunk counts."""
+        with self._lock:
+            documents, chunks = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(chunk_count), 0) FROM documents"
+            ).fetchone()
+        return {"documents": documents, "chunks": chunks}
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_index: SearchIndex | None = None
+
+
+def get_search_index() -> SearchIndex:
+    """Return the process-wide search index."""
+    global _index
+    if _index is None:
+        _index = SearchIndex()
+    return _index
@@ -0,0 +1,226 @@
+"""
+Resumable Server-Sent Events for /result.
+
+In SSE mode a response is generated by a task of its own rather than by the
+request: frames are appended to a Generation buffer and every connection
+reads from that buffer. Each frame is sent as an event with the ID
+"<generation>:<seq>", so a client whose connection drops reconnects with
+Last-Event-ID and receives only the frames after it. Generations keep
+running for SSE_RESUME_GRACE seconds without a reader, and finished ones
+stay resumable for SSE_RESUME_TTL seconds.
+"""
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+from backend import metrics
+from backend.config import SSE_RESUME_TTL, SSE_RESUME_GRACE, SSE_RESUME_MAX_GENERATIONS
+
+logger = logging.getLogger(__name__)
+
+SSE_MEDIA_TYPE = "text/event-stream"
+# Keep proxies from buffering or caching the event stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+RETRY_MS = 1000  # Reconnect delay suggested to EventSource clients
+
+
+def sse_event(data: dict, event: Optional[str] = None, event_id: Optional[str] = None) -> str:
+    """
+    Format one event. Data is JSON (ASCII-escaped), so it is always a single
+    line whatever the text contains.
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def parse_event_id(event_id: str) -> Tuple[str, int]:
+    """
+    Split a Last-Event-ID into (generation ID, frames already received).
+    
+    Raises:
+        ValueError: If the ID is not "<generation>:<seq>"
+    """
+    generation_id, _, seq = event_id.strip().rpartition(":")
+    if not generation_id or not seq.isdigit():
+        raise ValueError(f"Malformed Last-Event-ID: {event_id!r}")
+    return generation_id, int(seq)
+
+
+class Generation:
+    """
+    Frames of one response as they are produced, readable by any number of
+    connections from any position.
+    """
+    
+    def __init__(self, generation_id: str, model: str):
+        self.id = generation_id
+        self.model = model
+        self.frames: List[str] = []
+        self.done = False
+        self.error: Optional[str] = None
+        self.finished_at: Optional[float] = None
+        self.readers = 0
+        self.detached_at = time.monotonic()
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+    
+    async def produce(self, frames: AsyncIterator[str], cleanup: Callable[[], Awaitable[None]]):
+        """
+        Drain the response stream into the buffer (run as a task).
+        
+        Stops early once no client has been attached for SSE_RESUME_GRACE
+        seconds. cleanup() runs in every case (frees the provider slot,
+        saves the transcript).
+        """
+        try:
+            async for frame in frames:
+                async with self._changed:
+                    self.frames.append(frame)
+                    self._changed.notify_all()
+                if self.readers == 0 and time.monotonic() - self.detached_at > SSE_RESUME_GRACE:
+                    self.error = "Abandoned: no client reconnected"
+                    break
+        except asyncio.CancelledError:
+            self.error = "Cancelled"
+            raise
+        except Exception as e:
+            logger.warning("Generation %s failed: %s", self.id, e)
+            self.error = str(e)
+        finally:
+            self.done = True
+            self.finished_at = time.monotonic()
+            async with self._changed:
+                self._changed.notify_all()
+            await cleanup()
+    
+    async def events(self, after: int = 0) -> AsyncIterator[str]:
+        """
+        Events for one connection: a start event, every frame after `after`
+        (waiting for new ones), then done or error.
+        """
+        self.readers += 1
+        try:
+            yield f"retry: {RETRY_MS}\n" + sse_event(
+                {"generation": self.id, "resumed_from": after}, event="start", event_id=f"{self.id}:{after}"
+            )
+            seq = after
+            while True:
+                async with self._changed:
+                    while seq >= len(self.frames) and not self.done:
+                        await self._changed.wait()
+                    pending = self.frames[seq:]
+                    done = self.done
+                for frame in pending:
+                    seq += 1
+                    yield sse_event({"text": frame}, event_id=f"{self.id}:{seq}")
+                if done and seq >= len(self.frames):
+                    break
+            if self.error is not None:
+                yield sse_event({"detail": self.error}, event="error")
+            else:
+                yield sse_event({"generation": self.id, "frames": seq}, event="done")
+        finally:
+            self.readers -= 1
+            if self.readers == 0:
+                self.detached_at = time.monotonic()
+
+
+class GenerationBuffer:
+    """
+    Generations by ID: all in-progress ones plus recently finished ones.
+    
+    Finished generations are dropped after ttl seconds, and the oldest
+    finished ones first once there are more than max_generations.
+    """
+    
+    def __init__(self, ttl: float = SSE_RESUME_TTL, max_generations: int = SSE_RESUME_MAX_GENERATIONS):
+        self.ttl = ttl
+        self.max_generations = max(1, max_generations)
+        self._generations: "OrderedDict[str, Generation]" = OrderedDict()
+    
+    def _sweep(self):
+        now = time.monotonic()
+        finished = [g for g in self._generations.values() if g.done]
+        excess = len(self._generations) - self.max_generations
+        for generation in finished:
+            if now - generation.finished_at > self.ttl or excess > 0:
+                del self._generations[generation.id]
+                excess -= 1
+    
+    def start(
+        self,
+        model: str,
+        frames: AsyncIterator[str],
+        cleanup: Callable[[], Awaitable[None]]
+    ) -> Generation:
+        """
+        Start generating a response in the background.
+        
+        Args:
+            model: Model label
+            frames: Response stream
+            cleanup: Awaited when the stream ends, fails or is abandoned
+        """
+        self._sweep()
+        generation = Generation(uuid.uuid4().hex[:16], model)
+        self._generations[generation.id] = generation
+        generation.task = asyncio.create_task(generation.produce(frames, cleanup))
+        return generation
+    
+    def resume(self, last_event_id: str) -> Tuple[Generation, int]:
+        """
+        Find the generation a reconnecting client was reading.
+        
+        Returns:
+            Tuple of (generation, frames the client already has)
+        
+        Raises:
+            KeyError: If the generation is unknown or has expired
+            ValueError: If the ID is malformed or ahead of the generation
+        """
+        self._sweep()
+        generation_id, seq = parse_event_id(last_event_id)
+        generation = self._generations.get(generation_id)
+        if generation is None:
+            metrics.SSE_RESUMES_TOTAL.inc(outcome="expired")
+            raise KeyError(generation_id)
+        if seq > len(generation.frames):
+            raise ValueError(f"Last-Event-ID {last_event_id!r} is ahead of the generation")
+        metrics.SSE_RESUMES_TOTAL.inc(outcome="resumed")
+        return generation, seq
+    
+    def stats(self) -> dict:
+        return {
+            "generations": len(self._generations),
+            "in_progress": sum(1 for g in self._generations.values() if not g.done),
+            "ttl": self.ttl,
+            "max_generations": self.max_generations,
+        }
+    
+    async def close(self):
+        """Cancel generations still running (at shutdown)."""
+        tasks = [g.task for g in self._generations.values() if g.task is not None and not g.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._generations.clear()
+
+
+_buffer: Optional[GenerationBuffer] = None
+
+
+def get_generation_buffer() -> GenerationBuffer:
+    """Return the process-wide generation buffer."""
+    global _buffer
+    if _buffer is None:
+        _buffer = GenerationBuffer()
+    return _buffer
@@ -0,0 +1,170 @@
+"""
+Async token streaming for the chat endpoint.
+
+Streams are async generators, so thousands of them share the event loop
+instead of each holding a threadpool thread. Small writes are coalesced into
+frames, a slow client only slows its own generator (the next frame is not
+produced until the previous one has been sent), and a client disconnect
+cancels generation at its next await.
+"""
+import asyncio
+import re
+import time
+from typing import AsyncIterator, List
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from backend import metrics
+from backend.config import (
+    STREAM_GRANULARITY,
+    STREAM_TOKEN_DELAY,
+    STREAM_FRAME_INTERVAL,
+    STREAM_FRAME_CHARS,
+)
+
+_WORD_RE = re.compile(r"\S+\s*|\s+")
+
+
+def split_tokens(text: str, granularity: str = STREAM_GRANULARITY) -> List[str]:
+    """
+    Split text into stream tokens; joining them gives the text back.
+    
+    Args:
+        text: Text to stream
+        granularity: "char" (one character per token) or "word" (a word and
+            the whitespace after it)
+    
+    Raises:
+        ValueError: If the granularity is unknown
+    """
+    if granularity == "char":
+        return list(text)
+    if granularity == "word":
+        return _WORD_RE.findall(text)
+    raise ValueError(f"Unknown stream granularity: {granularity}")
+
+
+async def paced_tokens(
+    tokens: List[str],
+    delay: float = STREAM_TOKEN_DELAY,
+    frame_interval: float = STREAM_FRAME_INTERVAL
+) -> AsyncIterator[str]:
+    """
+    Emit tokens on the schedule of a model generating one every `delay` seconds.
+    
+    The first token is emitted at once. After that the generator wakes at most
+    once per frame_interval and yields every token that has come due as one
+    piece, so a stream costs one timer per frame rather than per token. A
+    client that reads slowly receives larger pieces instead of queueing them.
+    
+    Args:
+        tokens: Tokens in order
+        delay: Seconds between tokens (0 emits everything at once)
+        frame_interval: Minimum seconds between pieces after the first
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    sent = 0
+    while sent < len(tokens):
+        if delay > 0:
+            due = min(len(tokens), int((loop.time() - start) / delay) + 1)
+        else:
+            due = len(tokens)
+        if due > sent:
+            yield "".join(tokens[sent:due])
+            sent = due
+        if sent < len(tokens):
+            next_due = start + sent * delay
+            await asyncio.sleep(max(next_due - loop.time(), frame_interval))
+
+
+async def coalesce(
+    pieces: AsyncIterator[str],
+    frame_chars: int = STREAM_FRAME_CHARS,
+    frame_interval: float = STREAM_FRAME_INTERVAL
+) -> AsyncIterator[str]:
+    """
+    Merge small pieces of a stream into larger frames.
+    
+    The first piece is sent at once (time to first byte). Later pieces are
+    buffered until the frame holds frame_chars characters or frame_interval
+    has passed since the last frame; whatever is left is sent at the end.
+    A buffered piece waits at most until the next piece arrives.
+    
+    Args:
+        pieces: Text stream
+        frame_chars: Characters that trigger a frame
+        frame_interval: Seconds after which buffered text is sent
+    """
+    loop = asyncio.get_running_loop()
+    buffer: List[str] = []
+    size = 0
+    last_frame = None
+    async for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        now = loop.time()
+        if last_frame is None or size >= frame_chars or now - last_frame >= frame_interval:
+            yield "".join(buffer)
+            buffer, size = [], 0
+            last_frame = now
+    if buffer:
+        yield "".join(buffer)
+
+
+def stream_text(
+    text: str,
+    granularity: str = STREAM_GRANULARITY,
+    delay: float = STREAM_TOKEN_DELAY
+) -> AsyncIterator[str]:
+    """Stream text token by token at a model-like pace, in coalesced frames."""
+    return coalesce(paced_tokens(split_tokens(text, granularity), delay))
+
+
+async def metered_stream(frames: AsyncIterator[str], model: str, start: float) -> AsyncIterator[str]:
+    """
+    Pass a text stream through, recording first-byte time, throughput, open
+    streams and client disconnects.
+    
+    Args:
+        frames: Text stream
+        model: Model label for the metrics
+        start: time.perf_counter() when the request arrived
+    """
+    first_byte = None
+    sent = 0
+    metrics.STREAMS_ACTIVE.inc()
+    try:
+        async for frame in frames:
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+                metrics.STREAM_FIRST_BYTE_SECONDS.observe(first_byte, model=model)
+            sent += len(frame.encode("utf-8"))
+            yield frame
+    except (asyncio.CancelledError, GeneratorExit):
+        # Cancelled by the server when the client went away
+        metrics.STREAM_DISCONNECTS_TOTAL.inc(model=model)
+        raise
+    finally:
+        metrics.STREAMS_ACTIVE.dec()
+        duration = time.perf_counter() - start
+        metrics.STREAM_DURATION_SECONDS.observe(duration, model=model)
+        metrics.STREAM_BYTES_TOTAL.inc(sent, model=model)
+        if duration > 0:
+            metrics.STREAM_BYTES_PER_SECOND.observe(sent / duration, model=model)
+
+
+class DisconnectAwareStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that always watches for the client disconnecting.
+    
+    Starlette only listens for http.disconnect on servers advertising ASGI
+    spec < 2.4 and otherwise notices a gone client at the next failed write;
+    listening on every server cancels generation as soon as the client leaves.
+    """
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            scope = {**scope, "asgi": {**scope.get("asgi", {}), "spec_version": "2.3"}}
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,352 @@
+"""
+Server-side conversation history for /result, keyed by threadId.
+
+Every message is appended to SQLite, so clients page through history with
+GET /threads/{thread_id}/messages instead of holding it all. Prompts are
+built from a bounded context window: the most recent messages verbatim
+(at most THREAD_CONTEXT_MESSAGES and THREAD_CONTEXT_CHARS) plus a short
+extractive summary of everything older. The windows of recently used
+threads are kept in an LRU, so a busy thread never reads its history back
+from disk and memory stays bounded however long conversations get.
+"""
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from backend.config import (
+    THREADS_DB_PATH,
+    THREAD_CACHE_MAX_THREADS,
+    THREAD_CONTEXT_MESSAGES,
+    THREAD_CONTEXT_CHARS,
+    THREAD_SUMMARY_CHARS,
+)
+
+Message = Dict[str, object]
+
+_SENTENCE_RE = re.compile(r"(.+?[.!?])(\s|$)", re.S)
+SUMMARY_LINE_CHARS = 200  # Longest excerpt of one message kept in a summary
+
+
+def summary_line(message: Message) -> str:
+    """
+    One line of the running summary for a message leaving the context window.
+    
+    Keeps the first sentence (at most SUMMARY_LINE_CHARS characters) and who
+    said it; no model is called.
+    """
+    text = " ".join(str(message["content"]).split())
+    match = _SENTENCE_RE.match(text)
+    excerpt = match.group(1) if match else text
+    if len(excerpt) > SUMMARY_LINE_CHARS:
+        excerpt = excerpt[:SUMMARY_LINE_CHARS - 1].rstrip() + "…"
+    speaker = "User" if message["role"] == "user" else (message.get("model") or "Assistant")
+    return f"{speaker}: {excerpt}"
+
+
+def fold_summary(summary: str, message: Message, max_chars: int = THREAD_SUMMARY_CHARS) -> str:
+    """
+    Add a message to a summary, dropping the oldest lines beyond max_chars.
+    """
+    lines = summary.splitlines() if summary else []
+    lines.append(summary_line(message))
+    while len(lines) > 1 and sum(len(line) + 1 for line in lines) > max_chars:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+class _Window:
+    """A thread's context window: recent messages plus the summary of older ones."""
+    
+    __slots__ = ("recent", "chars", "summary", "summarized_upto")
+    
+    def __init__(self, recent: List[Message], summary: str, summarized_upto: int):
+        self.recent: Deque[Message] = deque(recent)
+        self.chars = sum(len(str(message["content"])) for message in recent)
+        self.summary = summary
+        self.summarized_upto = summarized_upto
+
+
+class ThreadStore:
+    """
+    SQLite message log per thread with an LRU of hot context windows.
+    """
+    
+    def __init__(
+        self,
+        db_path: Path = THREADS_DB_PATH,
+        max_threads: int = THREAD_CACHE_MAX_THREADS,
+        context_messages: int = THREAD_CONTEXT_MESSAGES,
+        context_chars: int = THREAD_CONTEXT_CHARS
+    ):
+        """
+        Args:
+            db_path: SQLite file holding the messages
+            max_threads: Context windows kept in memory
+            context_messages: Most recent messages sent verbatim
+            context_chars: Most characters of recent messages sent verbatim
+        """
+        self.max_threads = max(1, max_threads)
+        self.context_messages = max(1, context_messages)
+        self.context_chars = max(1, context_chars)
+        self._lock = threading.Lock()
+        self._windows: "OrderedDict[str, _Window]" = OrderedDict()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")  # Two writes per chat request
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS threads (
+                    id TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL DEFAULT '',
+                    summarized_upto INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    thread_id TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    model TEXT,
+                    content TEXT NOT NULL,
+                    complete INTEGER NOT NULL DEFAULT 1,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS messages_thread_id ON messages (thread_id, id)"
+            )
+    
+    @staticmethod
+    def _message(row: sqlite3.Row) -> Message:
+        return {
+            "id": row["id"],
+            "role": row["role"],
+            "model": row["model"],
+            "content": row["content"],
+            "complete": bool(row["complete"]),
+            "created_at": row["created_at"],
+        }
+    
+    def _window(self, thread_id: str) -> _Window:
+        """Hot window of a thread, read from disk on a miss (caller holds the lock)."""
+        window = self._windows.get(thread_id)
+        if window is not None:
+            self._windows.move_to_end(thread_id)
+            return window
+        row = self._conn.execute(
+            "SELECT summary, summarized_upto FROM threads WHERE id = ?", (thread_id,)
+        ).fetchone()
+        summary, summarized_upto = (row["summary"], row["summarized_upto"]) if row else ("", 0)
+        rows = self._conn.execute(
+            "SELECT * FROM messages WHERE thread_id = ? AND id > ? ORDER BY id DESC LIMIT ?",
+            (thread_id, summarized_upto, self.context_messages),
+        ).fetchall()
+        window = _Window([self._message(row) for row in reversed(rows)], summary, summarized_upto)
+        # The last rows can exceed context_chars; the fold is saved with the next append
+        self._trim(window)
+        self._windows[thread_id] = window
+        while len(self._windows) > self.max_threads:
+            self._windows.popitem(last=False)
+        return window
+    
+    def _trim(self, window: _Window):
+        """Fold the oldest messages into the summary until the window fits its bounds."""
+        while len(window.recent) > 1 and (
+            len(window.recent) > self.context_messages or window.chars > self.context_chars
+        ):
+            dropped = window.recent.popleft()
+            window.chars -= len(str(dropped["content"]))
+            window.summary = fold_summary(window.summary, dropped)
+            window.summarized_upto = dropped["id"]
+    
+    def append(
+        self,
+        thread_id: str,
+        role: str,
+        content: str,
+        model: Optional[str] = None,
+        complete: bool = True
+    ) -> Message:
+        """
+        Add a message to a thread, creating the thread on its first message.
+        
+        Messages pushed out of the context window are folded into the
+        thread's summary.
+        
+        Args:
+            thread_id: Conversation thread ID
+            role: "user" or "assistant"
+            content: Message text
+            model: Model that wrote an assistant message
+            complete: False for a reply cut short (client disconnected)
+        
+        Returns:
+            The stored message
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            window = self._window(thread_id)
+            cursor = self._conn.execute(
+                "INSERT INTO messages (thread_id, role, model, content, complete, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (thread_id, role, model, content, int(complete), now),
+            )
+            message = {
+                "id": cursor.lastrowid,
+                "role": role,
+                "model": model,
+                "content": content,
+                "complete": complete,
+                "created_at": now,
+            }
+            window.recent.append(message)
+            window.chars += len(content)
+            self._trim(window)
+            self._conn.execute(
+                "INSERT INTO threads (id, summary, summarized_upto, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET summary = excluded.summary,"
+                " summarized_upto = excluded.summarized_upto, updated_at = excluded.updated_at",
+                (thread_id, window.summary, window.summarized_upto, now, now),
+            )
+        return message
+    
+    def context(self, thread_id: str) -> List[Dict[str, str]]:
+        """
+        Prompt history of a thread in chat-completions form.
+        
+        Returns:
+            A system message summarizing older turns (if any), then the
+            recent messages oldest first, as {"role", "content"} dicts
+        """
+        with self._lock:
+            window = self._window(thread_id)
+            history = []
+            if window.summary:
+                history.append({
+                    "role": "system",
+                    "content": "Summary of the earlier conversation:\n" + window.summary,
+                })
+            history.extend(
+                {"role": str(message["role"]), "content": str(message["content"])}
+                for message in window.recent
+            )
+        return history
+    
+    def messages(
+        self,
+        thread_id: str,
+        before: Optional[int] = None,
+        limit: int = 50
+    ) -> Tuple[List[Message], Optional[int]]:
+        """
+        One page of a thread's messages, newest page first.
+        
+        Args:
+            thread_id: Conversation thread ID
+            before: Only messages with a smaller ID (the previous page's cursor)
+            limit: Messages per page
+        
+        Returns:
+            Tuple of (messages oldest first, cursor for the next older page
+            or None when this page reaches the start of the thread)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM messages WHERE thread_id = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                (thread_id, before if before is not None else 2 ** 63 - 1, limit + 1),
+            ).fetchall()
+        more = len(rows) > limit
+        page = [self._message(row) for row in reversed(rows[:limit])]
+        return page, (page[0]["id"] if more else None)
+    
+    def exists(self, thread_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM threads WHERE id = ?", (thread_id,)
+            ).fetchone() is not None
+    
+    def delete(self, thread_id: str) -> bool:
+        """
+        Delete a thread and its messages.
+        
+        Returns:
+            False if the thread did not exist
+        """
+        with self._lock, self._conn:
+            self._windows.pop(thread_id, None)
+            self._conn.execute("DELETE FROM messages WHERE thread_id = ?", (thread_id,))
+            return self._conn.execute(
+                "DELETE FROM threads WHERE id = ?", (thread_id,)
+            ).rowcount > 0
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hot_threads": len(self._windows),
+                "max_threads": self.max_threads,
+                "context_messages": self.context_messages,
+                "context_chars": self.context_chars,
+            }
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class Transcript:
+    """
+    Collects a streamed reply so it can be saved to its thread once the
+    response has ended, including replies cut short by a disconnect.
+    """
+    
+    def __init__(self, store: ThreadStore, thread_id: str, model: str):
+        self.store = store
+        self.thread_id = thread_id
+        self.model = model
+        self.parts: List[str] = []
+        self.complete = False
+    
+    async def tee(self, frames: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Pass frames through, keeping a copy."""
+        async for frame in frames:
+            self.parts.append(frame)
+            yield frame
+        self.complete = True
+    
+    async def save(self):
+        """Append the reply (or the part that was sent) to the thread."""
+        if self.parts or self.complete:
+            await asyncio.to_thread(
+                self.store.append, self.thread_id, "assistant", "".join(self.parts), self.model, self.complete
+            )
+
+
+_store: Optional[ThreadStore] = None
+
+
+def get_thread_store() -> ThreadStore:
+    """Return the process-wide thread store."""
+    global _store
+    if _store is None:
+        _store = ThreadStore()
+    return _store
+
+
+def close_thread_store():
+    """Close the thread store's database (at shutdown)."""
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
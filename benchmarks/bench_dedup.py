@@ -0,0 +1,116 @@
+"""
+Benchmark near-duplicate detection as the corpus grows.
+
+Builds synthetic chunk files from the words of data/markdown/*.md: each
+document is either fresh (every chunk is words drawn at random from the
+sources, so it is unlike the corpus) or a revision of an earlier document (a
+few words changed per chunk). Documents are indexed in order and the time
+per chunk is reported for each slice of the corpus, together with how many
+revision chunks were flagged and how many fresh chunks were wrongly flagged.
+
+Usage:
+    uv run python -m benchmarks.bench_dedup --chunks 50000 --revision-rate 0.3
+"""
+import argparse
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from backend.config import MARKDOWN_DIR
+from backend.converters.markdown_to_chunks import ChunkFileWriter, chunk_id_for
+from backend.dedup import DedupIndex
+
+_WORD_RE = re.compile(r"\S+")
+
+
+def mutate(text: str, rng: random.Random, edits: int) -> str:
+    """Replace `edits` random words of a text with random tokens."""
+    words = _WORD_RE.findall(text)
+    for _ in range(min(edits, len(words))):
+        words[rng.randrange(len(words))] = f"w{rng.randrange(10**9)}"
+    return " ".join(words)
+
+
+def write_document(path: Path, doc: str, texts: list[str]):
+    with ChunkFileWriter(path) as writer:
+        for ordinal, text in enumerate(texts):
+            writer.write({
+                "chunk_id": chunk_id_for(doc, (), ordinal),
+                "self": {"header": None, "title": None},
+                "parents": [],
+                "text": text,
+            })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("files", nargs="*", type=Path)
+    parser.add_argument("--chunks", type=int, default=50000, help="Total chunks indexed")
+    parser.add_argument("--chunks-per-doc", type=int, default=200)
+    parser.add_argument("--chunk-words", type=int, default=300, help="Words per chunk")
+    parser.add_argument("--revision-rate", type=float, default=0.3, help="Share of documents that revise an earlier one")
+    parser.add_argument("--edits", type=int, default=2, help="Words changed per section in a revision")
+    parser.add_argument("--slices", type=int, default=5, help="Corpus slices timed separately")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sources = args.files or sorted(MARKDOWN_DIR.glob("*.md"))
+    if not sources:
+        parser.error(f"No Markdown files given or found in {MARKDOWN_DIR}")
+
+    words = [word for source in sources for word in _WORD_RE.findall(source.read_text(encoding="utf-8"))]
+    if not words:
+        raise SystemExit("No words found in the source Markdown")
+
+    rng = random.Random(args.seed)
+    documents = []  # texts per document
+    revision_chunks = fresh_chunks = 0
+    flagged_revisions = false_positives = 0
+    slice_size = max(1, args.chunks // args.slices)
+    indexed = 0
+    slice_start, slice_chunks = time.perf_counter(), 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        index = DedupIndex(tmp / "dedup.db")
+        print(f"threshold {index.threshold}: {index.bands} bands x {index.rows} rows")
+        while indexed < args.chunks:
+            count = min(args.chunks_per_doc, args.chunks - indexed)
+            is_revision = bool(documents) and rng.random() < args.revision_rate
+            if is_revision:
+                base = rng.choice(documents)
+                texts = [mutate(text, rng, args.edits) for text in base[:count]]
+            else:
+                texts = [" ".join(rng.choices(words, k=args.chunk_words)) for _ in range(count)]
+            doc = f"doc{len(documents):05d}"
+            path = tmp / f"{doc}.json"
+            write_document(path, doc, texts)
+            documents.append(texts)
+
+            duplicates = index.index_document(doc, path)
+            if is_revision:
+                revision_chunks += len(texts)
+                flagged_revisions += len(duplicates)
+            else:
+                fresh_chunks += len(texts)
+                false_positives += len(duplicates)
+
+            indexed += len(texts)
+            slice_chunks += len(texts)
+            if slice_chunks >= slice_size or indexed >= args.chunks:
+                elapsed = time.perf_counter() - slice_start
+                print(f"corpus {indexed:>7,} chunks: {elapsed / slice_chunks * 1e6:7.1f} us/chunk")
+                slice_start, slice_chunks = time.perf_counter(), 0
+
+        print(index.stats())
+        index.close()
+
+    if revision_chunks:
+        print(f"revision chunks flagged: {flagged_revisions}/{revision_chunks} "
+              f"({flagged_revisions / revision_chunks:.1%})")
+    print(f"fresh chunks flagged: {false_positives}/{fresh_chunks}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark the streaming Markdown header splitter against LangChain's.
+
+For each Markdown file (repeated to simulate large exports), splits it with
+LangChain's MarkdownHeaderTextSplitter and with the streaming splitter,
+checks both produce the same sections, and reports best-of-N wall-clock time
+and peak traced memory.
+
+Usage:
+    uv run python -m benchmarks.bench_markdown_splitter --repeat 50 --runs 5
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List
+
+from langchain_text_splitters import MarkdownHeaderTextSplitter
+
+from backend.config import CHUNK_HEADERS, MARKDOWN_DIR
+from backend.converters.markdown_splitter import split_markdown_file
+
+
+def split_langchain(path: Path) -> list:
+    """Read the whole file and split it as convert_markdown_to_chunks used to."""
+    with open(path, 'r', encoding='utf-8') as f:
+        markdown_text = f.read()
+    splitter = MarkdownHeaderTextSplitter(headers_to_split_on=CHUNK_HEADERS)
+    return [(doc.page_content, doc.metadata) for doc in splitter.split_text(markdown_text)]
+
+
+def split_streaming(path: Path) -> list:
+    return [(section.text, section.metadata) for section in split_markdown_file(path, CHUNK_HEADERS)]
+
+
+def count_streaming(path: Path) -> int:
+    """Consume the streaming splitter without keeping sections, as chunking does."""
+    return sum(1 for _ in split_markdown_file(path, CHUNK_HEADERS))
+
+
+def best_time(func: Callable[[Path], object], path: Path, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(path)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def peak_memory(func: Callable[[Path], object], path: Path) -> int:
+    tracemalloc.start()
+    try:
+        func(path)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("files", nargs="*", type=Path)
+    parser.add_argument("--repeat", type=int, default=50, help="Concatenate each file this many times")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    files: List[Path] = args.files or sorted(MARKDOWN_DIR.glob("*.md"))
+    if not files:
+        parser.error(f"No Markdown files given or found in {MARKDOWN_DIR}")
+
+    print(f"{'file':<40}{'MB':>7}{'sections':>10}{'langchain s':>13}{'streaming s':>13}"
+          f"{'speedup':>9}{'langchain MB':>14}{'streaming MB':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for source in files:
+            text = source.read_text(encoding='utf-8')
+            path = Path(tmp) / source.name
+            path.write_text((text.rstrip("\n") + "\n\n") * args.repeat, encoding='utf-8')
+
+            sections = split_streaming(path)
+            if sections != split_langchain(path):
+                raise SystemExit(f"Output mismatch for {source.name}")
+
+            langchain_s = best_time(split_langchain, path, args.runs)
+            streaming_s = best_time(count_streaming, path, args.runs)
+            langchain_mb = peak_memory(split_langchain, path) / 1e6
+            streaming_mb = peak_memory(count_streaming, path) / 1e6
+            size_mb = path.stat().st_size / 1e6
+            print(f"{source.name[:39]:<40}{size_mb:>7.1f}{len(sections):>10}{langchain_s:>13.3f}"
+                  f"{streaming_s:>13.3f}{langchain_s / streaming_s:>9.2f}"
+                  f"{langchain_mb:>14.1f}{streaming_mb:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark page-sharded Docling conversion against single-process conversion.
+
+Builds a large PDF by repeating the pages of a sample PDF, then converts it
+unsharded and sharded with increasing worker counts, reporting wall-clock time
+and speedup. Worker processes are started and warmed before timing so model
+loading is not counted.
+
+Usage:
+    uv run python -m benchmarks.bench_pdf_sharding --pages 300 --shard-pages 25 --workers 1,2,4
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pypdfium2
+
+from backend.config import INPUT_DIR
+from backend.converters.converter_pool import warmup_converter_pool
+from backend.converters.pdf_to_markdown import convert_pdf_to_markdown
+
+
+def build_large_pdf(source: Path, pages: int, output_path: Path) -> Path:
+    """Write a PDF of `pages` pages made by repeating the pages of `source`."""
+    src = pypdfium2.PdfDocument(str(source))
+    dst = pypdfium2.PdfDocument.new()
+    try:
+        while len(dst) < pages:
+            count = min(len(src), pages - len(dst))
+            dst.import_pages(src, list(range(count)))
+        dst.save(str(output_path))
+    finally:
+        src.close()
+        dst.close()
+    return output_path
+
+
+def _started(_) -> int:
+    return os.getpid()
+
+
+def time_conversion(pdf_path: Path, output_path: Path, shard_pages: int, workers: int) -> float:
+    """Convert once on a warmed pool of `workers` processes and return seconds taken."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=warmup_converter_pool) as pool:
+        list(pool.map(_started, range(workers)))
+        start = time.perf_counter()
+        if shard_pages:
+            convert_pdf_to_markdown(
+                pdf_path, output_path, shard_pages=shard_pages, executor=pool
+            )
+        else:
+            # Run inside the warmed worker so both modes start with loaded models
+            pool.submit(convert_pdf_to_markdown, pdf_path, output_path).result()
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--source", type=Path, default=INPUT_DIR / "Appendix-I-updated (1).pdf")
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--shard-pages", type=int, default=25)
+    parser.add_argument("--workers", default=",".join(
+        str(n) for n in (1, 2, 4, 8) if n <= (os.cpu_count() or 1)
+    ))
+    args = parser.parse_args()
+    worker_counts = [int(n) for n in args.workers.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pdf_path = build_large_pdf(args.source, args.pages, tmp / "large.pdf")
+        print(f"{args.pages}-page PDF from {args.source.name}, shards of {args.shard_pages} pages")
+        print(f"{'mode':<22}{'workers':>8}{'seconds':>10}{'speedup':>9}")
+
+        # Unsharded: one conversion on one core
+        baseline = time_conversion(pdf_path, tmp / "baseline.md", shard_pages=0, workers=1)
+        print(f"{'unsharded':<22}{1:>8}{baseline:>10.2f}{1.0:>9.2f}")
+
+        for workers in worker_counts:
+            seconds = time_conversion(pdf_path, tmp / f"sharded-{workers}.md", args.shard_pages, workers)
+            print(f"{'sharded':<22}{workers:>8}{seconds:>10.2f}{baseline / seconds:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Load-test the /result chat streaming endpoint with many concurrent clients.
+
+Each client is a raw asyncio socket speaking HTTP/1.1, so the load generator
+adds almost no overhead of its own. Reports time to first byte, full stream
+time and aggregate throughput. Starts its own uvicorn server on a free port
+unless --url is given; with --fake-upstream every model is served through the
+OpenAI-compatible provider from a local fake LLM server.
+
+Usage:
+    uv run python -m benchmarks.bench_result_load --clients 100 --requests 2
+    uv run python -m benchmarks.bench_result_load --clients 500 --fake-upstream --token-delay 0.02
+    uv run python -m benchmarks.bench_result_load --url http://localhost:8000 --clients 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _read_chunked(reader: asyncio.StreamReader, on_data) -> int:
+    """Read a chunked body, calling on_data() on the first data; return body bytes."""
+    received = 0
+    while True:
+        size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+        if size == 0:
+            await reader.readline()
+            return received
+        data = await reader.readexactly(size)
+        if data:
+            on_data()
+        received += len(data)
+        await reader.readexactly(2)
+
+
+async def stream_once(host: str, port: int, body: bytes) -> Dict[str, float]:
+    """
+    POST one chat request and read the whole streamed response.
+    
+    Returns:
+        Dict with status, first_byte (s), duration (s) and bytes
+    """
+    start = time.perf_counter()
+    first_byte: Optional[float] = None
+    
+    def mark():
+        nonlocal first_byte
+        if first_byte is None:
+            first_byte = time.perf_counter() - start
+    
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            b"POST /result HTTP/1.1\r\n"
+            + f"Host: {host}:{port}\r\n".encode()
+            + b"Content-Type: application/json\r\n"
+            + f"Content-Length: {len(body)}\r\n".encode()
+            + b"Connection: close\r\n\r\n"
+            + body
+        )
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            received = await _read_chunked(reader, mark)
+        else:
+            received = 0
+            while data := await reader.read(65536):
+                mark()
+                received += len(data)
+    finally:
+        writer.close()
+    return {
+        "status": status,
+        "first_byte": first_byte if first_byte is not None else time.perf_counter() - start,
+        "duration": time.perf_counter() - start,
+        "bytes": received,
+    }
+
+
+async def run_load_test(
+    url: str,
+    clients: int,
+    requests_per_client: int = 1,
+    model: str = "model_a"
+) -> Dict[str, float]:
+    """
+    Run `clients` concurrent clients, each streaming `requests_per_client` responses in turn.
+    
+    Returns:
+        Summary with request/error counts, first-byte and duration percentiles
+        (seconds), wall time and aggregate throughput (bytes/s)
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname or "localhost", parts.port or 80
+    body = json.dumps({"userInput": "benchmark", "model": model, "threadId": "bench"}).encode()
+    results: List[Dict[str, float]] = []
+    errors = 0
+    
+    async def client():
+        nonlocal errors
+        for _ in range(requests_per_client):
+            try:
+                result = await stream_once(host, port, body)
+            except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+                errors += 1
+                continue
+            if result["status"] != 200:
+                errors += 1
+                continue
+            results.append(result)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    wall = time.perf_counter() - start
+    
+    summary = {
+        "clients": clients,
+        "requests": clients * requests_per_client,
+        "errors": errors,
+        "wall_seconds": wall,
+    }
+    if results:
+        first_bytes = [r["first_byte"] for r in results]
+        durations = [r["duration"] for r in results]
+        total_bytes = sum(r["bytes"] for r in results)
+        summary.update({
+            "first_byte_p50": percentile(first_bytes, 50),
+            "first_byte_p95": percentile(first_bytes, 95),
+            "first_byte_max": max(first_bytes),
+            "duration_p50": percentile(durations, 50),
+            "duration_p95": percentile(durations, 95),
+            "duration_mean": statistics.mean(durations),
+            "bytes_per_second": total_bytes / wall,
+        })
+    return summary
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def fake_upstream(token_delay: float, first_token_delay: float, timeout: float = 30) -> Iterator[str]:
+    """
+    Run backend.providers.fake_openai in a subprocess.
+    
+    Yields:
+        Its OpenAI API base URL
+    """
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "backend.providers.fake_openai", "--port", str(port),
+         "--token-delay", str(token_delay), "--first-token-delay", str(first_token_delay)],
+        cwd=PROJECT_DIR,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("Fake upstream server did not start")
+                time.sleep(0.2)
+        yield f"http://127.0.0.1:{port}/v1"
+    finally:
+        process.terminate()
+        process.wait()
+
+
+@contextmanager
+def api_server(env: Optional[Dict[str, str]] = None, timeout: float = 60) -> Iterator[str]:
+    """
+    Run the API in a uvicorn subprocess with warmups off and a scratch data directory.
+    
+    Yields:
+        Base URL of the server
+    
+    Raises:
+        RuntimeError: If the server exits or does not answer /health in time
+    """
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as data_dir:
+        server_env = {
+            **os.environ,
+            "DATA_DIR": data_dir,
+            "DOCLING_WORKERS": "0",
+            "CONVERTER_WARMUP": "off",
+            **(env or {}),
+        }
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.main:app",
+             "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+            cwd=PROJECT_DIR,
+            env=server_env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        try:
+            deadline = time.monotonic() + timeout
+            while True:
+                if process.poll() is not None:
+                    error = process.stderr.read().decode(errors="replace").strip().splitlines()
+                    raise RuntimeError(f"API server exited: {error[-1] if error else process.returncode}")
+                try:
+                    with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+                        sock.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+                        if b" 200 " in sock.recv(64):
+                            break
+                except OSError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("API server did not become healthy")
+                time.sleep(0.2)
+            yield f"http://127.0.0.1:{port}"
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+def format_summary(summary: Dict[str, float]) -> str:
+    if "first_byte_p50" not in summary:
+        return f"{summary['requests']} requests, {summary['errors']} errors, no successful streams"
+    return (
+        f"{summary['requests']} requests from {summary['clients']} clients in {summary['wall_seconds']:.2f}s, "
+        f"{summary['errors']} errors\n"
+        f"  first byte: p50 {summary['first_byte_p50'] * 1000:.1f} ms, "
+        f"p95 {summary['first_byte_p95'] * 1000:.1f} ms, max {summary['first_byte_max'] * 1000:.1f} ms\n"
+        f"  stream:     p50 {summary['duration_p50']:.2f} s, p95 {summary['duration_p95']:.2f} s\n"
+        f"  throughput: {summary['bytes_per_second']:,.0f} bytes/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="Existing server (default: start one)")
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent streaming clients")
+    parser.add_argument("--requests", type=int, default=1, help="Streams per client, one after another")
+    parser.add_argument("--model", default="model_a")
+    parser.add_argument("--fake-upstream", action="store_true", help="Proxy every model to a local fake LLM server")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="Fake upstream seconds per token")
+    parser.add_argument("--first-token-delay", type=float, default=0.2, help="Fake upstream seconds to first token")
+    args = parser.parse_args()
+    
+    if args.url:
+        summary = asyncio.run(run_load_test(args.url, args.clients, args.requests, args.model))
+    elif args.fake_upstream:
+        with fake_upstream(args.token_delay, args.first_token_delay) as base_url:
+            env = {
+                "CHAT_PROVIDERS": "model_a=openai,model_b=openai,model_c=openai",
+                "OPENAI_BASE_URL": base_url,
+                "CHAT_MAX_CONCURRENCY": str(args.clients),
+            }
+            with api_server(env) as url:
+                summary = asyncio.run(run_load_test(url, args.clients, args.requests, args.model))
+    else:
+        with api_server() as url:
+            summary = asyncio.run(run_load_test(url, args.clients, args.requests, args.model))
+    print(format_summary(summary))
+
+
+if __name__ == "__main__":
+    main()
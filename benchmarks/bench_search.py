@@ -0,0 +1,110 @@
+"""
+Benchmark BM25 search index build time and query latency.
+
+Builds a corpus of chunk files from the sections of data/markdown/*.md
+(repeated across synthetic documents until the target chunk count is
+reached), indexes it into a fresh search index, then runs queries made
+of words sampled from the corpus and reports latency percentiles.
+
+Usage:
+    uv run python -m benchmarks.bench_search --chunks 50000 --queries 500
+"""
+import argparse
+import random
+import re
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from backend.config import CHUNK_HEADERS, MARKDOWN_DIR
+from backend.converters.markdown_splitter import split_markdown_file
+from backend.converters.markdown_to_chunks import ChunkFileWriter, chunk_id_for
+from backend.search import SearchIndex
+
+
+def build_corpus(sources, target_chunks: int, chunks_per_doc: int, out_dir: Path) -> list[Path]:
+    """Write chunk files totalling target_chunks chunks and return their paths."""
+    sections = [section for source in sources for section in split_markdown_file(source, CHUNK_HEADERS)]
+    if not sections:
+        raise SystemExit("No sections found in the source Markdown")
+
+    paths = []
+    written = 0
+    while written < target_chunks:
+        doc = f"doc{len(paths):05d}"
+        path = out_dir / f"{doc}.json"
+        with ChunkFileWriter(path) as writer:
+            for ordinal in range(min(chunks_per_doc, target_chunks - written)):
+                section = sections[(written + ordinal) % len(sections)]
+                titles = list(section.metadata.values())
+                writer.write({
+                    "chunk_id": chunk_id_for(doc, (), ordinal),
+                    "self": {"header": "h1" if titles else None, "title": titles[-1] if titles else None},
+                    "parents": [{"id": "", "header": "h1", "title": title} for title in titles[:-1]],
+                    "text": section.text,
+                })
+            written += writer.count
+        paths.append(path)
+    return paths
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("files", nargs="*", type=Path)
+    parser.add_argument("--chunks", type=int, default=50000, help="Total chunks indexed")
+    parser.add_argument("--chunks-per-doc", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--terms", type=int, default=3, help="Words per query")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sources = args.files or sorted(MARKDOWN_DIR.glob("*.md"))
+    if not sources:
+        parser.error(f"No Markdown files given or found in {MARKDOWN_DIR}")
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        chunks_dir = tmp / "chunks"
+        chunks_dir.mkdir()
+        paths = build_corpus(sources, args.chunks, args.chunks_per_doc, chunks_dir)
+
+        index = SearchIndex(tmp / "search.db")
+        start = time.perf_counter()
+        for path in paths:
+            index.index_document(path.stem, path, version="bench")
+        build_seconds = time.perf_counter() - start
+        stats = index.stats()
+        print(f"indexed {stats['chunks']} chunks in {stats['documents']} documents "
+              f"in {build_seconds:.2f}s ({stats['chunks'] / build_seconds:,.0f} chunks/s)")
+
+        # Re-indexing one document, as after a revision
+        start = time.perf_counter()
+        index.index_document(paths[0].stem, paths[0], version="bench-2")
+        print(f"re-index one document: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        vocabulary = sorted({
+            word.lower()
+            for source in sources
+            for word in re.findall(r"[A-Za-z]{4,}", source.read_text(encoding="utf-8"))
+        })
+        latencies = []
+        for _ in range(args.queries):
+            query = " ".join(rng.sample(vocabulary, min(args.terms, len(vocabulary))))
+            start = time.perf_counter()
+            index.search(query, limit=10)
+            latencies.append((time.perf_counter() - start) * 1000)
+        index.close()
+
+    print(f"{args.queries} queries of {args.terms} words: "
+          f"mean {statistics.mean(latencies):.2f} ms, p50 {percentile(latencies, 50):.2f} ms, "
+          f"p95 {percentile(latencies, 95):.2f} ms, p99 {percentile(latencies, 99):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
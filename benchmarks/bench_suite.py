@@ -0,0 +1,497 @@
+"""
+Reproducible benchmark suite for the document pipeline and chat streaming.
+
+Times a cold API start (importing backend.main plus the lifespan start-up),
+runs every converter in backend/converters and the full /process flow over a
+fixture corpus (the samples in data/input plus synthetic DOCX, HTML, PDF and
+Markdown documents, see benchmarks/fixtures.py), then load-tests /result with
+concurrent streaming clients. Each case runs in a fresh process with its own
+data directory, so caches, pools and peak memory do not leak between cases.
+
+Per case it records median wall time, CPU time (including worker processes
+that have exited), peak RSS and throughput, plus the per-stage breakdown of
+/process taken from the pipeline metrics. Results can be saved as a baseline
+and later runs compared against it: a metric that grows by more than the
+threshold is reported as a regression and the run exits with status 1.
+
+Cases whose dependencies are not installed (Docling, Playwright, LibreOffice)
+are reported as skipped.
+
+Usage:
+    uv run python -m benchmarks.bench_suite --save-baseline
+    uv run python -m benchmarks.bench_suite --threshold 0.15
+    uv run python -m benchmarks.bench_suite --cases html_to_markdown,process_fast --scales small,medium
+"""
+import argparse
+import asyncio
+import importlib
+import importlib.metadata
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from benchmarks.bench_result_load import api_server, run_load_test
+from benchmarks.fixtures import SCALES, build_fixtures
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SAMPLES_DIR = PROJECT_DIR / "data" / "input"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Environment of every case process: no warmups, no background Docling workers
+CASE_ENV = {
+    "DOCLING_WORKERS": "0",
+    "CONVERTER_WARMUP": "off",
+    "DEDUP_ENABLED": "false",
+}
+
+# Case → (input extensions, requirements); converters are resolved in the case process.
+# api_startup takes no input: it times importing backend.main and the lifespan start-up.
+CASES = {
+    "api_startup": ((), ()),
+    "docx_to_pdf": (("docx",), ("libreoffice",)),
+    "html_to_pdf": (("html",), ("playwright",)),
+    "pdf_to_markdown": (("pdf",), ("docling",)),
+    "html_to_markdown": (("html",), ()),
+    "docx_to_markdown": (("docx",), ()),
+    "markdown_to_chunks": (("md",), ()),
+    "process_fast": (("html", "docx"), ()),
+    "process_standard": (("pdf", "docx", "html"), ("docling",)),
+}
+
+# What /process needs per source type in standard mode, besides Docling
+_PDF_CONVERSION = {"docx": "libreoffice", "html": "playwright"}
+
+# Metrics compared against the baseline (all lower-is-better) and the smallest
+# absolute change counted as a regression, so timer noise on fast cases is ignored
+COMPARED_METRICS = {
+    "wall_seconds": 0.01,
+    "cpu_seconds": 0.01,
+    "peak_rss_mb": 5.0,
+    "import_seconds": 0.02,
+    "startup_seconds": 0.02,
+    "first_byte_p95": 0.005,
+    "duration_p95": 0.01,
+}
+
+
+def _libreoffice_available() -> bool:
+    binary = os.getenv("LIBREOFFICE_BIN")
+    return bool(binary) and Path(binary).exists()
+
+
+REQUIREMENT_CHECKS: Dict[str, Callable[[], bool]] = {
+    "docling": lambda: importlib.util.find_spec("docling") is not None,
+    "playwright": lambda: importlib.util.find_spec("playwright") is not None,
+    "libreoffice": _libreoffice_available,
+}
+
+
+def missing_requirements(case: str, extension: str) -> List[str]:
+    """Requirements of a case on a given input type that are not available here."""
+    requirements = list(CASES[case][1])
+    if case == "process_standard" and extension in _PDF_CONVERSION:
+        requirements.append(_PDF_CONVERSION[extension])
+    return [name for name in requirements if not REQUIREMENT_CHECKS[name]()]
+
+
+# ----------------------------------------------------------------------------
+# Case process
+# ----------------------------------------------------------------------------
+
+def _resolve(target: str) -> Callable:
+    module, _, name = target.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+@contextmanager
+def _converter(function: str, suffix: str, teardown: Optional[str] = None) -> Iterator[Callable]:
+    """
+    A converter as a case runner writing <fixture stem><suffix> to the output directory.
+    
+    Args:
+        function: Converter as "module:function"
+        suffix: Output file suffix
+        teardown: Optional "module:function" called once the case is done
+    """
+    convert = _resolve(function)
+    
+    def run(fixture: Path, out_dir: Path) -> Dict[str, float]:
+        convert(fixture, out_dir / f"{fixture.stem}{suffix}")
+        return {}
+    
+    try:
+        yield run
+    finally:
+        if teardown:
+            _resolve(teardown)()
+
+
+@contextmanager
+def _process_flow(mode: str) -> Iterator[Callable]:
+    """The /process endpoint (cache off) as a case runner reporting seconds per pipeline stage."""
+    from fastapi.testclient import TestClient
+    
+    from backend import metrics
+    from backend.main import app
+    
+    with TestClient(app) as client:
+        def run(fixture: Path, out_dir: Path) -> Dict[str, float]:
+            before = metrics.STAGE_SECONDS.totals()
+            response = client.post("/process", json={
+                "file_path": str(fixture),
+                "use_cache": False,
+                "pipeline_mode": mode,
+            })
+            if response.status_code != 200:
+                raise RuntimeError(f"/process returned {response.status_code}: {response.json().get('detail')}")
+            stages: Dict[str, float] = {}
+            for labels, (seconds, _) in metrics.STAGE_SECONDS.totals().items():
+                elapsed = seconds - before.get(labels, (0.0, 0))[0]
+                if elapsed > 0:
+                    stage = labels[0]
+                    stages[stage] = stages.get(stage, 0.0) + elapsed
+            return stages
+        
+        yield run
+
+
+def _case_runner(case: str):
+    if case == "docx_to_pdf":
+        return _converter(
+            "backend.converters.docx_to_pdf:convert_docx_to_pdf", ".pdf",
+            "backend.converters.docx_to_pdf:stop_libreoffice_pool",
+        )
+    if case == "html_to_pdf":
+        return _converter(
+            "backend.converters.html_to_pdf:convert_html_to_pdf", ".pdf",
+            "backend.converters.browser_pool:stop_browser_pool",
+        )
+    if case == "pdf_to_markdown":
+        return _converter("backend.converters.pdf_to_markdown:convert_pdf_to_markdown", ".md")
+    if case == "html_to_markdown":
+        return _converter("backend.converters.html_to_markdown:convert_html_to_markdown", ".md")
+    if case == "docx_to_markdown":
+        return _converter("backend.converters.docx_to_markdown:convert_docx_to_markdown", ".md")
+    if case == "markdown_to_chunks":
+        return _converter("backend.converters.markdown_to_chunks:convert_markdown_to_chunks", ".json")
+    if case == "process_fast":
+        return _process_flow("fast")
+    if case == "process_standard":
+        return _process_flow("standard")
+    raise ValueError(f"Unknown case: {case}")
+
+
+def _cpu_seconds() -> float:
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def _peak_rss_mb() -> float:
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_case(case: str, fixture: str, repeat: int, warmup: int, env: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Benchmark one case on one fixture. Runs in a fresh process.
+    
+    Args:
+        case: Key of CASES
+        fixture: Input document path
+        repeat: Timed runs
+        warmup: Untimed runs first (model loading, pool start-up)
+        env: Environment applied before the backend is imported
+    
+    Returns:
+        Result dict: wall/CPU seconds, peak RSS, throughput and stage breakdown,
+        or {"skipped": reason} / {"error": message}
+    """
+    os.environ.update(env)
+    fixture = Path(fixture)
+    out_dir = Path(env["DATA_DIR"]) / "bench-output"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    
+    try:
+        runner = _case_runner(case)
+        run = runner.__enter__()
+    except (ImportError, RuntimeError) as e:
+        return {"skipped": f"{type(e).__name__}: {e}"}
+    
+    walls: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    try:
+        for _ in range(warmup):
+            run(fixture, out_dir)
+        cpu_start = _cpu_seconds()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for stage, seconds in run(fixture, out_dir).items():
+                stages.setdefault(stage, []).append(seconds)
+            walls.append(time.perf_counter() - start)
+        cpu = (_cpu_seconds() - cpu_start) / repeat
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    finally:
+        runner.__exit__(None, None, None)
+    
+    size = fixture.stat().st_size
+    wall = statistics.median(walls)
+    return {
+        "input_bytes": size,
+        "runs": len(walls),
+        "wall_seconds": wall,
+        "wall_min_seconds": min(walls),
+        "cpu_seconds": cpu,
+        "peak_rss_mb": _peak_rss_mb(),
+        "throughput_mb_s": size / wall / 1e6 if wall else None,
+        "stages": {
+            stage: {"seconds": statistics.median(values), "throughput_mb_s": size / statistics.median(values) / 1e6}
+            for stage, values in sorted(stages.items())
+        },
+    }
+
+
+def run_startup(env: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Time a cold API start. Runs in a fresh process.
+    
+    Returns:
+        Seconds to import backend.main and to run the lifespan start-up, peak
+        RSS, and which heavy converter dependencies ended up imported
+    """
+    os.environ.update(env)
+    from fastapi.testclient import TestClient
+    
+    start = time.perf_counter()
+    from backend.main import app
+    imported = time.perf_counter()
+    with TestClient(app) as client:
+        ready = time.perf_counter()
+        client.get("/health").raise_for_status()
+    return {
+        "import_seconds": imported - start,
+        "startup_seconds": ready - imported,
+        "wall_seconds": ready - start,
+        "peak_rss_mb": _peak_rss_mb(),
+        "heavy_modules": sorted(m for m in ("docling", "playwright", "torch", "langchain") if m in sys.modules),
+    }
+
+
+# ----------------------------------------------------------------------------
+# Suite
+# ----------------------------------------------------------------------------
+
+def _run_isolated(func: Callable, *args) -> Any:
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(func, *args).result()
+
+
+def _measure_startup(repeat: int, env: Dict[str, str]) -> Dict[str, Any]:
+    """Median of `repeat` cold starts, each in a new process."""
+    try:
+        runs = [_run_isolated(run_startup, env) for _ in range(repeat)]
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    result = {
+        metric: statistics.median(run[metric] for run in runs)
+        for metric in ("import_seconds", "startup_seconds", "wall_seconds", "peak_rss_mb")
+    }
+    result["runs"] = len(runs)
+    result["heavy_modules"] = runs[-1]["heavy_modules"]
+    return result
+
+
+def _version(package: str) -> Optional[str]:
+    try:
+        return importlib.metadata.version(package)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    """Machine and dependency versions, so results are only compared like for like."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "packages": {name: _version(name) for name in ("docling", "playwright", "fastapi", "numpy")},
+    }
+
+
+def run_suite(
+    cases: List[str],
+    scales: List[str],
+    repeat: int,
+    warmup: int,
+    load_clients: int,
+    load_requests: int
+) -> Dict[str, Any]:
+    """
+    Run the selected cases over a freshly built fixture corpus.
+    
+    Returns:
+        {"environment": ..., "results": {"<case>:<fixture>": result}}
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        if "api_startup" in cases:
+            result = _measure_startup(repeat, {**CASE_ENV, "DATA_DIR": tempfile.mkdtemp(dir=tmp)})
+            results["api_startup"] = result
+            print(format_result("api_startup", result), flush=True)
+        
+        fixtures = build_fixtures(tmp / "fixtures", SAMPLES_DIR if SAMPLES_DIR.is_dir() else None, scales)
+        for case in cases:
+            extensions, _ = CASES[case]
+            for extension in extensions:
+                for fixture in fixtures[extension]:
+                    key = f"{case}:{fixture.name}"
+                    missing = missing_requirements(case, extension)
+                    if missing:
+                        result = {"skipped": f"requires {', '.join(missing)}"}
+                    else:
+                        data_dir = tempfile.mkdtemp(dir=tmp)
+                        result = _run_isolated(
+                            run_case, case, str(fixture), repeat, warmup, {**CASE_ENV, "DATA_DIR": data_dir}
+                        )
+                    results[key] = result
+                    print(format_result(key, result), flush=True)
+        
+        if load_clients:
+            key = f"result_stream:{load_clients}x{load_requests}"
+            try:
+                with api_server(CASE_ENV) as url:
+                    # Untimed warmup stream, then the load test proper
+                    asyncio.run(run_load_test(url, 1))
+                    result = asyncio.run(run_load_test(url, load_clients, load_requests))
+            except RuntimeError as e:
+                result = {"skipped": str(e)}
+            results[key] = result
+            print(format_result(key, result), flush=True)
+    
+    return {"environment": environment(), "results": results}
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare results with a baseline.
+    
+    Args:
+        results: Output of run_suite
+        baseline: Earlier output of run_suite
+        threshold: Relative growth counted as a regression (0.15 = 15%)
+    
+    Returns:
+        Human-readable regression lines (empty if none)
+    """
+    regressions = []
+    previous = baseline.get("results", {})
+    for key, result in results["results"].items():
+        base = previous.get(key)
+        if not base:
+            continue
+        for metric, floor in COMPARED_METRICS.items():
+            current, before = result.get(metric), base.get(metric)
+            if current is None or before is None:
+                continue
+            if current > before * (1 + threshold) and current - before > floor:
+                change = (current - before) / before if before else float("inf")
+                regressions.append(f"{key} {metric}: {before:.4g} → {current:.4g} (+{change:.0%})")
+    return regressions
+
+
+def format_result(key: str, result: Dict[str, Any]) -> str:
+    if "skipped" in result:
+        return f"{key:<60} skipped ({result['skipped']})"
+    if "error" in result:
+        return f"{key:<60} ERROR {result['error']}"
+    if "first_byte_p95" in result:
+        return (
+            f"{key:<60} first byte p95 {result['first_byte_p95'] * 1000:7.1f} ms  "
+            f"stream p95 {result['duration_p95']:6.2f} s  {result['bytes_per_second']:,.0f} B/s  "
+            f"{result['errors']} errors"
+        )
+    if "import_seconds" in result:
+        return (
+            f"{key:<60} import {result['import_seconds']:6.3f} s  start-up {result['startup_seconds']:6.3f} s  "
+            f"rss {result['peak_rss_mb']:7.1f} MB  heavy modules: {', '.join(result['heavy_modules']) or 'none'}"
+        )
+    if "wall_seconds" not in result:
+        return f"{key:<60} no successful runs"
+    line = (
+        f"{key:<60} wall {result['wall_seconds']:8.3f} s  cpu {result['cpu_seconds']:8.3f} s  "
+        f"rss {result['peak_rss_mb']:7.1f} MB  {result['throughput_mb_s']:7.2f} MB/s"
+    )
+    for stage, timing in result.get("stages", {}).items():
+        line += f"\n{'':<62}{stage:<16} {timing['seconds']:8.3f} s  {timing['throughput_mb_s']:7.2f} MB/s"
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma-separated cases")
+    parser.add_argument("--scales", default="small,large", help=f"Synthetic fixture sizes ({', '.join(SCALES)})")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case and fixture")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs first")
+    parser.add_argument("--load-clients", type=int, default=100, help="Concurrent /result clients (0 skips the load test)")
+    parser.add_argument("--load-requests", type=int, default=2, help="Streams per /result client")
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Relative slowdown counted as a regression")
+    args = parser.parse_args()
+    
+    cases = [case for case in args.cases.split(",") if case]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"Unknown cases: {', '.join(sorted(unknown))}")
+    scales = [scale for scale in args.scales.split(",") if scale]
+    if set(scales) - set(SCALES):
+        parser.error(f"Scales must be among: {', '.join(SCALES)}")
+    
+    results = run_suite(cases, scales, args.repeat, args.warmup, args.load_clients, args.load_requests)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("environment") != results["environment"]:
+        print("Warning: baseline was recorded on a different machine or dependency set")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
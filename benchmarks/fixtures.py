@@ -0,0 +1,240 @@
+"""
+Fixture corpus for the benchmark suite.
+
+The samples in data/input plus synthetic documents of every supported format
+(Markdown, HTML, DOCX, PDF) generated locally from a seeded word list, so
+runs are reproducible without downloading anything. DOCX and PDF files are
+written with the standard library only.
+"""
+import random
+import shutil
+import zipfile
+from html import escape as html_escape
+from pathlib import Path
+from typing import Dict, List
+from xml.sax.saxutils import escape as xml_escape
+
+# Word pool for synthetic text; regulation-like vocabulary
+WORDS = (
+    "export import licence restriction goods item schedule policy notification trade "
+    "customs duty tariff chapter heading appendix condition permitted prohibited "
+    "restricted authority director general foreign procedure quantity value origin "
+    "certificate shipment port entry exemption amendment regulation clause section "
+    "applicant application validity period annual quota state trading enterprise"
+).split()
+
+# Synthetic document sizes by scale: (sections, paragraphs per section)
+SCALES = {
+    "small": (20, 3),
+    "medium": (100, 5),
+    "large": (400, 8),
+}
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(WORDS, k=rng.randint(8, 20))
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(2, 5)))
+
+
+def _outline(sections: int, paragraphs: int, seed: int) -> List[tuple]:
+    """(level, title, paragraphs) for each section, three heading levels deep."""
+    rng = random.Random(seed)
+    outline = []
+    for index in range(sections):
+        level = 1 if index % 10 == 0 else (2 if index % 3 == 0 else 3)
+        title = f"{index + 1}. " + " ".join(rng.choices(WORDS, k=3)).title()
+        outline.append((level, title, [_paragraph(rng) for _ in range(paragraphs)]))
+    return outline
+
+
+def write_markdown(path: Path, outline: List[tuple]) -> Path:
+    with open(path, "w", encoding="utf-8") as f:
+        for level, title, paragraphs in outline:
+            f.write(f"{'#' * level} {title}\n\n")
+            for paragraph in paragraphs:
+                f.write(paragraph + "\n\n")
+    return path
+
+
+def write_html(path: Path, outline: List[tuple]) -> Path:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Synthetic</title></head><body>\n")
+        for index, (level, title, paragraphs) in enumerate(outline):
+            f.write(f"<h{level}>{html_escape(title)}</h{level}>\n")
+            for paragraph in paragraphs:
+                f.write(f"<p>{html_escape(paragraph)}</p>\n")
+            if index % 5 == 0:
+                # Tables exercise the table paths of every converter
+                f.write("<table><tr><th>Item</th><th>Policy</th><th>Condition</th></tr>")
+                for row in range(4):
+                    f.write(f"<tr><td>{row}</td><td>{WORDS[row]}</td><td>{WORDS[-row - 1]}</td></tr>")
+                f.write("</table>\n")
+        f.write("</body></html>\n")
+    return path
+
+
+_DOCX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+</Types>"""
+
+_DOCX_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+_DOCX_DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+</Relationships>"""
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _docx_styles() -> str:
+    styles = "".join(
+        f'<w:style w:type="paragraph" w:styleId="Heading{level}"><w:name w:val="heading {level}"/>'
+        f'<w:basedOn w:val="Normal"/><w:pPr><w:outlineLvl w:val="{level - 1}"/></w:pPr>'
+        f'<w:rPr><w:b/><w:sz w:val="{36 - 4 * level}"/></w:rPr></w:style>'
+        for level in (1, 2, 3)
+    )
+    return (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:styles xmlns:w="{_W_NS}">'
+        '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>'
+        f"{styles}</w:styles>"
+    )
+
+
+def write_docx(path: Path, outline: List[tuple]) -> Path:
+    body = []
+    for level, title, paragraphs in outline:
+        body.append(
+            f'<w:p><w:pPr><w:pStyle w:val="Heading{level}"/></w:pPr>'
+            f"<w:r><w:t>{xml_escape(title)}</w:t></w:r></w:p>"
+        )
+        for paragraph in paragraphs:
+            body.append(f'<w:p><w:r><w:t xml:space="preserve">{xml_escape(paragraph)}</w:t></w:r></w:p>')
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:document xmlns:w="{_W_NS}">'
+        f"<w:body>{''.join(body)}<w:sectPr/></w:body></w:document>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _DOCX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _DOCX_RELS)
+        archive.writestr("word/_rels/document.xml.rels", _DOCX_DOCUMENT_RELS)
+        archive.writestr("word/styles.xml", _docx_styles())
+        archive.writestr("word/document.xml", document)
+    return path
+
+
+def _pdf_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap(text: str, width: int) -> List[str]:
+    lines, line = [], ""
+    for word in text.split():
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def write_pdf(path: Path, outline: List[tuple]) -> Path:
+    """Write a text PDF (A4, Helvetica) laid out line by line, headings in bold."""
+    lines_per_page = 60
+    # (font, size, text) per output line
+    lines = []
+    for level, title, paragraphs in outline:
+        lines.append(("F2", 18 - 2 * level, title))
+        for paragraph in paragraphs:
+            lines.extend(("F1", 10, line) for line in _wrap(paragraph, 95))
+            lines.append(("F1", 10, ""))
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Page tree, filled in once page object numbers are known
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold >>",
+    ]
+    page_ids = []
+    for page in pages:
+        content = ["BT", "50 800 Td"]
+        for font, size, text in page:
+            content.append(f"/{font} {size} Tf 0 -{size + 3} Td ({_pdf_text(text)}) Tj")
+        content.append("ET")
+        stream = "\n".join(content)
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents {len(objects)} 0 R "
+            "/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> >>"
+        )
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+    
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+        xref = f.tell()
+        f.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+        for offset in offsets:
+            f.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+        f.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
+    return path
+
+
+WRITERS = {
+    "md": write_markdown,
+    "html": write_html,
+    "docx": write_docx,
+    "pdf": write_pdf,
+}
+
+
+def build_fixtures(
+    out_dir: Path,
+    samples_dir: Path | None = None,
+    scales: List[str] = ("small", "large"),
+    seed: int = 0
+) -> Dict[str, List[Path]]:
+    """
+    Write the fixture corpus.
+    
+    Args:
+        out_dir: Directory receiving the fixtures
+        samples_dir: Directory of real sample documents to include (e.g. data/input)
+        scales: Synthetic sizes to generate (keys of SCALES)
+        seed: Seed for the synthetic text
+    
+    Returns:
+        Dict of extension ('md', 'html', 'docx', 'pdf') → fixture paths
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    fixtures: Dict[str, List[Path]] = {extension: [] for extension in WRITERS}
+    if samples_dir is not None:
+        for sample in sorted(samples_dir.iterdir()):
+            extension = sample.suffix.lower().lstrip(".")
+            if extension in fixtures:
+                fixtures[extension].append(Path(shutil.copy2(sample, out_dir / sample.name)))
+    
+    for scale in scales:
+        sections, paragraphs = SCALES[scale]
+        outline = _outline(sections, paragraphs, seed)
+        for extension, writer in WRITERS.items():
+            fixtures[extension].append(writer(out_dir / f"synthetic-{scale}.{extension}", outline))
+    return fixtures
@@ -5,14 +5,21 @@ import streamlit as st
 import uuid
 import requests
 
+from sse_client import stream_result
+
 BASE_URL = "http://127.0.0.1:8000"
 MODEL_NAMES = ["Model A", "Model B", "Model C"]
+HISTORY_PAGE = 20  # Messages loaded per "Load earlier messages"
 
 
 def stream_from_backend(prompt: str, model: str, thread_id: str):
     """
     Stream response from backend API.
     
+    Uses the resumable SSE mode of /result: if the connection drops
+    mid-answer, the request is re-sent with Last-Event-ID and only the
+    missing part of the answer is received.
+    
     Args:
         prompt: User's input message
         model: Selected model name
@@ -26,18 +33,30 @@ def stream_from_backend(prompt: str, model: str, thread_id: str):
         "model": model.lower().replace(" ", "_"),
         "threadId": thread_id,
     }
+    yield from stream_result(requests.post, f"{BASE_URL}/result", payload)
+
+
+def fetch_history(thread_id: str, limit: int):
+    """
+    Load the latest messages of a thread from the backend.
     
-    with requests.post(
-        f"{BASE_URL}/result",
-        json=payload,
-        stream=True,
-        timeout=(5, None),
-    ) as r:
-        r.raise_for_status()
-        
-        for chunk in r.iter_content(chunk_size=None):
-            if chunk:
-                yield chunk.decode("utf-8")
+    Args:
+        thread_id: Conversation thread ID
+        limit: Number of most recent messages
+    
+    Returns:
+        Tuple of (messages oldest first, whether older messages exist)
+    """
+    r = requests.get(
+        f"{BASE_URL}/threads/{thread_id}/messages",
+        params={"limit": limit},
+        timeout=5,
+    )
+    if r.status_code == 404:
+        return [], False
+    r.raise_for_status()
+    page = r.json()
+    return page["messages"], page["next_before"] is not None
 
 
 # ============================================================================
@@ -64,7 +83,7 @@ with st.sidebar:
             "id": tid,
             "title": "New chat",
             "model": "Model A",
-            "messages": []
+            "visible": HISTORY_PAGE
         }
         st.session_state.active_thread = tid
     
@@ -101,8 +120,13 @@ with top:
             label_visibility="collapsed"
         )
 
-# Render chat history
-for msg in thread["messages"]:
+# Render the visible tail of the history (kept by the backend, not the session)
+history, has_older = fetch_history(thread["id"], thread["visible"])
+if has_older and st.button("Load earlier messages"):
+    thread["visible"] += HISTORY_PAGE
+    st.rerun()
+
+for msg in history:
     with st.chat_message(msg["role"]):
         st.markdown(msg["content"])
 
@@ -110,13 +134,7 @@ for msg in thread["messages"]:
 prompt = st.chat_input("Message")
 
 if prompt:
-    # Save user message
-    thread["messages"].append({
-        "role": "user",
-        "content": prompt
-    })
-    
-    # Show user message
+    # Show user message (the backend stores it with the reply)
     with st.chat_message("user"):
         st.markdown(prompt)
     
@@ -133,12 +151,6 @@ if prompt:
             full_response += token
             placeholder.markdown(full_response)
     
-    # Save assistant message
-    thread["messages"].append({
-        "role": "assistant",
-        "content": full_response
-    })
-    
     # Update thread title
     thread["title"] = prompt[:30]
     
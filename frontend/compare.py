@@ -4,128 +4,196 @@ Streamlit interface for comparing multiple LLM responses side-by-side.
 import streamlit as st
 import uuid
 import time
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from queue import Queue, Empty
 import requests
+from requests.adapters import HTTPAdapter
+
+from sse_client import stream_result
 
 BASE_URL = "http://127.0.0.1:8000"
 MODEL_NAMES = ["Model A", "Model B", "Model C"]
+HISTORY_TAIL = 20  # Exchanges kept in the session; the backend stores full history
+MAX_PARALLEL_STREAMS = 16  # Model streams read at once (and pooled connections)
+RENDER_INTERVAL = 0.05     # Min seconds between redraws of the results grid
+GRID_COLUMNS = 3           # Results per row
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """
+    HTTP session shared by every comparison stream.
+    
+    Connections to the backend are pooled and kept alive, so a prompt
+    reuses them instead of opening one per model.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_PARALLEL_STREAMS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    """Worker threads that read the model streams (reused across reruns and prompts)."""
+    return ThreadPoolExecutor(max_workers=MAX_PARALLEL_STREAMS, thread_name_prefix="compare")
 
-def stream_from_backend(prompt: str, model: str, thread_id: str):
+
+def stream_from_backend(
+    session: requests.Session,
+    prompt: str,
+    model: str,
+    thread_id: str,
+    bypass_cache: bool = False
+):
     """
     Stream response from backend API.
     
+    Uses the resumable SSE mode of /result: if the connection drops
+    mid-answer, the request is re-sent with Last-Event-ID and only the
+    missing part of the answer is received.
+    
     Args:
+        session: Pooled HTTP session
         prompt: User's input message
         model: Selected model name
         thread_id: Conversation thread ID
+        bypass_cache: Ask for a fresh response instead of a cached one
         
     Yields:
         Response chunks from the backend
     """
+    model_key = model.lower().replace(" ", "_")
     payload = {
         "userInput": prompt,
-        "model": model.lower().replace(" ", "_"),
-        "threadId": thread_id,
+        "model": model_key,
+        # One backend thread per model, so each model's context holds only its own replies
+        "threadId": f"{thread_id}-{model_key}",
+        "bypassCache": bypass_cache,
     }
+    yield from stream_result(session.post, f"{BASE_URL}/result", payload)
+
+
+class ModelRun:
+    """Text and timing of one model's answer."""
     
-    with requests.post(
-        f"{BASE_URL}/result",
-        json=payload,
-        stream=True,
-        timeout=(5, None),
-    ) as r:
-        r.raise_for_status()
-        
-        for chunk in r.iter_content(chunk_size=None):
-            if chunk:
-                yield chunk.decode("utf-8")
+    def __init__(self, model: str):
+        self.model = model
+        self.parts = []
+        self.started = time.perf_counter()
+        self.first_token_at = None
+        self.finished_at = None
+        self.error = None
+    
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+    
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+    
+    def add(self, chunk: str, now: float):
+        if self.first_token_at is None:
+            self.first_token_at = now
+        self.parts.append(chunk)
+    
+    def stats(self) -> dict:
+        """Time to first token (s) and tokens/s after it; tokens are counted as words."""
+        end = self.finished_at or time.perf_counter()
+        ttft = None if self.first_token_at is None else self.first_token_at - self.started
+        tokens = len(self.text.split())
+        generating = end - self.first_token_at if self.first_token_at is not None else 0
+        return {
+            "ttft": ttft,
+            "tokens": tokens,
+            "tokens_per_second": tokens / generating if generating > 0 else None,
+            "error": self.error,
+        }
 
 
-def concurrent_stream_generator(prompt: str, left_model: str, right_model: str, thread_id: str):
+def compare_stream(prompt: str, models: list, thread_id: str, bypass_cache: bool = False):
     """
-    Generator that yields updates from both models concurrently.
+    Stream the answers of any number of models concurrently.
+    
+    Each model's stream is read by a pooled worker thread that puts its
+    chunks on one shared queue. This generator blocks on that queue, so it
+    wakes only when data arrives. It then drains everything pending and
+    yields at most once per RENDER_INTERVAL, so the number of redraws does
+    not grow with the number of models.
     
     Args:
         prompt: User's input message
-        left_model: Left panel model name
-        right_model: Right panel model name
+        models: Model names to compare
         thread_id: Conversation thread ID
+        bypass_cache: Ask for fresh responses instead of cached ones
         
     Yields:
-        Tuples of (left_text, right_text, left_done, right_done)
+        Dict of model name → ModelRun after each batch of updates (the last
+        yield has every run done)
     """
-    left_queue = Queue()
-    right_queue = Queue()
-    
-    left_done = threading.Event()
-    right_done = threading.Event()
-    
-    def run_left():
-        try:
-            for chunk in stream_from_backend(prompt, left_model, thread_id):
-                left_queue.put(('chunk', chunk))
-        except Exception as e:
-            left_queue.put(('error', str(e)))
-        finally:
-            left_done.set()
+    session = get_session()
+    events = Queue()
+    runs = {model: ModelRun(model) for model in models}
     
-    def run_right():
+    def read(model: str):
         try:
-            for chunk in stream_from_backend(prompt, right_model, thread_id):
-                right_queue.put(('chunk', chunk))
+            for chunk in stream_from_backend(session, prompt, model, thread_id, bypass_cache):
+                events.put((model, chunk, None))
         except Exception as e:
-            right_queue.put(('error', str(e)))
-        finally:
-            right_done.set()
-    
-    # Start threads
-    t1 = threading.Thread(target=run_left, daemon=True)
-    t2 = threading.Thread(target=run_right, daemon=True)
-    
-    t1.start()
-    t2.start()
+            events.put((model, None, str(e)))
+        else:
+            events.put((model, None, None))
     
-    left_text = ""
-    right_text = ""
+    for model in models:
+        get_executor().submit(read, model)
     
-    # Poll both queues until both threads are done
-    while not (left_done.is_set() and right_done.is_set() and
-               left_queue.empty() and right_queue.empty()):
-        
-        updated = False
-        
-        # Process left queue
+    pending = len(models)
+    last_yield = 0.0
+    while pending:
+        # Block until a model sends something, then take everything queued
+        batch = [events.get()]
         try:
-            msg_type, data = left_queue.get_nowait()
-            if msg_type == 'chunk':
-                left_text += data
-                updated = True
+            while True:
+                batch.append(events.get_nowait())
         except Empty:
             pass
         
-        # Process right queue
-        try:
-            msg_type, data = right_queue.get_nowait()
-            if msg_type == 'chunk':
-                right_text += data
-                updated = True
-        except Empty:
-            pass
+        now = time.perf_counter()
+        for model, chunk, error in batch:
+            run = runs[model]
+            if chunk is not None:
+                run.add(chunk, now)
+            else:
+                run.error = error
+                run.finished_at = now
+                pending -= 1
         
-        # Yield current state if updated
-        if updated:
-            yield (left_text, right_text, left_done.is_set(), right_done.is_set())
-        else:
-            time.sleep(0.01)
+        if pending == 0 or now - last_yield >= RENDER_INTERVAL:
+            last_yield = now
+            yield runs
     
-    # Final yield to ensure everything is captured
-    yield (left_text, right_text, True, True)
     
-    # Wait for threads to complete
-    t1.join(timeout=1)
-    t2.join(timeout=1)
+def format_stats(stats: dict) -> str:
+    """One-line summary of a model run for the results grid."""
+    if stats.get("error"):
+        return f"⚠️ {stats['error']}"
+    parts = []
+    if stats.get("ttft") is not None:
+        parts.append(f"TTFT {stats['ttft'] * 1000:.0f} ms")
+    if stats.get("tokens_per_second") is not None:
+        parts.append(f"{stats['tokens_per_second']:.1f} tok/s")
+    parts.append(f"{stats.get('tokens', 0)} tokens")
+    return " · ".join(parts)
+
+
+def grid(models: list):
+    """Columns for the results grid, GRID_COLUMNS per row."""
+    cells = []
+    for start in range(0, len(models), GRID_COLUMNS):
+        cells.extend(st.columns(min(GRID_COLUMNS, len(models) - start)))
+    return cells
 
 
 # ============================================================================
@@ -159,6 +227,14 @@ with st.sidebar:
     
     st.divider()
     
+    bypass_cache = st.checkbox(
+        "Regenerate (skip response cache)",
+        value=False,
+        help="Ask the models again even if this prompt was answered before"
+    )
+    
+    st.divider()
+    
     for tid, thread in st.session_state.threads.items():
         if st.button(thread["title"], key=tid, use_container_width=True):
             st.session_state.active_thread = tid
@@ -175,26 +251,15 @@ if not st.session_state.active_thread:
 
 thread = st.session_state.threads[st.session_state.active_thread]
 
-# Top bar with model selectors
+# Top bar with model selection
 st.markdown("### 🔀 Compare Models")
 
-col1, col2 = st.columns(2)
-
-with col1:
-    thread["compare_models"][0] = st.selectbox(
-        "Left Model",
-        MODEL_NAMES,
-        index=MODEL_NAMES.index(thread["compare_models"][0]),
-        key=f"left_{thread['id']}"
-    )
-
-with col2:
-    thread["compare_models"][1] = st.selectbox(
-        "Right Model",
-        MODEL_NAMES,
-        index=MODEL_NAMES.index(thread["compare_models"][1]),
-        key=f"right_{thread['id']}"
-    )
+thread["compare_models"] = st.multiselect(
+    "Models",
+    MODEL_NAMES,
+    default=thread["compare_models"],
+    key=f"models_{thread['id']}"
+)
 
 # Render history
 for msg in thread["messages"]:
@@ -202,62 +267,47 @@ for msg in thread["messages"]:
         st.markdown(msg["user"])
     
     with st.chat_message("assistant"):
-        left, right = st.columns(2)
-        
-        with left:
-            st.markdown(f"### 🤖 {msg['left_model']}")
-            st.markdown(msg["left"])
-        
-        with right:
-            st.markdown(f"### 🤖 {msg['right_model']}")
-            st.markdown(msg["right"])
+        for cell, model in zip(grid(msg["models"]), msg["models"]):
+            with cell:
+                st.markdown(f"### 🤖 {model}")
+                st.caption(format_stats(msg["stats"][model]))
+                st.markdown(msg["responses"][model])
 
 # Chat input
 prompt = st.chat_input("Ask once, compare outputs")
 
-if prompt:
-    # Save user message placeholder
-    thread["messages"].append({
-        "user": prompt,
-        "left_model": thread["compare_models"][0],
-        "right_model": thread["compare_models"][1],
-        "left": "",
-        "right": "",
-    })
+if prompt and not thread["compare_models"]:
+    st.warning("Select at least one model to compare")
+elif prompt:
+    models = list(thread["compare_models"])
     
     # Render user message immediately
     with st.chat_message("user"):
         st.markdown(prompt)
     
-    left_model, right_model = thread["compare_models"]
-    
-    # Stream assistant responses concurrently
+    # Stream every selected model concurrently into the results grid
     with st.chat_message("assistant"):
-        col_l, col_r = st.columns(2)
-        
-        with col_l:
-            st.markdown(f"### 🤖 {left_model}")
-            left_box = st.empty()
-        
-        with col_r:
-            st.markdown(f"### 🤖 {right_model}")
-            right_box = st.empty()
-        
-        # Stream both models concurrently
-        final_left = ""
-        final_right = ""
-        
-        for left_text, right_text, left_done, right_done in concurrent_stream_generator(
-            prompt, left_model, right_model, thread["id"]
-        ):
-            left_box.markdown(left_text)
-            right_box.markdown(right_text)
-            final_left = left_text
-            final_right = right_text
+        boxes = {}
+        for cell, model in zip(grid(models), models):
+            with cell:
+                st.markdown(f"### 🤖 {model}")
+                boxes[model] = (st.empty(), st.empty())
+    
+        runs = {}
+        for runs in compare_stream(prompt, models, thread["id"], bypass_cache):
+            for model, run in runs.items():
+                stats_box, text_box = boxes[model]
+                stats_box.caption(format_stats(run.stats()))
+                text_box.markdown(run.text)
     
     # Persist messages
-    thread["messages"][-1]["left"] = final_left
-    thread["messages"][-1]["right"] = final_right
+    thread["messages"].append({
+        "user": prompt,
+        "models": models,
+        "responses": {model: run.text for model, run in runs.items()},
+        "stats": {model: run.stats() for model, run in runs.items()},
+    })
+    del thread["messages"][:-HISTORY_TAIL]
     
     # Update thread title
     thread["title"] = prompt[:30]
@@ -0,0 +1,91 @@
+"""
+Client for the resumable Server-Sent Events mode of /result, shared by the
+Streamlit apps.
+"""
+import json
+import time
+
+import requests
+
+MAX_RESUMES = 3     # Reconnects per answer before giving up
+READ_TIMEOUT = 60   # Seconds without data before the connection counts as lost
+
+
+def iter_sse(response):
+    """
+    Parse a Server-Sent Events response.
+    
+    Yields:
+        Tuples of (event name, event ID or None, JSON data)
+    """
+    event, event_id, data = "message", None, []
+    for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+        if line:
+            field, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if field == "event":
+                event = value
+            elif field == "id":
+                event_id = value
+            elif field == "data":
+                data.append(value)
+        elif data:
+            yield event, event_id, json.loads("\n".join(data))
+            event, event_id, data = "message", None, []
+
+
+def stream_result(post, url: str, payload: dict):
+    """
+    Stream an answer from /result in SSE mode.
+    
+    If the connection drops mid-answer, the request is re-sent with
+    Last-Event-ID and only the missing part of the answer is received.
+    Before the first event there is nothing to resume, and re-sending would
+    start a second generation (and add the prompt to the thread again), so
+    the error is raised instead.
+    
+    Args:
+        post: requests.post or the post method of a pooled requests.Session
+        url: /result endpoint URL
+        payload: Request body
+    
+    Yields:
+        Response chunks from the backend
+    
+    Raises:
+        RuntimeError: If the backend reports an error or the stream cannot be resumed
+    """
+    headers = {"Accept": "text/event-stream"}
+    last_event_id = None
+    
+    for attempt in range(MAX_RESUMES + 1):
+        if last_event_id:
+            headers["Last-Event-ID"] = last_event_id
+        try:
+            with post(
+                url,
+                json=payload,
+                headers=headers,
+                stream=True,
+                timeout=(5, READ_TIMEOUT),
+            ) as r:
+                r.raise_for_status()
+                r.encoding = "utf-8"
+                
+                for event, event_id, data in iter_sse(r):
+                    if event_id:
+                        last_event_id = event_id
+                    if event == "done":
+                        return
+                    if event == "error":
+                        raise RuntimeError(data["detail"])
+                    if event == "message":
+                        yield data["text"]
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+            if last_event_id is None or attempt == MAX_RESUMES:
+                raise
+        if last_event_id is None:
+            raise RuntimeError("Stream closed before the answer started")
+        time.sleep(0.5 * (attempt + 1))  # Connection lost (or closed early): resume
+    
+    raise RuntimeError("Stream ended without completing")
@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Keep imports of backend.config from creating data directories in the checkout
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="navtrade-tests-"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,151 @@
+"""Tests for near-duplicate detection and the repair of replaced chunks."""
+import json
+import os
+
+import pytest
+
+from backend.dedup import DedupIndex, minhash_signature
+
+SHARED = (
+    "The quarterly report shows revenue growth across all regions, driven by strong "
+    "demand for the new product line and improved margins in the services business."
+)
+OTHER = (
+    "Installation requires a supported operating system, at least eight gigabytes of "
+    "memory and network access to the licensing server during the first start."
+)
+REVISED = (
+    "This section was rewritten entirely and now describes the onboarding process for "
+    "new employees, including equipment, accounts and the first week schedule."
+)
+
+
+def write_chunks(path, texts):
+    chunks = [
+        {
+            "chunk_id": f"section-{i}",
+            "self": {"header": "h2", "title": f"Section {i}"},
+            "parents": [],
+            "text": text,
+        }
+        for i, text in enumerate(texts)
+    ]
+    path.write_text(json.dumps(chunks, indent=2), encoding="utf-8")
+    return path
+
+
+def read_chunks(path):
+    return {chunk["chunk_id"]: chunk for chunk in json.loads(path.read_text(encoding="utf-8"))}
+
+
+@pytest.fixture
+def chunks_dir(tmp_path):
+    path = tmp_path / "chunks"
+    path.mkdir()
+    return path
+
+
+def make_index(tmp_path, chunks_dir, replace_text):
+    return DedupIndex(tmp_path / "dedup.db", chunks_dir=chunks_dir, replace_text=replace_text)
+
+
+def test_short_chunks_have_no_signature():
+    assert minhash_signature("Too short to compare") is None
+    assert minhash_signature(SHARED) is not None
+
+
+def test_flags_duplicates_of_earlier_documents(tmp_path, chunks_dir):
+    index = make_index(tmp_path, chunks_dir, replace_text=False)
+    try:
+        index.index_document("a", write_chunks(chunks_dir / "a.json", [SHARED, OTHER]))
+        duplicates = index.index_document("b", write_chunks(chunks_dir / "b.json", [SHARED]))
+        
+        assert [(d["chunk_id"], d["duplicate_of"], d["document"]) for d in duplicates] == [
+            ("section-0", "section-0", "a")
+        ]
+        assert index.get_duplicates("b") == duplicates
+        assert index.get_duplicates("a") == []
+        # Without replace_text the chunks file keeps its text
+        assert read_chunks(chunks_dir / "b.json")["section-0"]["text"] == SHARED
+    finally:
+        index.close()
+
+
+def test_replace_text_keeps_text_in_index(tmp_path, chunks_dir):
+    index = make_index(tmp_path, chunks_dir, replace_text=True)
+    try:
+        index.index_document("a", write_chunks(chunks_dir / "a.json", [SHARED]))
+        rewritten = []
+        first = index.index_document(
+            "b", write_chunks(chunks_dir / "b.json", [SHARED, OTHER]), rewritten
+        )
+        
+        assert rewritten == ["b"]
+        chunks = read_chunks(chunks_dir / "b.json")
+        assert chunks["section-0"]["text"] == ""
+        assert chunks["section-0"]["duplicate_of"]["document"] == "a"
+        assert chunks["section-1"]["text"] == OTHER
+        assert index.stats()["replaced"] == 1
+        
+        # Re-indexing the rewritten file finds the same duplicates
+        assert index.index_document("b", chunks_dir / "b.json") == first
+        assert index.stats()["replaced"] == 1
+    finally:
+        index.close()
+
+
+def test_changed_canonical_promotes_dependents(tmp_path, chunks_dir):
+    index = make_index(tmp_path, chunks_dir, replace_text=True)
+    try:
+        index.index_document("a", write_chunks(chunks_dir / "a.json", [SHARED]))
+        index.index_document("b", write_chunks(chunks_dir / "b.json", [SHARED]))
+        index.index_document("c", write_chunks(chunks_dir / "c.json", [SHARED]))
+        
+        # The canonical chunk's text changes: b gets its text back and becomes
+        # canonical, and c points at b instead of a
+        rewritten = []
+        index.index_document("a", write_chunks(chunks_dir / "a.json", [REVISED]), rewritten)
+        
+        assert sorted(rewritten) == ["b", "c"]
+        assert read_chunks(chunks_dir / "b.json")["section-0"]["text"] == SHARED
+        assert index.get_duplicates("b") == []
+        assert [d["document"] for d in index.get_duplicates("c")] == ["b"]
+        assert read_chunks(chunks_dir / "c.json")["section-0"]["duplicate_of"]["document"] == "b"
+    finally:
+        index.close()
+
+
+def test_removed_canonical_restores_dependents(tmp_path, chunks_dir):
+    index = make_index(tmp_path, chunks_dir, replace_text=True)
+    try:
+        index.index_document("a", write_chunks(chunks_dir / "a.json", [SHARED]))
+        index.index_document("b", write_chunks(chunks_dir / "b.json", [SHARED]))
+        (chunks_dir / "a.json").unlink()
+        
+        rewritten = []
+        index.sync(rewritten=rewritten)
+        
+        assert rewritten == ["b"]
+        chunk = read_chunks(chunks_dir / "b.json")["section-0"]
+        assert chunk["text"] == SHARED
+        assert "duplicate_of" not in chunk
+        stats = index.stats()
+        assert (stats["documents"], stats["canonical_chunks"], stats["replaced"]) == (1, 1, 0)
+    finally:
+        index.close()
+
+
+def test_sync_indexes_oldest_files_first(tmp_path, chunks_dir):
+    index = make_index(tmp_path, chunks_dir, replace_text=False)
+    try:
+        newer = write_chunks(chunks_dir / "a.json", [SHARED])
+        older = write_chunks(chunks_dir / "b.json", [SHARED])
+        os.utime(older, ns=(1_000_000_000, 1_000_000_000))
+        write_chunks(chunks_dir / "b.fast.json", [SHARED])
+        
+        assert index.sync() == 2
+        assert index.get_duplicates("b") == []
+        assert [d["document"] for d in index.get_duplicates("a")] == ["b"]
+        assert newer.exists()
+    finally:
+        index.close()
@@ -0,0 +1,119 @@
+"""Tests for the job queue's claim and lease semantics."""
+import asyncio
+import time
+
+import pytest
+
+from backend import jobs
+from backend.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, JobRunner, JobStore
+from backend.models import ProcessRequest
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    yield store
+    store.close()
+
+
+def enqueue(store, tmp_path, name="doc.html"):
+    input_path = tmp_path / name
+    return store.enqueue(ProcessRequest(file_path=str(input_path)), input_path, "html")
+
+
+def test_claim_takes_oldest_queued_job_once(store, tmp_path):
+    first = enqueue(store, tmp_path, "a.html")
+    second = enqueue(store, tmp_path, "b.html")
+    
+    row = store.claim("runner-a")
+    assert row["id"] == first
+    assert row["owner"] == "runner-a"
+    assert row["state"] == RUNNING
+    
+    assert store.claim("runner-b")["id"] == second
+    assert store.claim("runner-a") is None
+
+
+def test_claim_from_two_stores_on_one_database(tmp_path):
+    # Two processes sharing the queue must never both get the same job
+    a = JobStore(tmp_path / "jobs.db")
+    b = JobStore(tmp_path / "jobs.db")
+    try:
+        job_id = enqueue(a, tmp_path)
+        claims = [a.claim("runner-a"), b.claim("runner-b")]
+        assert [row["id"] for row in claims if row is not None] == [job_id]
+    finally:
+        a.close()
+        b.close()
+
+
+def test_requeue_expired_only_touches_lapsed_leases(store, tmp_path):
+    expired = enqueue(store, tmp_path, "a.html")
+    held = enqueue(store, tmp_path, "b.html")
+    store.claim("crashed", lease=-1)
+    store.claim("alive", lease=60)
+    
+    assert store.requeue_expired() == 1
+    assert store.get(expired)["state"] == QUEUED
+    assert store.get(held)["state"] == RUNNING
+    # The requeued job can be claimed again by a live runner
+    assert store.claim("alive")["id"] == expired
+
+
+def test_renew_requires_owner(store, tmp_path):
+    job_id = enqueue(store, tmp_path)
+    store.claim("runner-a", lease=-1)
+    
+    assert not store.renew(job_id, "runner-b")
+    assert store.renew(job_id, "runner-a", lease=60)
+    assert store.requeue_expired() == 0
+
+
+def test_stale_owner_cannot_write_after_requeue(store, tmp_path):
+    job_id = enqueue(store, tmp_path)
+    store.claim("stale", lease=-1)
+    store.requeue_expired()
+    store.claim("fresh")
+    
+    assert not store.set_stage(job_id, "stale", "chunks", "done")
+    assert not store.finish(job_id, "stale", error="too late")
+    job = store.get(job_id)
+    assert job["state"] == RUNNING
+    assert job["stages"]["chunks"] == "pending"
+    assert job["error"] is None
+    
+    assert store.set_stage(job_id, "fresh", "chunks", "done")
+    assert store.finish(job_id, "fresh", cache_hits=["markdown"])
+    job = store.get(job_id)
+    assert job["state"] == SUCCEEDED
+    assert job["stages"]["chunks"] == "done"
+    assert job["cache_hits"] == ["markdown"]
+
+
+def test_finish_records_failure_once(store, tmp_path):
+    job_id = enqueue(store, tmp_path)
+    store.claim("runner-a")
+    
+    assert store.finish(job_id, "runner-a", error="boom")
+    assert not store.finish(job_id, "runner-a")
+    job = store.get(job_id)
+    assert job["state"] == FAILED
+    assert job["error"] == "boom"
+
+
+def test_lost_lease_cancels_work(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_LEASE_SECONDS", 0.03)
+    job_id = enqueue(store, tmp_path)
+    store.claim("other-runner")
+    
+    async def run():
+        runner = JobRunner(store)
+        work = asyncio.create_task(asyncio.sleep(10))
+        heartbeat = asyncio.create_task(runner._renew_lease(job_id, work))
+        start = time.monotonic()
+        with pytest.raises(asyncio.CancelledError):
+            await work
+        await heartbeat
+        return time.monotonic() - start
+    
+    assert asyncio.run(run()) < 5
@@ -0,0 +1,75 @@
+"""Tests for the streaming Markdown header splitter."""
+import io
+
+import pytest
+
+from backend.config import CHUNK_HEADERS
+from backend.converters.markdown_splitter import iter_markdown_sections, split_markdown_file
+
+DOCUMENTS = {
+    "nested": (
+        "# Guide\n\nIntro paragraph.\n\n## Setup\n\nStep one.\nStep two.\n\n"
+        "### Details\n\nFine print.\n\n## Usage\n\nRun it.\n"
+    ),
+    "aggregated_paragraphs": "# Title\n\nFirst paragraph.\n\nSecond paragraph.\n\n\n\nThird.",
+    "no_headers": "Just text\nacross lines\n\nand a second paragraph\n",
+    "code_block": (
+        "## Code\n\n```python\n# not a header\n\nprint('hi')\n```\n\n"
+        "~~~\n## still code\n~~~\n\nAfter ```inline``` code.\n"
+    ),
+    "header_lookalikes": "#Not a header\n####### Too deep\n## Real\n#hashtag text\n",
+    "shallower_header_resets": "### Deep\n\nDeep text.\n\n# Top\n\nTop text.\n\n### Deep again\n\nMore.\n",
+    "empty_headers": "#\n\n## \n\nBody under empty headers.\n",
+    "empty": "",
+    "control_characters": "# Title\x0b\n\nText with\ttab and \x0cform feed.\n",
+}
+
+
+def split(text):
+    return [
+        (section.text, section.metadata)
+        for section in iter_markdown_sections(io.StringIO(text), CHUNK_HEADERS)
+    ]
+
+
+@pytest.mark.parametrize("name", sorted(DOCUMENTS))
+def test_matches_langchain(name):
+    splitters = pytest.importorskip("langchain_text_splitters")
+    text = DOCUMENTS[name]
+    expected = [
+        (document.page_content, document.metadata)
+        for document in splitters.MarkdownHeaderTextSplitter(CHUNK_HEADERS).split_text(text)
+    ]
+    assert split(text) == expected
+
+
+def test_sections_follow_header_paths():
+    assert split(DOCUMENTS["nested"]) == [
+        ("Intro paragraph.", {"header1": "Guide"}),
+        ("Step one.\nStep two.", {"header1": "Guide", "header2": "Setup"}),
+        ("Fine print.", {"header1": "Guide", "header2": "Setup", "header3": "Details"}),
+        ("Run it.", {"header1": "Guide", "header2": "Usage"}),
+    ]
+
+
+def test_code_blocks_are_not_split():
+    sections = split(DOCUMENTS["code_block"])
+    assert len(sections) == 1
+    text, metadata = sections[0]
+    assert metadata == {"header2": "Code"}
+    assert "# not a header" in text
+    assert "## still code" in text
+
+
+def test_sections_do_not_share_metadata():
+    sections = list(iter_markdown_sections(io.StringIO(DOCUMENTS["nested"])))
+    sections[0].metadata["header1"] = "changed"
+    assert sections[1].metadata["header1"] == "Guide"
+
+
+def test_split_markdown_file_streams_a_file(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text(DOCUMENTS["nested"], encoding="utf-8")
+    sections = split_markdown_file(path)
+    assert next(sections).metadata == {"header1": "Guide"}
+    assert [section.text for section in sections] == ["Step one.\nStep two.", "Fine print.", "Run it."]
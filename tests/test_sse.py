@@ -0,0 +1,124 @@
+"""Tests for resumable Server-Sent Events (Last-Event-ID)."""
+import asyncio
+
+import pytest
+
+from backend.sse import GenerationBuffer, parse_event_id, sse_event
+from frontend.sse_client import iter_sse
+
+
+class FakeResponse:
+    """Stands in for a streamed requests.Response."""
+    
+    def __init__(self, body: str):
+        self.body = body
+    
+    def iter_lines(self, chunk_size=None, decode_unicode=False):
+        return iter(self.body.split("\n"))
+
+
+async def frames_from(texts, gate=None):
+    for i, text in enumerate(texts):
+        if gate is not None and i == 2:
+            await gate.wait()
+        yield text
+
+
+async def read(generation, after=0):
+    body = "".join([event async for event in generation.events(after)])
+    return list(iter_sse(FakeResponse(body)))
+
+
+def test_parse_event_id():
+    assert parse_event_id("abc:3") == ("abc", 3)
+    assert parse_event_id(" abc:def:12 ") == ("abc:def", 12)
+    for malformed in ("abc", ":3", "abc:", "abc:-1", "abc:x"):
+        with pytest.raises(ValueError):
+            parse_event_id(malformed)
+
+
+def test_event_data_stays_on_one_line():
+    event = sse_event({"text": "line one\nline two"}, event_id="g:1")
+    assert event.count("\n") == 3
+    assert list(iter_sse(FakeResponse(event))) == [
+        ("message", "g:1", {"text": "line one\nline two"})
+    ]
+
+
+def test_resume_sends_only_missing_frames():
+    async def run():
+        buffer = GenerationBuffer(ttl=60)
+        cleaned = []
+        
+        async def cleanup():
+            cleaned.append(True)
+        
+        gate = asyncio.Event()
+        generation = buffer.start("model", frames_from(["a", "b", "c", "d"], gate), cleanup)
+        
+        # First connection reads two frames, then drops
+        first = []
+        reader = generation.events()
+        async for event in reader:
+            first.append(event)
+            if len(first) == 3:
+                break
+        await reader.aclose()
+        last_event_id = list(iter_sse(FakeResponse("".join(first))))[-1][1]
+        
+        gate.set()
+        resumed, after = buffer.resume(last_event_id)
+        events = await read(resumed, after)
+        return generation, last_event_id, after, events, cleaned
+    
+    generation, last_event_id, after, events, cleaned = asyncio.run(run())
+    assert last_event_id == f"{generation.id}:2"
+    assert after == 2
+    assert events[0] == ("start", f"{generation.id}:2", {"generation": generation.id, "resumed_from": 2})
+    assert [data["text"] for event, _, data in events if event == "message"] == ["c", "d"]
+    assert [event_id for event, event_id, _ in events if event == "message"] == [
+        f"{generation.id}:3", f"{generation.id}:4"
+    ]
+    assert events[-1] == ("done", None, {"generation": generation.id, "frames": 4})
+    assert cleaned == [True]
+
+
+def test_failed_generation_reports_error():
+    async def failing():
+        yield "partial"
+        raise RuntimeError("provider down")
+    
+    async def run():
+        buffer = GenerationBuffer(ttl=60)
+        
+        async def cleanup():
+            pass
+        
+        generation = buffer.start("model", failing(), cleanup)
+        await generation.task
+        return await read(generation)
+    
+    events = asyncio.run(run())
+    assert [data for event, _, data in events if event == "message"] == [{"text": "partial"}]
+    assert events[-1] == ("error", None, {"detail": "provider down"})
+
+
+def test_resume_rejects_unknown_expired_and_future_ids():
+    async def run():
+        buffer = GenerationBuffer(ttl=0.05)
+        
+        async def cleanup():
+            pass
+        
+        generation = buffer.start("model", frames_from(["a"]), cleanup)
+        await generation.task
+        with pytest.raises(ValueError):
+            buffer.resume(f"{generation.id}:5")
+        await asyncio.sleep(0.1)
+        # Finished longer than ttl ago: dropped on the next sweep
+        with pytest.raises(KeyError):
+            buffer.resume(f"{generation.id}:1")
+        with pytest.raises(KeyError):
+            buffer.resume("unknown:0")
+    
+    asyncio.run(run())